@@ -0,0 +1,97 @@
+import os
+import argparse
+from .config import Config
+from .services.youtube_service import YouTubeService
+from .services.media_cache import get_media_cache_policy
+
+def run_batch(args: argparse.Namespace) -> int:
+    """Process a playlist or channel and export posts per video"""
+    # Deferred so the lighter subcommands do not import openai and Whisper
+    from .services.video_service import VideoProcessor
+    from .services.batch_service import BatchProcessor
+
+    youtube = YouTubeService(api_key=Config.YOUTUBE_API_KEY, download_path=Config.DOWNLOAD_PATH)
+    video = VideoProcessor(
+        api_key=Config.OPENAI_API_KEY,
+        download_path=Config.DOWNLOAD_PATH,
+        youtube_service=youtube
+    )
+    processor = BatchProcessor(
+        video,
+        youtube,
+        output_dir=args.output,
+        platforms=args.platforms,
+        checkpoint_path=args.checkpoint,
+        transcript_workers=args.transcript_workers,
+        generation_workers=args.generation_workers,
+        generation_mode=args.mode,
+        allow_whisper=args.whisper
+    )
+
+    def on_progress(video_id, status, finished, total):
+        print(f"[{finished}/{total}] {video_id}: {status}")
+
+    result = processor.run(args.url, limit=args.limit, on_progress=on_progress)
+    print(
+        f"Done: {len(result.completed)} completed, {len(result.skipped)} skipped, "
+        f"{len(result.failed)} failed"
+    )
+    return 1 if result.failed else 0
+
+def run_repair_manifest(args: argparse.Namespace) -> int:
+    """Reconcile the download manifest with the files on disk"""
+    youtube = YouTubeService(api_key=None, download_path=args.path)
+    counts = youtube.repair_manifest()
+    print(f"Manifest repaired: {counts['added']} added, {counts['removed']} removed, {counts['updated']} updated")
+    return 0
+
+def run_evict_media(args: argparse.Namespace) -> int:
+    """Run one media cache eviction pass and report what was reclaimed"""
+    policy = get_media_cache_policy(
+        args.path,
+        args.temp_path,
+        max_bytes=int(args.max_gb * 1024 ** 3),
+        max_age_hours=Config.MEDIA_CACHE_MAX_AGE_HOURS,
+        temp_max_age_hours=Config.TEMP_MAX_AGE_HOURS
+    )
+    reclaimed = policy.evict()
+    stats = policy.get_stats()
+    print(f"Media cache: {stats['files_evicted']} files evicted, {reclaimed / 1024 ** 2:.1f} MB reclaimed")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="youtube-content-pro", description="YouTube Content Pro command line tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser("batch", help="Generate posts for every video in a playlist or channel")
+    batch.add_argument("url", help="Playlist, channel or video URL")
+    batch.add_argument("--platforms", nargs="+", default=["Twitter", "Instagram", "LinkedIn", "Facebook"])
+    batch.add_argument("--output", default=os.path.join(Config.DOWNLOAD_PATH, "exports"))
+    batch.add_argument("--checkpoint", default=None, help="Checkpoint file, defaults to <output>/checkpoint.json")
+    batch.add_argument("--limit", type=int, default=None, help="Maximum number of videos")
+    batch.add_argument("--transcript-workers", type=int, default=4)
+    batch.add_argument("--generation-workers", type=int, default=2)
+    batch.add_argument("--mode", choices=["sequential", "concurrent", "batched"], default="batched")
+    batch.add_argument("--whisper", action="store_true",
+                       help="Download and transcribe the audio of videos without captions (slow)")
+    batch.set_defaults(func=run_batch)
+
+    repair = subparsers.add_parser("repair-manifest", help="Reconcile the download manifest with the files on disk")
+    repair.add_argument("--path", default=Config.DOWNLOAD_PATH, help="Download directory")
+    repair.set_defaults(func=run_repair_manifest)
+
+    evict = subparsers.add_parser("evict-media", help="Trim downloads and temp files to the media cache budget")
+    evict.add_argument("--path", default=Config.DOWNLOAD_PATH, help="Download directory")
+    evict.add_argument("--temp-path", default=Config.TEMP_PATH, help="Temp directory")
+    evict.add_argument("--max-gb", type=float, default=Config.MEDIA_CACHE_MAX_BYTES / 1024 ** 3)
+    evict.set_defaults(func=run_evict_media)
+
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    Config.ensure_directories()
+    return args.func(args)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
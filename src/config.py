@@ -14,9 +14,14 @@ class Config:
     DOWNLOAD_PATH = os.path.join(BASE_DIR, "downloads")
     TEMP_PATH = os.path.join(BASE_DIR, "temp")
     
-    # Create directories if they don't exist
-    os.makedirs(DOWNLOAD_PATH, exist_ok=True)
-    os.makedirs(TEMP_PATH, exist_ok=True)
+    # Media cache: byte budget shared by downloads and temp files
+    MEDIA_CACHE_MAX_BYTES = int(float(os.getenv("MEDIA_CACHE_MAX_GB", "10")) * 1024 ** 3)
+    MEDIA_CACHE_MAX_AGE_HOURS = 7 * 24
+    TEMP_MAX_AGE_HOURS = 6
+    MEDIA_CACHE_EVICT_INTERVAL = 600
+    
+    # Local transcription: each worker process loads its own Whisper model
+    WHISPER_MAX_WORKERS = int(os.getenv("WHISPER_MAX_WORKERS", "4"))
     
     # Video processing settings
     MAX_VIDEO_SIZE_MB = 500
@@ -24,4 +29,10 @@ class Config:
     SHORTS_DIMENSIONS = {
         "width": 1080,
         "height": 1920
-    }
\ No newline at end of file
+    }
+    
+    @classmethod
+    def ensure_directories(cls):
+        """Create the download and temp directories if they don't exist"""
+        os.makedirs(cls.DOWNLOAD_PATH, exist_ok=True)
+        os.makedirs(cls.TEMP_PATH, exist_ok=True)
@@ -1,19 +1,123 @@
 import streamlit as st
 import os
-from services.video_service import VideoProcessor
+import sys
+import queue
+import tempfile
+import threading
+
+# Make the src package importable when launched with `streamlit run src/main.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import Config
+from src.services.video_service import VideoProcessor
+from src.services.audio_service import AudioProcessor
+from src.services.youtube_service import YouTubeService
+from src.services.batch_service import BatchProcessor
+from src.services.media_cache import get_media_cache_policy
+from src.models.schemas import TranscriptResult
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+@st.cache_resource
 def init_services():
-    """Initialize services"""
-    # Default download path relative to the current directory
-    download_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'downloads')
+    """Initialize services once per process; every session and rerun shares them"""
+    Config.ensure_directories()
+    download_path = Config.DOWNLOAD_PATH
+    # One policy per process; start() is a no-op once the evictor thread is running
+    cache_policy = get_media_cache_policy(
+        download_path,
+        Config.TEMP_PATH,
+        max_bytes=Config.MEDIA_CACHE_MAX_BYTES,
+        max_age_hours=Config.MEDIA_CACHE_MAX_AGE_HOURS,
+        temp_max_age_hours=Config.TEMP_MAX_AGE_HOURS,
+        interval_seconds=Config.MEDIA_CACHE_EVICT_INTERVAL
+    )
+    cache_policy.start()
+    youtube = YouTubeService(
+        api_key=os.getenv('YOUTUBE_API_KEY'),
+        download_path=download_path,
+        cache_policy=cache_policy
+    )
     return {
-        'video': VideoProcessor(api_key=os.getenv('OPENAI_API_KEY'), download_path=download_path)
+        'video': VideoProcessor(
+            api_key=os.getenv('OPENAI_API_KEY'),
+            download_path=download_path,
+            youtube_service=youtube
+        ),
+        'audio': AudioProcessor(),
+        'youtube': youtube,
+        'cache_policy': cache_policy,
+        'download_path': download_path
     }
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_transcript(video_url: str, allow_whisper: bool = False) -> TranscriptResult:
+    """Fetch a transcript once per URL across reruns and sessions"""
+    return init_services()['video'].fetch_transcript(video_url, allow_whisper=allow_whisper)
+
+def session_results(name: str) -> dict:
+    """Per-session store for results that must survive reruns and tab switches"""
+    if name not in st.session_state:
+        st.session_state[name] = {}
+    return st.session_state[name]
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as MM:SS or HH:MM:SS"""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours:d}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+def stream_file_transcript(audio_service, cache_policy, uploaded_file):
+    """Transcribe an uploaded file, rendering segments as they are decoded"""
+    suffix = os.path.splitext(uploaded_file.name)[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix, dir=Config.TEMP_PATH, delete=False) as tmp:
+        tmp.write(uploaded_file.getbuffer())
+        tmp_path = tmp.name
+    
+    placeholder = st.empty()
+    lines = []
+    try:
+        with cache_policy.pin(tmp_path), st.spinner("Transcribing..."):
+            for segment in audio_service.stream_transcription(tmp_path):
+                lines.append(f"[{format_timestamp(segment['start'])}] {segment['text']}")
+                placeholder.text_area("Whisper Transcript", "\n".join(lines), height=300)
+    finally:
+        os.remove(tmp_path)
+    return lines
+
+def run_batch_with_progress(processor, url, limit):
+    """Run a batch in a background thread, relaying progress to the page"""
+    # Streamlit elements can only be updated from the script thread
+    events = queue.Queue()
+    outcome = {}
+    
+    def worker():
+        try:
+            outcome['result'] = processor.run(url, limit=limit, on_progress=lambda *event: events.put(event))
+        except Exception as e:
+            outcome['error'] = e
+    
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    
+    progress = st.progress(0.0)
+    status = st.empty()
+    while thread.is_alive() or not events.empty():
+        try:
+            video_id, video_status, finished, total = events.get(timeout=0.2)
+        except queue.Empty:
+            continue
+        progress.progress(finished / total)
+        status.text(f"{finished}/{total} — {video_id}: {video_status}")
+    
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
+
 def main():
     # Configure page with no navigation menu and custom width
     st.set_page_config(
@@ -193,12 +297,35 @@ def main():
     
     if video_url:
         # Create tabs
-        tab1, tab2 = st.tabs(["Get Transcript", "Social Media"])
+        tab1, tab2, tab3 = st.tabs(["Get Transcript", "Social Media", "Batch"])
+        transcript = None
         
         # Tab 1: Get Transcript
         with tab1:
-            try:
-                transcript = services['video'].get_video_transcript(video_url)
+            audio_transcripts = session_results('audio_transcripts')
+            transcript_result = audio_transcripts.get(video_url)
+            if transcript_result is None:
+                try:
+                    transcript_result = load_transcript(video_url)
+                except Exception as e:
+                    st.error(str(e))
+                    # Whisper downloads the audio and uses every CPU, so it only runs on request
+                    if st.button("Transcribe audio"):
+                        try:
+                            with st.spinner("Transcribing audio with Whisper..."):
+                                transcript_result = load_transcript(video_url, allow_whisper=True)
+                            audio_transcripts[video_url] = transcript_result
+                        except Exception as e:
+                            st.error(str(e))
+            
+            if transcript_result is not None:
+                transcript = transcript_result.text
+                st.download_button(
+                    "Download Transcript",
+                    transcript,
+                    file_name=transcript_result.file_name,
+                    mime="text/plain"
+                )
                 st.text_area("Video Transcript", transcript, height=300)
                 
                 # Center container for statistics
@@ -231,10 +358,11 @@ def main():
                 # Display transcript statistics in centered columns
                 st.markdown("### Transcript Overview")
                 
-                # Calculate statistics
-                words = len(transcript.split())
-                minutes = words / 150  # Assuming average speaking rate of 150 words per minute
-        
+                # Statistics from the caption timings
+                timeline = transcript_result.transcript
+                words = timeline.word_count
+                minutes = timeline.duration / 60
+                
                 # Create two equal columns for statistics
                 col1, col2 = st.columns([1, 1])
                 
@@ -243,18 +371,32 @@ def main():
                     st.info(
                         "📝 **Word Statistics**\n\n"
                         f"— Total Words: {words:,} —\n\n"
-                        f"— Speaking Rate: 150 words/minute —"
+                        f"— Speaking Rate: {timeline.words_per_minute:.0f} words/minute —"
                     )
                 
                 with col2:
                     st.info(
                         "⏱️ **Duration Statistics**\n\n"
                         f"— Total Duration: {minutes:.1f} minutes —\n\n"
-                        f"— Seconds: {minutes * 60:.0f} seconds —"
+                        f"— Seconds: {timeline.duration:.0f} seconds —"
                     )
-                
-            except Exception as e:
-                st.error(str(e))
+            
+            # Local transcription for files without YouTube captions
+            with st.expander("Transcribe an audio or video file"):
+                uploaded_file = st.file_uploader(
+                    "Upload a file",
+                    type=["mp3", "wav", "m4a", "mp4", "webm", "mkv"]
+                )
+                file_transcripts = session_results('file_transcripts')
+                if uploaded_file and uploaded_file.file_id in file_transcripts:
+                    st.text_area("Whisper Transcript", "\n".join(file_transcripts[uploaded_file.file_id]), height=300)
+                elif uploaded_file and st.button("Transcribe File"):
+                    try:
+                        file_transcripts[uploaded_file.file_id] = stream_file_transcript(
+                            services['audio'], services['cache_policy'], uploaded_file
+                        )
+                    except Exception as e:
+                        st.error(str(e))
         
         # Tab 2: Social Media
         with tab2:
@@ -264,41 +406,86 @@ def main():
                 default=["Twitter", "Instagram"]
             )
             
+            generated_posts = session_results('generated_posts')
+            posts_key = (video_url, tuple(platforms))
+            
             if st.button("Generate Social Media Posts"):
                 try:
                     # Get transcript first if we don't have it
-                    if 'transcript' not in locals():
-                        transcript = services['video'].get_video_transcript(video_url)
+                    if transcript is None:
+                        transcript = load_transcript(video_url).text
                     
                     with st.spinner("Generating social media content..."):
-                        result = services['video'].generate_social_posts(
+                        generated_posts[posts_key] = services['video'].generate_social_posts(
                             video_url,
                             transcript,
-                            platforms
+                            platforms,
+                            mode="concurrent",
+                            timeout=120
                         )
-                        
-                        # Display hashtags at the top
-                        st.markdown("""
-                            <div style='text-align: center; margin: 2rem 0;'>
-                                <h3>Generated Hashtags</h3>
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # Display hashtags in a centered paragraph
-                        with st.expander("Generated Hashtags", expanded=True):
-                            st.markdown(f"<p style='text-align: center;'>{result['hashtags']}</p>", unsafe_allow_html=True)
-                        
-                        # Iterate over platforms to display posts in full section width
-                        for platform in platforms:
-                            with st.expander(f"📱 {platform}", expanded=True):
-                                st.text_area(
-                                    label="",
-                                    value=result['posts'][platform],
-                                    height=200,
-                                    key=f"post_{platform}"
-                                )
                 except Exception as e:
                     st.error(str(e))
+            
+            # Posts stay visible across reruns until the URL or platforms change
+            if posts_key in generated_posts:
+                result = generated_posts[posts_key]
+                # Display hashtags at the top
+                st.markdown("""
+                    <div style='text-align: center; margin: 2rem 0;'>
+                        <h3>Generated Hashtags</h3>
+                    </div>
+                """, unsafe_allow_html=True)
+                
+                # Display hashtags in a centered paragraph
+                with st.expander("Generated Hashtags", expanded=True):
+                    st.markdown(f"<p style='text-align: center;'>{result['hashtags']}</p>", unsafe_allow_html=True)
+                
+                # Iterate over platforms to display posts in full section width
+                for platform in platforms:
+                    with st.expander(f"📱 {platform}", expanded=True):
+                        st.text_area(
+                            label="",
+                            value=result['posts'][platform],
+                            height=200,
+                            key=f"post_{platform}"
+                        )
+        
+        # Tab 3: Batch processing for playlists and channels
+        with tab3:
+            st.markdown("Process every video in a playlist or channel URL. Finished videos are checkpointed and skipped on the next run.")
+            batch_platforms = st.multiselect(
+                "Batch platforms",
+                ["Twitter", "Instagram", "LinkedIn", "Facebook"],
+                default=["Twitter", "LinkedIn"]
+            )
+            batch_limit = st.number_input("Maximum videos", min_value=1, max_value=1000, value=25)
+            batch_whisper = st.checkbox(
+                "Transcribe audio of videos without captions",
+                help="Downloads the audio and runs Whisper for each such video, which is slow"
+            )
+            
+            batch_results = session_results('batch_results')
+            if st.button("Run Batch"):
+                try:
+                    processor = BatchProcessor(
+                        services['video'],
+                        services['youtube'],
+                        output_dir=os.path.join(services['download_path'], 'exports'),
+                        platforms=batch_platforms,
+                        allow_whisper=batch_whisper
+                    )
+                    batch_results[video_url] = run_batch_with_progress(processor, video_url, int(batch_limit))
+                except Exception as e:
+                    st.error(str(e))
+            
+            if video_url in batch_results:
+                result = batch_results[video_url]
+                st.success(
+                    f"{len(result.completed)} completed, {len(result.skipped)} skipped, "
+                    f"{len(result.failed)} failed"
+                )
+                for video_id, error in result.failed.items():
+                    st.error(f"{video_id}: {error}")
 
     # Clear data button
     if st.sidebar.button("Clear Data"):
@@ -1,6 +1,7 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 from datetime import datetime
+from .transcript import Transcript
 
 @dataclass
 class VideoMetadata:
@@ -29,4 +30,25 @@ class ProcessingResult:
     success: bool
     output_path: Optional[str]
     error_message: Optional[str]
-    metadata: Optional[dict]
\ No newline at end of file
+    metadata: Optional[dict]
+
+@dataclass
+class TranscriptResult:
+    video_id: str
+    language: str
+    source: str
+    transcript: Transcript
+    # Outcome and seconds of each resolution stage tried for this call
+    metrics: List[Dict] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return self.transcript.text
+
+    @property
+    def entries(self) -> List[Dict]:
+        return self.transcript.entries()
+
+    @property
+    def file_name(self) -> str:
+        return f"transcript_{self.video_id}.txt"
@@ -0,0 +1,136 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+
+class Transcript:
+    """
+    Timed transcript stored as parallel arrays over one backing string
+
+    Entry i spans text[offsets[i]:offsets[i + 1]] (minus the joining space) and
+    starts[i] .. starts[i] + durations[i] seconds. Slices share the arrays and
+    the string with their parent and only narrow the [lo, hi) entry window.
+    """
+
+    __slots__ = ('_text', '_starts', '_durations', '_offsets', '_lo', '_hi')
+
+    def __init__(self, text: str, starts: array, durations: array, offsets: array,
+                 lo: int = 0, hi: Optional[int] = None):
+        self._text = text
+        self._starts = starts
+        self._durations = durations
+        self._offsets = offsets
+        self._lo = lo
+        self._hi = len(starts) if hi is None else hi
+
+    @classmethod
+    def from_entries(cls, entries: List[Dict]) -> 'Transcript':
+        """
+        Build a transcript from caption style entries
+
+        Args:
+            entries (List[Dict]): Dicts with 'text', 'start' and 'duration', in time order
+
+        Returns:
+            Transcript: Compact transcript over the entries joined by spaces
+        """
+        starts = array('d')
+        durations = array('d')
+        offsets = array('q', [0])
+        parts = []
+        position = 0
+        for entry in entries:
+            text = entry['text']
+            starts.append(float(entry['start']))
+            durations.append(float(entry.get('duration', 0.0)))
+            parts.append(text)
+            position += len(text) + 1
+            offsets.append(position)
+        return cls(" ".join(parts), starts, durations, offsets)
+
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+    def _entry_text(self, index: int) -> str:
+        return self._text[self._offsets[index]:self._offsets[index + 1] - 1]
+
+    def entry(self, index: int) -> Dict:
+        """Return entry index (relative to this slice) as a caption style dict"""
+        if not 0 <= index < len(self):
+            raise IndexError("transcript index out of range")
+        index += self._lo
+        return {
+            'text': self._entry_text(index),
+            'start': self._starts[index],
+            'duration': self._durations[index]
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self.entry(index) for index in range(len(self)))
+
+    def entries(self) -> List[Dict]:
+        return list(self)
+
+    def timings(self) -> Tuple[memoryview, memoryview]:
+        """Zero-copy views of this slice's starts and durations, e.g. for numpy.frombuffer"""
+        return (
+            memoryview(self._starts)[self._lo:self._hi],
+            memoryview(self._durations)[self._lo:self._hi]
+        )
+
+    @property
+    def text(self) -> str:
+        """Continuous text of this slice"""
+        if not len(self):
+            return ""
+        if self._lo == 0 and self._hi == len(self._starts):
+            return self._text
+        return self._text[self._offsets[self._lo]:self._offsets[self._hi] - 1]
+
+    @property
+    def start_time(self) -> float:
+        return self._starts[self._lo] if len(self) else 0.0
+
+    @property
+    def end_time(self) -> float:
+        """End of the last entry to finish; captions can overlap"""
+        if not len(self):
+            return 0.0
+        return max(self._starts[i] + self._durations[i] for i in range(self._lo, self._hi))
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the first entry's start to the last entry's end"""
+        return self.end_time - self.start_time
+
+    @property
+    def word_count(self) -> int:
+        return len(self.text.split())
+
+    @property
+    def words_per_minute(self) -> float:
+        minutes = self.duration / 60
+        return self.word_count / minutes if minutes > 0 else 0.0
+
+    def index_at(self, seconds: float) -> Optional[int]:
+        """Index of the entry being spoken at a time, None outside any entry, in O(log n)"""
+        index = bisect_right(self._starts, seconds, self._lo, self._hi) - 1
+        if index < self._lo or seconds > self._starts[index] + self._durations[index]:
+            return None
+        return index - self._lo
+
+    def text_at(self, seconds: float) -> Optional[str]:
+        index = self.index_at(seconds)
+        return None if index is None else self._entry_text(index + self._lo)
+
+    def slice(self, start: float, end: float) -> 'Transcript':
+        """
+        Entries starting within [start, end), sharing storage with this transcript
+
+        An entry that began before start but is still being spoken is included.
+        """
+        lo = bisect_right(self._starts, start, self._lo, self._hi) - 1
+        if lo < self._lo or self._starts[lo] + self._durations[lo] <= start:
+            lo += 1
+        lo = max(lo, self._lo)
+        hi = bisect_left(self._starts, end, lo, self._hi)
+        return Transcript(self._text, self._starts, self._durations, self._offsets, lo, hi)
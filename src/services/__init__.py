@@ -1,2 +1,26 @@
-from .video_service import VideoProcessor
-from .whisper_wrapper import SecureWhisperWrapper 
+import importlib
+
+# Exports are imported on first attribute access, so importing the package or a
+# light module such as rate_limit does not pull in openai, yt-dlp or Whisper
+
+_EXPORTS = {
+    'VideoProcessor': '.video_service',
+    'SecureWhisperWrapper': '.whisper_wrapper',
+    'AudioProcessor': '.audio_service',
+    'TextProcessor': '.text_service',
+    'YouTubeService': '.youtube_service',
+    'SubtitleGenerator': '.subtitle_service',
+    'BatchProcessor': '.batch_service',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,23 +1,99 @@
-from typing import Optional
+from typing import Dict, Iterator, List, Optional
 import ffmpeg
-import whisper
+from .model_registry import get_whisper_model
+from .render import RenderPipeline
+from .transcription import iter_transcription, load_audio_samples, transcribe_parallel
 
 class AudioProcessor:
-    def __init__(self):
-        self.model = whisper.load_model("base")
+    def __init__(self, model_name: str = "base", device: Optional[str] = None):
+        self.model_name = model_name
+        self.device = device
+
+    @property
+    def model(self):
+        """Shared Whisper model, loaded on first use"""
+        return get_whisper_model(self.model_name, self.device)
 
     def extract_audio(self, video_path: str, output_path: str) -> str:
         try:
-            stream = ffmpeg.input(video_path)
-            stream = ffmpeg.output(stream, output_path, acodec='libmp3lame')
-            ffmpeg.run(stream, overwrite_output=True)
+            RenderPipeline(video_path).add_audio(output_path).run()
             return output_path
         except ffmpeg.Error as e:
             raise Exception(f"Error extracting audio: {str(e)}")
 
+    def load_audio_samples(self, media_path: str, mmap_path: Optional[str] = None):
+        """
+        Decode a video or audio file to 16 kHz mono float32 samples via an ffmpeg pipe
+
+        Args:
+            media_path (str): Path to an audio or video file
+            mmap_path (str): Optional spool file to memory-map instead of holding samples in memory
+
+        Returns:
+            np.ndarray: Samples ready to pass to Whisper
+        """
+        return load_audio_samples(media_path, mmap_path)
+
     def transcribe_audio(self, audio_path: str, language: Optional[str] = None) -> str:
         try:
-            result = self.model.transcribe(audio_path, language=language)
+            # Video files are decoded straight to PCM, no intermediate MP3 needed
+            audio = load_audio_samples(audio_path)
+            result = self.model.transcribe(audio, language=language)
             return result["text"]
         except Exception as e:
             raise Exception(f"Error transcribing audio: {str(e)}")
+
+    def transcribe_long_audio(self, audio_path: str, language: Optional[str] = None,
+                              window_seconds: float = 300.0, workers: Optional[int] = None) -> List[Dict]:
+        """
+        Transcribe long audio in parallel windows split on silence
+
+        Args:
+            audio_path (str): Path to an audio or video file
+            language (str): Spoken language, None to auto-detect
+            window_seconds (float): Target window length per worker task
+            workers (int): Worker processes, defaults to Config.WHISPER_MAX_WORKERS capped
+                at the CPU count; each loads its own model
+
+        Returns:
+            List[Dict]: Segments with start, end and text, in time order
+        """
+        try:
+            audio = load_audio_samples(audio_path)
+            return transcribe_parallel(
+                audio,
+                model_name=self.model_name,
+                language=language,
+                window_seconds=window_seconds,
+                workers=workers,
+                device=self.device
+            )
+        except Exception as e:
+            raise Exception(f"Error transcribing audio: {str(e)}")
+
+    def stream_transcription(self, audio_path: str, language: Optional[str] = None,
+                             window_seconds: float = 30.0, workers: int = 1) -> Iterator[Dict]:
+        """
+        Yield timestamped segments as each window of audio is decoded
+
+        Args:
+            audio_path (str): Path to an audio or video file
+            language (str): Spoken language, None to auto-detect
+            window_seconds (float): Window length, smaller gives earlier first text
+            workers (int): Worker processes decoding ahead of the consumer
+
+        Yields:
+            Dict: Segment with start, end and text
+        """
+        try:
+            audio = load_audio_samples(audio_path)
+            yield from iter_transcription(
+                audio,
+                model_name=self.model_name,
+                language=language,
+                window_seconds=window_seconds,
+                workers=workers,
+                device=self.device
+            )
+        except Exception as e:
+            raise Exception(f"Error transcribing audio: {str(e)}")
@@ -0,0 +1,210 @@
+import os
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+class BatchCheckpoint:
+    """JSON checkpoint of finished and failed videos, rewritten atomically"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.completed: Dict[str, str] = {}
+        self.failed: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.completed = data.get('completed', {})
+            self.failed = data.get('failed', {})
+
+    def _save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'completed': self.completed, 'failed': self.failed}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def mark_completed(self, video_id: str, output_path: str) -> None:
+        with self._lock:
+            self.completed[video_id] = output_path
+            self.failed.pop(video_id, None)
+            self._save()
+
+    def mark_failed(self, video_id: str, error: str) -> None:
+        with self._lock:
+            self.failed[video_id] = error
+            self._save()
+
+@dataclass
+class BatchResult:
+    """Summary of one batch run"""
+    total: int
+    completed: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+class BatchProcessor:
+    """Pipelined transcript, generation and export jobs for playlists and channels"""
+
+    def __init__(self, video_processor, youtube_service, output_dir: str,
+                 platforms: Optional[List[str]] = None, checkpoint_path: Optional[str] = None,
+                 transcript_workers: int = 4, generation_workers: int = 2, export_workers: int = 1,
+                 generation_mode: str = "batched", max_in_flight: Optional[int] = None,
+                 allow_whisper: bool = False):
+        """
+        Initialize BatchProcessor
+
+        Args:
+            video_processor (VideoProcessor): Transcript and post generation service
+            youtube_service (YouTubeService): Used to expand playlists and channels
+            output_dir (str): Directory for per-video JSON exports
+            platforms (List[str]): Platforms to generate posts for
+            checkpoint_path (str): Checkpoint file, defaults to output_dir/checkpoint.json
+            transcript_workers (int): Concurrent transcript fetches
+            generation_workers (int): Concurrent LLM generation jobs
+            export_workers (int): Concurrent export writers
+            generation_mode (str): Mode passed to generate_social_posts
+            max_in_flight (int): Videos between transcript start and export, defaults to
+                transcript_workers + generation_workers
+            allow_whisper (bool): Transcribe the audio of videos without captions, which
+                downloads it and runs Whisper for each such video
+        """
+        self.video_processor = video_processor
+        self.youtube_service = youtube_service
+        self.output_dir = output_dir
+        self.platforms = platforms or ["Twitter", "Instagram", "LinkedIn", "Facebook"]
+        self.checkpoint_path = checkpoint_path or os.path.join(output_dir, "checkpoint.json")
+        self.worker_counts = {
+            'transcript': transcript_workers,
+            'generation': generation_workers,
+            'export': export_workers,
+        }
+        self.generation_mode = generation_mode
+        self.allow_whisper = allow_whisper
+        self.max_in_flight = max(1, max_in_flight or transcript_workers + generation_workers)
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _fetch_transcript(self, video_id: str) -> str:
+        return self.video_processor.get_video_transcript(
+            f"https://youtu.be/{video_id}", allow_whisper=self.allow_whisper
+        )
+
+    def _generate(self, video_id: str, transcript: str) -> Dict:
+        return self.video_processor.generate_social_posts(
+            f"https://youtu.be/{video_id}",
+            transcript,
+            self.platforms,
+            mode=self.generation_mode
+        )
+
+    def _export(self, video_id: str, transcript: str, generated: Dict) -> str:
+        output_path = os.path.join(self.output_dir, f"{video_id}.json")
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'video_id': video_id,
+                'video_url': f"https://youtu.be/{video_id}",
+                'transcript': transcript,
+                'hashtags': generated['hashtags'],
+                'posts': generated['posts'],
+            }, f, indent=2, ensure_ascii=False)
+        return output_path
+
+    def run(self, url: str, limit: Optional[int] = None,
+            on_progress: Optional[Callable[[str, str, int, int], None]] = None) -> BatchResult:
+        """
+        Process every video in a playlist, channel or single-video URL
+
+        Each video flows through transcript -> generation -> export, with each
+        stage on its own bounded pool so stages overlap across videos. At most
+        max_in_flight videos are in the pipeline at once, so transcripts never
+        pile up ahead of generation. Finished videos are checkpointed, and a
+        rerun skips them.
+
+        Args:
+            url (str): Playlist, channel or video URL
+            limit (int): Maximum number of videos to expand
+            on_progress (Callable): Called with (video_id, status, finished, total)
+
+        Returns:
+            BatchResult: Completed, skipped and failed video IDs
+        """
+        video_ids = list(dict.fromkeys(self.youtube_service.expand_video_ids(url, limit=limit)))
+        checkpoint = BatchCheckpoint(self.checkpoint_path)
+        result = BatchResult(total=len(video_ids))
+        result.skipped = [video_id for video_id in video_ids if video_id in checkpoint.completed]
+        pending = [video_id for video_id in video_ids if video_id not in checkpoint.completed]
+
+        progress_lock = threading.Lock()
+        finished = [len(result.skipped)]
+
+        def report(video_id: str, status: str, error: Optional[str] = None) -> None:
+            with progress_lock:
+                if status == 'completed':
+                    result.completed.append(video_id)
+                else:
+                    result.failed[video_id] = error
+                finished[0] += 1
+                count = finished[0]
+            if on_progress is not None:
+                on_progress(video_id, status, count, result.total)
+
+        pools = {
+            stage: ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=f"batch-{stage}")
+            for stage, workers in self.worker_counts.items()
+        }
+
+        def schedule(video_id: str) -> Future:
+            done = Future()
+
+            def fail(error: Exception) -> None:
+                try:
+                    checkpoint.mark_failed(video_id, str(error))
+                    report(video_id, 'failed', str(error))
+                finally:
+                    done.set_result(None)
+
+            def stage_callback(handler: Callable) -> Callable[[Future], None]:
+                """Route stage errors, including errors in the handler itself, to fail"""
+                def callback(future: Future) -> None:
+                    try:
+                        if future.exception():
+                            return fail(future.exception())
+                        handler(future.result())
+                    except Exception as e:
+                        if not done.done():
+                            fail(e)
+                return callback
+
+            def after_export(output_path: str) -> None:
+                checkpoint.mark_completed(video_id, output_path)
+                report(video_id, 'completed')
+                done.set_result(None)
+
+            def after_transcript(transcript: str) -> None:
+                pools['generation'].submit(self._generate, video_id, transcript).add_done_callback(
+                    stage_callback(lambda generated: pools['export'].submit(
+                        self._export, video_id, transcript, generated
+                    ).add_done_callback(stage_callback(after_export)))
+                )
+
+            pools['transcript'].submit(self._fetch_transcript, video_id).add_done_callback(
+                stage_callback(after_transcript)
+            )
+            return done
+
+        # A video holds a slot from transcript fetch until it is exported or fails
+        slots = threading.Semaphore(self.max_in_flight)
+        scheduled = []
+        try:
+            for video_id in pending:
+                slots.acquire()
+                done = schedule(video_id)
+                done.add_done_callback(lambda _: slots.release())
+                scheduled.append(done)
+            wait(scheduled)
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=True)
+
+        return result
@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+def make_cache_key(*parts: Any) -> str:
+    """Build a stable content-addressed key from the given parts"""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+@dataclass
+class CacheStats:
+    """Counters shared by all cache tiers"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with optional TTL"""
+
+    def __init__(self, max_entries: int = 128, ttl: Optional[float] = None):
+        """
+        Initialize LRUCache
+
+        Args:
+            max_entries (int): Maximum number of entries kept in memory
+            ttl (float): Seconds before an entry expires, None to never expire
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            stored_at, value = entry
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                self.stats.evictions += 1
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class DiskCache:
+    """JSON file store with TTL and a total size budget"""
+
+    def __init__(self, directory: str, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize DiskCache
+
+        Args:
+            directory (str): Directory holding the cache files
+            ttl (float): Seconds before an entry expires, None to never expire
+            max_bytes (int): Total size budget, oldest entries are evicted first
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._sizes = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load_sizes(self) -> dict:
+        """Scan the directory once, then track sizes in memory"""
+        if self._sizes is None:
+            self._sizes = {}
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith('.json'):
+                    self._sizes[entry.name[:-5]] = entry.stat().st_size
+        return self._sizes
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            self.stats.misses += 1
+            return None
+
+        if self.ttl is not None and time.time() - payload.get('stored_at', 0) > self.ttl:
+            self.delete(key)
+            self.stats.evictions += 1
+            self.stats.misses += 1
+            return None
+
+        # Touch the file so size-based eviction follows access order
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self.stats.hits += 1
+        return payload.get('value')
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        data = json.dumps({'stored_at': time.time(), 'value': value})
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            if self.max_bytes is not None:
+                sizes = self._load_sizes()
+                sizes[key] = len(data.encode('utf-8'))
+                self._evict_to_budget(keep=key)
+
+    def _evict_to_budget(self, keep: str) -> None:
+        sizes = self._sizes
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        def last_access(name):
+            try:
+                return os.path.getmtime(self._path(name))
+            except OSError:
+                return 0
+
+        for name in sorted(sizes, key=last_access):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+            total -= sizes.pop(name)
+            self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            if self._sizes is not None:
+                self._sizes.pop(key, None)
+
+class TieredCache:
+    """In-memory LRU in front of a persistent DiskCache"""
+
+    def __init__(self, memory: LRUCache, disk: Optional[DiskCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def get_stats(self) -> dict:
+        """Return hit/miss counters for each tier"""
+        stats = {
+            'hits': self.stats.hits,
+            'misses': self.stats.misses,
+            'hit_rate': self.stats.hit_rate,
+            'memory': vars(self.memory.stats).copy(),
+        }
+        if self.disk is not None:
+            stats['disk'] = vars(self.disk.stats).copy()
+        return stats
@@ -0,0 +1,209 @@
+import os
+import shutil
+import tempfile
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+import ffmpeg
+from .cache import LRUCache, make_cache_key
+
+# Encoders that produce streams concat-compatible with the source's copied GOPs
+MATCHING_AUDIO_ENCODERS = {'aac': 'aac', 'mp3': 'libmp3lame', 'opus': 'libopus'}
+
+# ffprobe profile names and the libx264 profile that encodes them
+H264_PROFILES = {
+    'Constrained Baseline': 'baseline',
+    'Baseline': 'baseline',
+    'Main': 'main',
+    'High': 'high',
+    'High 10': 'high10',
+    'High 4:2:2': 'high422',
+    'High 4:4:4 Predictive': 'high444',
+}
+
+# Pieces are cut to MPEG-TS, where every keyframe carries its own SPS/PPS, so
+# the re-encoded edges and the copied GOPs each decode against their own headers
+PIECE_EXT = '.ts'
+
+# Cut points closer than this to a keyframe are treated as aligned
+KEYFRAME_TOLERANCE = 0.05
+
+def probe_keyframes(path: str) -> Dict:
+    """
+    Read the keyframe timestamps and codec parameters of a file's first video stream
+
+    Packet flags are read from the container, so nothing is decoded.
+
+    Returns:
+        Dict: 'keyframes' (sorted seconds), 'video' and 'audio' stream parameters
+    """
+    info = ffmpeg.probe(path, select_streams='v:0', show_entries='packet=pts_time,flags')
+    keyframes = sorted(
+        float(packet['pts_time'])
+        for packet in info.get('packets', [])
+        if 'K' in packet.get('flags', '') and packet.get('pts_time') not in (None, 'N/A')
+    )
+    streams = ffmpeg.probe(path)['streams']
+    video = next((s for s in streams if s.get('codec_type') == 'video'), {})
+    audio = next((s for s in streams if s.get('codec_type') == 'audio'), None)
+    return {
+        'keyframes': keyframes,
+        'video': {key: video.get(key) for key in (
+            'codec_name', 'pix_fmt', 'profile', 'level', 'width', 'height',
+            'r_frame_rate', 'time_base', 'sample_aspect_ratio'
+        )},
+        'audio': None if audio is None else {
+            key: audio.get(key) for key in ('codec_name', 'sample_rate', 'channels')
+        },
+    }
+
+def plan_clip(keyframes: List[float], start: float, end: float,
+              tolerance: float = KEYFRAME_TOLERANCE) -> List[Tuple[str, float, float]]:
+    """
+    Split start..end into re-encoded edges and a stream-copied, keyframe-aligned interior
+
+    Returns:
+        List[Tuple[str, float, float]]: ('encode' | 'copy', start, end) pieces in order
+    """
+    first = bisect_left(keyframes, start - tolerance)
+    last = bisect_right(keyframes, end + tolerance) - 1
+    if first >= len(keyframes) or last < 0 or keyframes[first] >= keyframes[last]:
+        return [('encode', start, end)]
+
+    copy_start = keyframes[first]
+    copy_end = keyframes[last]
+    # An end that lands on a keyframe copies right up to it
+    if abs(end - copy_end) <= tolerance:
+        copy_end = end
+
+    pieces = []
+    if copy_start - start > tolerance:
+        pieces.append(('encode', start, copy_start))
+    else:
+        copy_start = start
+    pieces.append(('copy', copy_start, copy_end))
+    if end - copy_end > tolerance:
+        pieces.append(('encode', copy_end, end))
+    return pieces
+
+class KeyframeClipper:
+    """Clip by stream-copying whole GOPs and re-encoding only the partial GOPs at the cuts"""
+
+    def __init__(self, cache=None):
+        """
+        Initialize KeyframeClipper
+
+        Args:
+            cache (LRUCache | TieredCache): Probe results keyed by path, size and mtime
+        """
+        self.cache = cache or LRUCache(max_entries=64)
+
+    def probe(self, path: str) -> Dict:
+        """Return the cached probe for a file, probing on first use or after it changes"""
+        stat = os.stat(path)
+        key = make_cache_key("keyframe_probe", os.path.abspath(path), stat.st_size, stat.st_mtime)
+        probe = self.cache.get(key)
+        if probe is None:
+            probe = probe_keyframes(path)
+            self.cache.set(key, probe)
+        return probe
+
+    def _encoder_args(self, probe: Dict) -> Optional[Dict]:
+        """
+        Encoder settings whose output splices cleanly onto the source's own GOPs
+
+        Profile, level, frame rate, pixel format and SAR follow the source.
+        Returns None when any of them is unknown or has no libx264 equivalent.
+        """
+        video = probe['video']
+        profile = H264_PROFILES.get(video.get('profile'))
+        level = video.get('level')
+        rate = video.get('r_frame_rate')
+        if video.get('codec_name') != 'h264' or profile is None or not video.get('pix_fmt'):
+            return None
+        if not isinstance(level, int) or level <= 0 or not rate or rate.startswith('0/'):
+            return None
+
+        args = {
+            'vcodec': 'libx264', 'preset': 'veryfast', 'crf': 18,
+            'profile:v': profile, 'level:v': f"{level // 10}.{level % 10}",
+            'r': rate, 'pix_fmt': video['pix_fmt'],
+        }
+        sar = video.get('sample_aspect_ratio')
+        if sar and sar not in ('0:1', 'N/A'):
+            args['vf'] = f"setsar={sar.replace(':', '/')}"
+        if probe['audio'] is not None:
+            audio_encoder = MATCHING_AUDIO_ENCODERS.get(probe['audio'].get('codec_name'))
+            if audio_encoder is None:
+                return None
+            args['acodec'] = audio_encoder
+            if probe['audio'].get('sample_rate'):
+                args['ar'] = probe['audio']['sample_rate']
+            if probe['audio'].get('channels'):
+                args['ac'] = probe['audio']['channels']
+        return args
+
+    @staticmethod
+    def _mux_args(probe: Dict, output_path: str) -> Dict:
+        """Output options that turn the joined MPEG-TS pieces back into the requested container"""
+        if os.path.splitext(output_path)[1].lower() not in ('.mp4', '.m4v', '.mov'):
+            return {}
+        args = {}
+        time_base = probe['video'].get('time_base') or ''
+        if time_base.startswith('1/'):
+            args['video_track_timescale'] = time_base[2:]
+        if probe['audio'] is not None and probe['audio'].get('codec_name') == 'aac':
+            args['bsf:a'] = 'aac_adtstoasc'
+        return args
+
+    def _render_piece(self, input_path: str, kind: str, start: float, end: float,
+                      output_path: str, encoder_args: Dict) -> None:
+        stream = ffmpeg.input(input_path, ss=start)
+        if kind == 'copy':
+            options = {'c': 'copy', 'avoid_negative_ts': 'make_zero'}
+            if output_path.endswith(PIECE_EXT):
+                options['bsf:v'] = 'h264_mp4toannexb'
+            stream = ffmpeg.output(stream, output_path, t=end - start, **options)
+        else:
+            stream = ffmpeg.output(stream, output_path, t=end - start, **encoder_args)
+        ffmpeg.run(stream, overwrite_output=True, quiet=True)
+
+    def clip(self, input_path: str, start: float, end: float, output_path: str) -> List[Tuple[str, float, float]]:
+        """
+        Cut start..end from input_path into output_path
+
+        Sources whose stream parameters cannot be matched by an encoder, and clips
+        inside a single GOP, are re-encoded whole. Either way, only the clip range
+        is read.
+
+        Returns:
+            List[Tuple[str, float, float]]: The pieces that were rendered
+        """
+        probe = self.probe(input_path)
+        encoder_args = self._encoder_args(probe)
+        pieces = plan_clip(probe['keyframes'], start, end)
+        if encoder_args is None:
+            pieces = [('encode', start, end)]
+            encoder_args = {'vcodec': 'libx264', 'preset': 'veryfast', 'crf': 18, 'acodec': 'aac'}
+
+        if len(pieces) == 1:
+            kind, piece_start, piece_end = pieces[0]
+            self._render_piece(input_path, kind, piece_start, piece_end, output_path, encoder_args)
+            return pieces
+
+        work_dir = tempfile.mkdtemp(prefix='clip_', dir=os.path.dirname(os.path.abspath(output_path)))
+        try:
+            list_path = os.path.join(work_dir, 'pieces.txt')
+            with open(list_path, 'w', encoding='utf-8') as f:
+                for i, (kind, piece_start, piece_end) in enumerate(pieces):
+                    piece_path = os.path.join(work_dir, f'piece_{i}{PIECE_EXT}')
+                    self._render_piece(input_path, kind, piece_start, piece_end, piece_path, encoder_args)
+                    f.write(f"file '{piece_path}'\n")
+
+            stream = ffmpeg.input(list_path, format='concat', safe=0)
+            ffmpeg.run(
+                ffmpeg.output(stream, output_path, c='copy', **self._mux_args(probe, output_path)),
+                overwrite_output=True, quiet=True
+            )
+            return pieces
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
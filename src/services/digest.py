@@ -0,0 +1,141 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from .cache import LRUCache, make_cache_key
+from .llm_cache import CompletionCache, get_completion_cache
+
+# Rough average for English text with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+SENTENCE_END = re.compile(r'[.!?]["\')\]]?$')
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text without loading a tokenizer"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def chunk_text(text: str, max_tokens: int = 1500) -> List[str]:
+    """
+    Split text into chunks of at most max_tokens estimated tokens
+
+    Chunks break on word boundaries and prefer to end on a sentence
+    boundary when one falls in the second half of the chunk.
+
+    Args:
+        text (str): Text to split
+        max_tokens (int): Token budget per chunk
+
+    Returns:
+        List[str]: Chunks in original order
+    """
+    words = text.split()
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks = []
+    current = []
+    current_chars = 0
+    last_sentence_end = -1
+
+    for word in words:
+        if current and current_chars + len(word) + 1 > max_chars:
+            if last_sentence_end >= len(current) // 2:
+                cut = last_sentence_end + 1
+            else:
+                cut = len(current)
+            chunks.append(" ".join(current[:cut]))
+            current = current[cut:]
+            current_chars = sum(len(w) + 1 for w in current)
+            last_sentence_end = -1
+            for i, w in enumerate(current):
+                if SENTENCE_END.search(w):
+                    last_sentence_end = i
+
+        current.append(word)
+        current_chars += len(word) + 1
+        if SENTENCE_END.search(word):
+            last_sentence_end = len(current) - 1
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+class TranscriptDigester:
+    """Map-reduce summarizer producing a bounded-size digest of a transcript"""
+
+    MODEL = "gpt-3.5-turbo"
+
+    def __init__(self, completion_cache: Optional[CompletionCache] = None, chunk_tokens: int = 2000,
+                 digest_tokens: int = 600, max_workers: int = 4, digest_cache: Optional[LRUCache] = None):
+        """
+        Initialize TranscriptDigester
+
+        Args:
+            completion_cache (CompletionCache): Cache used for every map and reduce call
+            chunk_tokens (int): Token budget per map chunk
+            digest_tokens (int): Target size of the final digest
+            max_workers (int): Parallel map calls
+            digest_cache (LRUCache): Cache of finished digests, defaults to the shared one
+        """
+        self.completion_cache = completion_cache or get_completion_cache()
+        self.chunk_tokens = chunk_tokens
+        self.digest_tokens = digest_tokens
+        self.max_workers = max_workers
+        self.digest_cache = digest_cache or get_digest_cache()
+
+    def _summarize(self, text: str, max_words: int, use_cache: bool, max_tokens: Optional[int] = None) -> str:
+        content = self.completion_cache.create(
+            model=self.MODEL,
+            messages=[
+                {"role": "system", "content": "You are a content summarizer. Preserve names, facts, numbers and the order of topics."},
+                {"role": "user", "content": f"Summarize this part of a video transcript in {max_words} words or less:\n{text}"}
+            ],
+            max_tokens=max_tokens or max_words * 2,
+            temperature=0.3,
+            use_cache=use_cache
+        )
+        return content.strip()
+
+    def digest(self, transcript: str, use_cache: bool = True) -> str:
+        """
+        Return a digest of the transcript no larger than digest_tokens
+
+        Transcripts already within the budget are returned unchanged.
+        """
+        if estimate_tokens(transcript) <= self.digest_tokens:
+            return transcript
+
+        key = make_cache_key("digest", self.MODEL, self.chunk_tokens, self.digest_tokens, transcript)
+        if use_cache:
+            cached = self.digest_cache.get(key)
+            if cached is not None:
+                return cached
+
+        text = transcript
+        while estimate_tokens(text) > self.digest_tokens:
+            chunks = chunk_text(text, self.chunk_tokens)
+            if len(chunks) == 1:
+                # The final pass must fit the budget however wordy the reply
+                text = self._summarize(text, self.digest_tokens * 3 // 4, use_cache, max_tokens=self.digest_tokens)
+                break
+
+            # Keep the combined partial summaries around the digest budget
+            words_per_chunk = max(50, self.digest_tokens * 3 // 4 // len(chunks))
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                partials = list(executor.map(
+                    lambda chunk: self._summarize(chunk, words_per_chunk, use_cache), chunks
+                ))
+            text = "\n".join(partials)
+
+        if use_cache:
+            self.digest_cache.set(key, text)
+        return text
+
+_default_digest_cache = None
+_default_digest_cache_lock = threading.Lock()
+
+def get_digest_cache() -> LRUCache:
+    """Return the process-wide digest cache shared by all processors"""
+    global _default_digest_cache
+    with _default_digest_cache_lock:
+        if _default_digest_cache is None:
+            _default_digest_cache = LRUCache(max_entries=64)
+        return _default_digest_cache
@@ -0,0 +1,246 @@
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from ..models.transcript import Transcript
+from .digest import chunk_text, estimate_tokens
+from .llm_cache import CompletionCache, get_completion_cache
+from .text_service import parse_json_response
+
+WORD = re.compile(r"[a-z0-9']+")
+
+STOPWORDS = frozenset("""
+a about after again all also an and any are as at be because been before being but by can could did do does
+doing don't down during each for from get got had has have having he her here hers him his how i i'm if in
+into is it it's its just know like me more most my no not now of off on once one only or other our out over
+really right so some such than that that's the their them then there these they thing things this those
+through to too up very was we we're were what when where which while who why will with would yeah you you're
+your going gonna want okay
+""".split())
+
+@dataclass
+class ClipCandidate:
+    """A transcript window proposed as a Shorts clip"""
+    start: float
+    end: float
+    score: float
+    text: str
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+class HighlightDetector:
+    """Score sliding transcript windows and pick the best non-overlapping clips"""
+
+    MODEL = "gpt-3.5-turbo"
+
+    def __init__(self, completion_cache: Optional[CompletionCache] = None, window_seconds: float = 45.0,
+                 step_seconds: float = 5.0, keyword_count: int = 15, keyword_weight: float = 1.0,
+                 rate_weight: float = 0.5, hook_weight: float = 1.0, excerpt_tokens: int = 200,
+                 prompt_tokens: int = 2000):
+        """
+        Initialize HighlightDetector
+
+        Args:
+            completion_cache (CompletionCache): Used for LLM hook ranking
+            window_seconds (float): Target clip length
+            step_seconds (float): Distance between candidate window starts
+            keyword_count (int): Number of frequent transcript terms used as keywords
+            keyword_weight (float): Weight of keyword density in the score
+            rate_weight (float): Weight of speaking rate in the score
+            hook_weight (float): Weight of the LLM hook rating in the score
+            excerpt_tokens (int): Token budget per excerpt sent for hook ranking
+            prompt_tokens (int): Token budget per hook ranking request
+        """
+        self.completion_cache = completion_cache or get_completion_cache()
+        self.window_seconds = window_seconds
+        self.step_seconds = step_seconds
+        self.keyword_count = keyword_count
+        self.keyword_weight = keyword_weight
+        self.rate_weight = rate_weight
+        self.hook_weight = hook_weight
+        self.excerpt_tokens = excerpt_tokens
+        self.prompt_tokens = prompt_tokens
+
+    def extract_keywords(self, transcript: Transcript) -> List[str]:
+        """Most frequent content words of the transcript"""
+        counts = Counter(
+            word for word in WORD.findall(transcript.text.lower())
+            if len(word) > 3 and word not in STOPWORDS
+        )
+        return [word for word, _ in counts.most_common(self.keyword_count)]
+
+    @staticmethod
+    def _zscore(values: np.ndarray) -> np.ndarray:
+        std = values.std()
+        return (values - values.mean()) / std if std > 0 else np.zeros_like(values)
+
+    def score_windows(self, transcript: Transcript,
+                      keywords: Optional[Iterable[str]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score every window of window_seconds, stepping by step_seconds
+
+        Per-entry word and keyword counts are prefix-summed once, so each window
+        costs two searchsorted lookups regardless of its length.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: First entry, end entry (exclusive) and score per window
+        """
+        starts_view, durations_view = transcript.timings()
+        starts = np.frombuffer(starts_view, dtype=np.float64)
+        durations = np.frombuffer(durations_view, dtype=np.float64)
+        if not len(starts):
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0)
+
+        keyword_set = set(keywords if keywords is not None else self.extract_keywords(transcript))
+        words = np.zeros(len(starts))
+        hits = np.zeros(len(starts))
+        for i, entry in enumerate(transcript):
+            tokens = WORD.findall(entry['text'].lower())
+            words[i] = len(tokens)
+            hits[i] = sum(token in keyword_set for token in tokens)
+
+        cum_words = np.concatenate(([0.0], np.cumsum(words)))
+        cum_hits = np.concatenate(([0.0], np.cumsum(hits)))
+        cum_speech = np.concatenate(([0.0], np.cumsum(durations)))
+
+        last_start = max(starts[0], starts[-1] + durations[-1] - self.window_seconds)
+        grid = np.arange(starts[0], last_start + self.step_seconds / 2, self.step_seconds)
+        lo = np.searchsorted(starts, grid, side='left')
+        hi = np.searchsorted(starts, grid + self.window_seconds, side='left')
+
+        # Windows that snap to the same entries are the same clip
+        keep = hi > lo
+        pairs = np.unique(np.stack([lo[keep], hi[keep]], axis=1), axis=0)
+        lo, hi = pairs[:, 0], pairs[:, 1]
+
+        window_words = cum_words[hi] - cum_words[lo]
+        density = (cum_hits[hi] - cum_hits[lo]) / np.maximum(window_words, 1.0)
+        rate = window_words / np.maximum(cum_speech[hi] - cum_speech[lo], 1e-6)
+        scores = self.keyword_weight * self._zscore(density) + self.rate_weight * self._zscore(rate)
+        return lo, hi, scores
+
+    @staticmethod
+    def select_non_overlapping(starts: np.ndarray, ends: np.ndarray, scores: np.ndarray, top_k: int) -> List[int]:
+        """Greedily take the best-scoring windows that do not overlap a taken one"""
+        chosen: List[int] = []
+        for index in np.argsort(-scores, kind='stable'):
+            if len(chosen) == top_k:
+                break
+            if all(ends[index] <= starts[other] or starts[index] >= ends[other] for other in chosen):
+                chosen.append(int(index))
+        return chosen
+
+    def _build_hook_prompt(self, excerpts: List[Tuple[int, str]]) -> str:
+        numbered = "\n\n".join(f"[{number}] {excerpt}" for number, excerpt in excerpts)
+        return f"""Rate how well each transcript excerpt would work as a standalone YouTube Short.
+            Reward a strong opening hook, a complete thought and a clear payoff.
+
+            {numbered}
+
+            Respond with only a JSON object mapping each excerpt number to a score from 0 to 10, like {{"1": 7}}."""
+
+    @staticmethod
+    def _parse_ratings(content: str) -> Dict:
+        """Parse a hook rating reply, rejecting valid JSON that is not an object"""
+        rated = parse_json_response(content)
+        if not isinstance(rated, dict):
+            raise ValueError(f"Expected a JSON object of ratings, got {type(rated).__name__}")
+        return rated
+
+    def rank_hooks(self, texts: List[str], use_cache: bool = True) -> np.ndarray:
+        """
+        Ask the LLM to rate each text as a hook, batching excerpts under prompt_tokens
+
+        Raises ValueError when a reply is not a JSON object; such replies are
+        not cached.
+
+        Returns:
+            np.ndarray: Rating in [0, 1] per text; unrated texts get 0
+        """
+        ratings = np.zeros(len(texts))
+        excerpts = [(i + 1, chunk_text(text, self.excerpt_tokens)[0] if text else "") for i, text in enumerate(texts)]
+
+        batches: List[List[Tuple[int, str]]] = [[]]
+        used = 0
+        for number, excerpt in excerpts:
+            cost = estimate_tokens(excerpt) + 8
+            if batches[-1] and used + cost > self.prompt_tokens:
+                batches.append([])
+                used = 0
+            batches[-1].append((number, excerpt))
+            used += cost
+
+        for batch in batches:
+            if not batch:
+                continue
+            rated = self.completion_cache.create(
+                model=self.MODEL,
+                messages=[
+                    {"role": "system", "content": "You are a short-form video editor. Always respond with valid JSON."},
+                    {"role": "user", "content": self._build_hook_prompt(batch)}
+                ],
+                temperature=0,
+                use_cache=use_cache,
+                parse=self._parse_ratings
+            )
+            for key, value in rated.items():
+                try:
+                    index = int(key) - 1
+                    if 0 <= index < len(texts):
+                        ratings[index] = min(max(float(value), 0.0), 10.0) / 10.0
+                except (TypeError, ValueError):
+                    continue
+        return ratings
+
+    def detect(self, transcript: Transcript, top_k: int = 3, keywords: Optional[Iterable[str]] = None,
+               use_llm: bool = False, candidate_pool: int = 3, use_cache: bool = True) -> List[ClipCandidate]:
+        """
+        Find the top_k non-overlapping highlight clips of a transcript
+
+        Args:
+            transcript (Transcript): Timed transcript
+            top_k (int): Number of clips to return
+            keywords (Iterable[str]): Terms to reward, defaults to the transcript's most frequent terms
+            use_llm (bool): Re-rank the best heuristic windows by LLM hook rating
+            candidate_pool (int): Windows per requested clip sent for LLM ranking
+            use_cache (bool): Reuse cached completions
+
+        Returns:
+            List[ClipCandidate]: Clips in time order
+        """
+        lo, hi, scores = self.score_windows(transcript, keywords)
+        if not len(scores):
+            return []
+
+        starts_view, durations_view = transcript.timings()
+        entry_starts = np.frombuffer(starts_view, dtype=np.float64)
+        # Running maximum, since overlapping captions can end out of order
+        entry_ends = np.maximum.accumulate(entry_starts + np.frombuffer(durations_view, dtype=np.float64))
+        starts = entry_starts[lo]
+        ends = entry_ends[hi - 1]
+
+        chosen = self.select_non_overlapping(starts, ends, scores, top_k * (candidate_pool if use_llm else 1))
+        texts = {index: transcript.slice(starts[index], ends[index]).text for index in chosen}
+
+        final = None
+        if use_llm and chosen:
+            try:
+                ratings = self.rank_hooks([texts[index] for index in chosen], use_cache)
+            except ValueError:
+                # Unusable ratings leave the keyword and speaking rate ranking in place
+                ratings = None
+            if ratings is not None:
+                combined = scores[chosen] + self.hook_weight * self._zscore(ratings)
+                final = {chosen[i]: combined[i] for i in np.argsort(-combined, kind='stable')[:top_k]}
+        if final is None:
+            # chosen is already in descending score order
+            final = {index: scores[index] for index in chosen[:top_k]}
+
+        return sorted(
+            (ClipCandidate(float(starts[i]), float(ends[i]), float(score), texts[i]) for i, score in final.items()),
+            key=lambda clip: clip.start
+        )
@@ -0,0 +1,144 @@
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from .cache import CacheStats, LRUCache, make_cache_key
+
+class SQLiteCacheBackend:
+    """Completion cache backend persisted to a single SQLite file"""
+
+    def __init__(self, db_path: str, ttl: Optional[float] = None):
+        """
+        Initialize SQLiteCacheBackend
+
+        Args:
+            db_path (str): Path to the SQLite database file
+            ttl (float): Seconds before an entry expires, None to never expire
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, stored_at = row
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                with self._conn:
+                    self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                return None
+            return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time())
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM completions")
+
+class CompletionCache:
+    """Cache of chat completions keyed by a fingerprint of the request"""
+
+    def __init__(self, backend=None):
+        """
+        Initialize CompletionCache
+
+        Args:
+            backend: Object with get(key), set(key, value) and delete(key), defaults to an in-memory LRUCache
+        """
+        self.backend = backend if backend is not None else LRUCache(max_entries=512, ttl=24 * 3600)
+        self.stats = CacheStats()
+
+    @staticmethod
+    def fingerprint(model: str, messages: List[Dict], temperature: Optional[float] = None,
+                    max_tokens: Optional[int] = None) -> str:
+        """Hash the parts of a request that determine its completion"""
+        return make_cache_key("completion", model, messages, temperature, max_tokens)
+
+    def create(self, model: str, messages: List[Dict], temperature: Optional[float] = None,
+               max_tokens: Optional[int] = None, use_cache: bool = True,
+               parse: Optional[Callable[[str], Any]] = None, **kwargs) -> Any:
+        """
+        Return the completion text, calling OpenAI only on a cache miss
+
+        When parse is given, the reply is stored only once parse accepts it, so a
+        malformed reply is never served from the cache and a retry asks again.
+
+        Args:
+            model (str): Chat model name
+            messages (List[Dict]): Chat messages
+            temperature (float): Sampling temperature
+            max_tokens (int): Maximum completion tokens
+            use_cache (bool): Set to False to bypass the cache for this call
+            parse (Callable): Validates and converts the reply; exceptions propagate to the caller
+            **kwargs: Extra arguments for openai.ChatCompletion.create, not part of the key
+
+        Returns:
+            Any: Completion message content, or parse(content) when parse is given
+        """
+        key = self.fingerprint(model, messages, temperature, max_tokens)
+        if use_cache:
+            cached = self.backend.get(key)
+            if cached is not None:
+                try:
+                    result = parse(cached) if parse else cached
+                except Exception:
+                    # Stored before replies were validated; drop it and ask again
+                    self.backend.delete(key)
+                else:
+                    self.stats.hits += 1
+                    return result
+            self.stats.misses += 1
+
+        params = {'model': model, 'messages': messages, **kwargs}
+        if temperature is not None:
+            params['temperature'] = temperature
+        if max_tokens is not None:
+            params['max_tokens'] = max_tokens
+
+        import openai
+
+        response = openai.ChatCompletion.create(**params)
+        content = response.choices[0].message.content
+        result = parse(content) if parse else content
+        if use_cache:
+            self.backend.set(key, content)
+        return result
+
+    def get_stats(self) -> dict:
+        """Return hit/miss counters and hit rate"""
+        return {
+            'hits': self.stats.hits,
+            'misses': self.stats.misses,
+            'hit_rate': self.stats.hit_rate,
+        }
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_completion_cache() -> CompletionCache:
+    """Return the process-wide completion cache shared by all processors"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = CompletionCache()
+        return _default_cache
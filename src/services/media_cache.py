@@ -0,0 +1,175 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from .cache import CacheStats
+from .media_manifest import MediaManifest
+
+class MediaCachePolicy:
+    """Byte-budgeted LRU and age eviction for downloaded and temporary media"""
+
+    def __init__(self, manifest: MediaManifest, temp_path: Optional[str] = None,
+                 max_bytes: int = 10 * 1024 ** 3, max_age_hours: Optional[float] = 7 * 24,
+                 temp_max_age_hours: float = 6, interval_seconds: float = 600):
+        """
+        Initialize MediaCachePolicy
+
+        Args:
+            manifest (MediaManifest): Manifest of the download directory
+            temp_path (str): Directory of temporary files, which are not in the manifest
+            max_bytes (int): Combined byte budget for downloads and temp files
+            max_age_hours (float): Downloads unused for longer are evicted, None to disable
+            temp_max_age_hours (float): Temp files older than this are evicted
+            interval_seconds (float): Delay between background eviction runs
+        """
+        self.manifest = manifest
+        self.temp_path = temp_path
+        self.max_bytes = max_bytes
+        self.max_age_hours = max_age_hours
+        self.temp_max_age_hours = temp_max_age_hours
+        self.interval_seconds = interval_seconds
+        self.lookups = CacheStats()
+        self.bytes_reclaimed = 0
+        self.files_evicted = 0
+        self.runs = 0
+        self._pins: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @contextmanager
+    def pin(self, path: str):
+        """Protect a file from eviction while it is being written or read"""
+        with self._lock:
+            self._pins[path] = self._pins.get(path, 0) + 1
+        try:
+            yield path
+        finally:
+            with self._lock:
+                self._pins[path] -= 1
+                if not self._pins[path]:
+                    del self._pins[path]
+
+    def is_pinned(self, path: str) -> bool:
+        with self._lock:
+            return path in self._pins
+
+    def record_lookup(self, hit: bool) -> None:
+        """Count a download lookup for the hit rate"""
+        if hit:
+            self.lookups.hits += 1
+        else:
+            self.lookups.misses += 1
+
+    def _temp_files(self) -> List[Tuple[str, int, float]]:
+        """(path, size, last access) for every temp file, oldest first"""
+        if not self.temp_path or not os.path.isdir(self.temp_path):
+            return []
+        files = []
+        for entry in os.scandir(self.temp_path):
+            if entry.is_file():
+                stat = entry.stat()
+                files.append((entry.path, stat.st_size, max(stat.st_atime, stat.st_mtime)))
+        files.sort(key=lambda item: item[2])
+        return files
+
+    def _delete(self, path: str, size: int, in_manifest: bool) -> bool:
+        if self.is_pinned(path):
+            return False
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return False
+        if in_manifest:
+            self.manifest.remove(path)
+        self.bytes_reclaimed += size
+        self.files_evicted += 1
+        return True
+
+    def evict(self) -> int:
+        """
+        Run one eviction pass
+
+        Expired temp files and downloads unused for longer than max_age_hours
+        go first, then least recently used files until the combined size fits
+        the budget. Pinned files are never removed.
+
+        Returns:
+            int: Bytes reclaimed by this pass
+        """
+        with self._evict_lock:
+            reclaimed_before = self.bytes_reclaimed
+            now = time.time()
+
+            # Temp files are swept by age, then considered for the budget
+            temp_files = []
+            for path, size, last_access in self._temp_files():
+                if now - last_access > self.temp_max_age_hours * 3600 and self._delete(path, size, False):
+                    continue
+                temp_files.append((path, size, last_access, False))
+
+            downloads = []
+            for entry in self.manifest.entries():
+                expired = self.max_age_hours is not None and now - entry.last_access > self.max_age_hours * 3600
+                if expired and self._delete(entry.path, entry.size, True):
+                    continue
+                downloads.append((entry.path, entry.size, entry.last_access, True))
+
+            total = sum(item[1] for item in temp_files) + sum(item[1] for item in downloads)
+            if total > self.max_bytes:
+                for path, size, _, in_manifest in sorted(temp_files + downloads, key=lambda item: item[2]):
+                    if total <= self.max_bytes:
+                        break
+                    if self._delete(path, size, in_manifest):
+                        total -= size
+
+            self.runs += 1
+            return self.bytes_reclaimed - reclaimed_before
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.evict()
+            except Exception as e:
+                print(f"Error evicting media cache: {str(e)}")
+
+    def start(self) -> None:
+        """Start background eviction; calling it again is a no-op"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="media-cache-evictor", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get_stats(self) -> dict:
+        """Return reclaimed bytes, eviction counts and download hit rate"""
+        return {
+            'bytes_reclaimed': self.bytes_reclaimed,
+            'files_evicted': self.files_evicted,
+            'runs': self.runs,
+            'hits': self.lookups.hits,
+            'misses': self.lookups.misses,
+            'hit_rate': self.lookups.hit_rate,
+        }
+
+_policies: Dict[tuple, MediaCachePolicy] = {}
+_policies_lock = threading.Lock()
+
+def get_media_cache_policy(download_path: str, temp_path: Optional[str] = None, **kwargs) -> MediaCachePolicy:
+    """Return the process-wide policy for a download directory, creating it on first use"""
+    key = (download_path, temp_path)
+    with _policies_lock:
+        if key not in _policies:
+            _policies[key] = MediaCachePolicy(MediaManifest(download_path), temp_path, **kwargs)
+        return _policies[key]
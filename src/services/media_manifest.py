@@ -0,0 +1,131 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Files written by YouTubeService: video_<id>_<res>.mp4 and audio_<id>.<ext>
+MEDIA_FILENAME = re.compile(r'^(video|audio)_([A-Za-z0-9_-]{11})(?:_(\d+p))?\.(\w+)$')
+
+@dataclass
+class MediaEntry:
+    """One downloaded media file tracked by the manifest"""
+    path: str
+    video_id: str
+    resolution: str
+    size: int
+    created_at: float
+    last_access: float
+
+class MediaManifest:
+    """SQLite index of downloaded media, replacing directory scans"""
+
+    def __init__(self, directory: str, db_name: str = "manifest.db"):
+        """
+        Initialize MediaManifest
+
+        Args:
+            directory (str): Media directory the manifest describes
+            db_name (str): Database filename inside the directory
+        """
+        self.directory = directory
+        self.db_path = os.path.join(directory, db_name)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS media ("
+                "path TEXT PRIMARY KEY, video_id TEXT NOT NULL, resolution TEXT NOT NULL, "
+                "size INTEGER NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS media_video ON media (video_id, resolution)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS media_access ON media (last_access)")
+
+    def _query(self, sql: str, params: tuple = ()) -> List[MediaEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT path, video_id, resolution, size, created_at, last_access FROM media {sql}",
+                params
+            ).fetchall()
+        return [MediaEntry(*row) for row in rows]
+
+    def record(self, video_id: str, resolution: str, path: str, size: Optional[int] = None) -> None:
+        """Add or replace the entry for a downloaded file"""
+        now = time.time()
+        if size is None:
+            size = os.path.getsize(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO media (path, video_id, resolution, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, video_id, resolution, size, now, now)
+            )
+
+    def lookup(self, video_id: str, resolution: str) -> Optional[str]:
+        """Return the path for a video, updating its last access time; stale rows are dropped"""
+        entries = self._query("WHERE video_id = ? AND resolution = ?", (video_id, resolution))
+        for entry in entries:
+            if os.path.exists(entry.path):
+                self.touch(entry.path)
+                return entry.path
+            self.remove(entry.path)
+        return None
+
+    def touch(self, path: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE media SET last_access = ? WHERE path = ?", (time.time(), path))
+
+    def remove(self, path: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM media WHERE path = ?", (path,))
+
+    def entries(self) -> List[MediaEntry]:
+        """All entries, least recently used first"""
+        return self._query("ORDER BY last_access ASC")
+
+    def created_before(self, cutoff: float) -> List[MediaEntry]:
+        return self._query("WHERE created_at < ? ORDER BY created_at ASC", (cutoff,))
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM media").fetchone()[0]
+
+    def repair(self) -> Dict[str, int]:
+        """
+        Reconcile the manifest with the files actually on disk
+
+        Unknown media files are added, rows for missing files are removed and
+        sizes are refreshed. This is the only operation that scans the directory.
+
+        Returns:
+            Dict[str, int]: Counts of added, removed and updated entries
+        """
+        on_disk = {}
+        for entry in os.scandir(self.directory):
+            match = MEDIA_FILENAME.match(entry.name)
+            if entry.is_file() and match:
+                kind, video_id, resolution, _ = match.groups()
+                stat = entry.stat()
+                on_disk[entry.path] = (video_id, resolution or kind, stat.st_size, stat.st_mtime)
+
+        known = {entry.path: entry for entry in self._query("")}
+        counts = {'added': 0, 'removed': 0, 'updated': 0}
+        with self._lock, self._conn:
+            for path in known.keys() - on_disk.keys():
+                self._conn.execute("DELETE FROM media WHERE path = ?", (path,))
+                counts['removed'] += 1
+            for path, (video_id, resolution, size, mtime) in on_disk.items():
+                if path not in known:
+                    self._conn.execute(
+                        "INSERT INTO media (path, video_id, resolution, size, created_at, last_access) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (path, video_id, resolution, size, mtime, mtime)
+                    )
+                    counts['added'] += 1
+                elif known[path].size != size:
+                    self._conn.execute("UPDATE media SET size = ? WHERE path = ?", (size, path))
+                    counts['updated'] += 1
+        return counts
@@ -0,0 +1,85 @@
+import gc
+import threading
+from typing import Dict, Optional, Tuple
+
+ModelKey = Tuple[str, Optional[str], Optional[str]]
+
+_models: Dict[ModelKey, object] = {}
+_key_locks: Dict[ModelKey, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+def _key_lock(key: ModelKey) -> threading.Lock:
+    with _registry_lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+def get_whisper_model(name: str = "base", device: Optional[str] = None, dtype: Optional[str] = None):
+    """
+    Return the shared Whisper model, loading it on first use
+
+    Models are keyed by (name, device, dtype) and loaded at most once per
+    process. Concurrent callers asking for the same key wait for the single
+    load instead of loading their own copy.
+
+    Args:
+        name (str): Whisper model name, e.g. "base"
+        device (str): Torch device, None lets Whisper pick
+        dtype (str): Torch dtype name such as "float16", None keeps the default
+
+    Returns:
+        whisper.Whisper: Loaded model
+    """
+    key = (name, device, dtype)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _key_lock(key):
+        model = _models.get(key)
+        if model is None:
+            import whisper
+
+            model = whisper.load_model(name, device=device)
+            if dtype is not None:
+                import torch
+                model = model.to(dtype=getattr(torch, dtype))
+            _models[key] = model
+        return model
+
+def evict(name: Optional[str] = None, device: Optional[str] = None, dtype: Optional[str] = None) -> int:
+    """
+    Drop cached models and release their memory
+
+    With no arguments every model is evicted, otherwise only the matching key.
+
+    Returns:
+        int: Number of models evicted
+    """
+    with _registry_lock:
+        if name is None:
+            keys = list(_models)
+        else:
+            keys = [k for k in [(name, device, dtype)] if k in _models]
+        for key in keys:
+            del _models[key]
+
+    if keys:
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+    return len(keys)
+
+def memory_usage() -> Dict[ModelKey, int]:
+    """Return the parameter and buffer bytes held by each loaded model"""
+    usage = {}
+    for key, model in list(_models.items()):
+        tensors = list(model.parameters()) + list(model.buffers())
+        usage[key] = sum(t.numel() * t.element_size() for t in tensors)
+    return usage
+
+def loaded_models() -> list:
+    """Return the keys of the models currently loaded"""
+    return list(_models)
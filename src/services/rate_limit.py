@@ -0,0 +1,53 @@
+import time
+import threading
+from typing import Optional
+
+class QuotaExceededError(Exception):
+    """Raised when a request would exceed the remaining API quota"""
+
+class QuotaRateLimiter:
+    """Token bucket limiting request rate, with an optional total quota budget"""
+
+    def __init__(self, units_per_second: float = 5.0, burst: Optional[float] = None,
+                 quota: Optional[int] = None):
+        """
+        Initialize QuotaRateLimiter
+
+        Args:
+            units_per_second (float): Sustained rate in quota units per second
+            burst (float): Bucket size, defaults to one second of units
+            quota (int): Total units allowed for this limiter's lifetime, None for unlimited
+        """
+        self.rate = units_per_second
+        self.capacity = burst if burst is not None else max(1.0, units_per_second)
+        self.quota = quota
+        self.used = 0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> Optional[int]:
+        return None if self.quota is None else self.quota - self.used
+
+    def acquire(self, units: int = 1) -> None:
+        """Block until units are available, then consume them"""
+        with self._lock:
+            if self.quota is not None and self.used + units > self.quota:
+                raise QuotaExceededError(
+                    f"Request needs {units} quota units but only {self.remaining} remain"
+                )
+            self.used += units
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                # Requests larger than the bucket run once it is full and go into debt
+                needed = min(units, self.capacity)
+                if self._tokens >= needed:
+                    self._tokens -= units
+                    return
+                wait = (needed - self._tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,102 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import ffmpeg
+
+@dataclass
+class RenderOutput:
+    """One file produced by a RenderPipeline"""
+    path: str
+    kind: str
+    options: Dict = field(default_factory=dict)
+
+class RenderPipeline:
+    """
+    Decode a source once and fan it out to several outputs
+
+    Outputs that need filtering share one filter graph, fed through split when
+    more than one branch needs the decoded video. Outputs that need no
+    re-encode use stream copy.
+    """
+
+    VIDEO_CODEC = {'vcodec': 'libx264', 'preset': 'veryfast', 'crf': 23}
+    AUDIO_CODEC = {'acodec': 'aac', 'audio_bitrate': '128k'}
+
+    def __init__(self, input_path: str, start: Optional[float] = None, end: Optional[float] = None):
+        """
+        Initialize RenderPipeline
+
+        Args:
+            input_path (str): Source video
+            start (float): Clip start in seconds, None for the beginning
+            end (float): Clip end in seconds, None for the end of the source
+        """
+        self.input_path = input_path
+        self.start = start
+        self.end = end
+        self.outputs: List[RenderOutput] = []
+
+    def add_clip(self, path: str, stream_copy: bool = False) -> 'RenderPipeline':
+        """Add the source (or the time range) as-is, stream copied when stream_copy is set"""
+        self.outputs.append(RenderOutput(path, 'copy' if stream_copy else 'clip'))
+        return self
+
+    def add_shorts(self, path: str, width: int = 1080, height: int = 1920) -> 'RenderPipeline':
+        """Add a vertical version scaled to cover width x height and center-cropped"""
+        self.outputs.append(RenderOutput(path, 'shorts', {'width': width, 'height': height}))
+        return self
+
+    def add_audio(self, path: str, acodec: str = 'libmp3lame') -> 'RenderPipeline':
+        """Add an audio-only track"""
+        self.outputs.append(RenderOutput(path, 'audio', {'acodec': acodec}))
+        return self
+
+    def _shorts_filter(self, video, width: int, height: int):
+        video = ffmpeg.filter(video, 'scale', width, height, force_original_aspect_ratio='increase')
+        video = ffmpeg.filter(video, 'crop', width, height)
+        return ffmpeg.filter(video, 'setsar', 1)
+
+    def build(self):
+        """Return the ffmpeg-python output node for every added output"""
+        if not self.outputs:
+            raise ValueError("RenderPipeline has no outputs")
+
+        # Seek on the input so only the requested range is decoded
+        source = ffmpeg.input(self.input_path, **({'ss': self.start} if self.start else {}))
+        timing = {}
+        if self.end is not None:
+            timing['t'] = self.end - (self.start or 0)
+
+        # Every re-encoded video branch draws from one decode
+        decoded = sum(1 for output in self.outputs if output.kind in ('clip', 'shorts'))
+        split = source.video.split() if decoded > 1 else None
+        videos = iter([split[i] for i in range(decoded)] if split is not None else [source.video])
+
+        nodes = []
+        for output in self.outputs:
+            if output.kind == 'copy':
+                nodes.append(ffmpeg.output(source, output.path, c='copy', **timing))
+            elif output.kind == 'clip':
+                nodes.append(ffmpeg.output(
+                    next(videos), source.audio, output.path,
+                    **self.VIDEO_CODEC, **self.AUDIO_CODEC, **timing
+                ))
+            elif output.kind == 'shorts':
+                video = self._shorts_filter(next(videos), output.options['width'], output.options['height'])
+                nodes.append(ffmpeg.output(
+                    video, source.audio, output.path,
+                    **self.VIDEO_CODEC, **self.AUDIO_CODEC, **timing
+                ))
+            else:
+                nodes.append(ffmpeg.output(source.audio, output.path, acodec=output.options['acodec'], **timing))
+
+        return nodes[0] if len(nodes) == 1 else ffmpeg.merge_outputs(*nodes)
+
+    def run(self) -> Dict[str, str]:
+        """
+        Render every output in a single ffmpeg invocation
+
+        Returns:
+            Dict[str, str]: Output path per kind
+        """
+        ffmpeg.run(self.build(), overwrite_output=True, quiet=True)
+        return {output.kind: output.path for output in self.outputs}
@@ -1,37 +1,72 @@
-from typing import Dict, List
-from googletrans import Translator
-import whisper
+import os
+from typing import Dict, List, Optional
+from .model_registry import get_whisper_model
+from .subtitles import write_subtitle_files
+from .translation import SegmentTranslator
 
 class SubtitleGenerator:
-    def __init__(self):
-        self.model = whisper.load_model("base")
-        self.translator = Translator()
+    def __init__(self, model_name: str = "base", translator: Optional[SegmentTranslator] = None):
+        """
+        Initialize SubtitleGenerator
 
-    def generate_subtitles(self, audio_path: str, target_languages: List[str]) -> Dict[str, str]:
+        Args:
+            model_name (str): Whisper model name
+            translator (SegmentTranslator): Segment translator, defaults to googletrans
+        """
+        self.model_name = model_name
+        self.translator = translator or SegmentTranslator()
+
+    @property
+    def model(self):
+        """Shared Whisper model, loaded on first use"""
+        return get_whisper_model(self.model_name)
+
+    def generate_subtitles(self, audio_path: str, target_languages: List[str]) -> Dict[str, List[Dict]]:
+        """
+        Transcribe audio and translate it segment by segment, keeping Whisper timings
+
+        Returns:
+            Dict[str, List[Dict]]: Segments with 'start', 'end' and 'text' per language
+        """
         try:
             # First get English transcription
             result = self.model.transcribe(audio_path)
-            subtitles = {"en": result["text"]}
+            segments = [
+                {'start': segment['start'], 'end': segment['end'], 'text': segment['text'].strip()}
+                for segment in result["segments"]
+            ]
+            subtitles = {"en": segments}
             
-            # Translate to target languages
-            for lang in target_languages:
-                if lang != "en":
-                    translation = self.translator.translate(
-                        result["text"],
-                        dest=lang
-                    )
-                    subtitles[lang] = translation.text
+            # Translate to target languages concurrently, in batches of whole segments
+            languages = [lang for lang in dict.fromkeys(target_languages) if lang != "en"]
+            if languages:
+                subtitles.update(self.translator.translate_languages(segments, languages))
                     
             return subtitles
         except Exception as e:
             raise Exception(f"Error generating subtitles: {str(e)}")
 
-    def save_subtitles(self, subtitles: Dict[str, str], output_path: str, format: str = "srt") -> Dict[str, str]:
-        subtitle_files = {}
-        for lang, text in subtitles.items():
-            file_path = f"{output_path}/subtitles_{lang}.{format}"
-            with open(file_path, "w", encoding="utf-8") as f:
-                # Implementation of subtitle formatting based on format type
-                pass
-            subtitle_files[lang] = file_path
-        return subtitle_files
\ No newline at end of file
+    def save_subtitles(self, subtitles: Dict[str, List[Dict]], output_path: str, format: str = "srt",
+                       **cue_options) -> Dict[str, str]:
+        """
+        Write one subtitle file per language in a single pass
+
+        Args:
+            subtitles (Dict[str, List[Dict]]): Timed segments per language
+            output_path (str): Output directory
+            format (str): srt, vtt or ass
+            **cue_options: Line length and reading speed limits for build_cues
+
+        Returns:
+            Dict[str, str]: File path per language
+        """
+        try:
+            os.makedirs(output_path, exist_ok=True)
+            subtitle_files = {
+                lang: os.path.join(output_path, f"subtitles_{lang}.{format}")
+                for lang in subtitles
+            }
+            write_subtitle_files(subtitles, subtitle_files, format=format, **cue_options)
+            return subtitle_files
+        except Exception as e:
+            raise Exception(f"Error saving subtitles: {str(e)}")
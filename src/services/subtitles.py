@@ -0,0 +1,194 @@
+from dataclasses import dataclass
+from typing import Dict, IO, Iterable, Iterator, List, Optional
+
+# Common broadcast limits: two lines of 42 characters read at 17 characters per second
+MAX_LINE_CHARS = 42
+MAX_LINES = 2
+MAX_CHARS_PER_SECOND = 17.0
+MIN_CUE_SECONDS = 1.0
+MAX_CUE_SECONDS = 7.0
+MERGE_GAP_SECONDS = 0.3
+
+WRITE_BUFFER_BYTES = 1 << 16
+
+@dataclass
+class Cue:
+    """One subtitle cue; text may contain a line break"""
+    start: float
+    end: float
+    text: str
+
+def wrap_text(text: str, max_line_chars: int = MAX_LINE_CHARS, max_lines: int = MAX_LINES) -> str:
+    """Break text into at most max_lines lines of roughly equal length"""
+    words = text.split()
+    if len(text) <= max_line_chars or max_lines < 2:
+        return " ".join(words)
+
+    # Balance two lines around the middle; longer text is already split upstream
+    best, best_score = 1, None
+    for i in range(1, len(words)):
+        first, second = " ".join(words[:i]), " ".join(words[i:])
+        score = max(len(first), len(second))
+        if best_score is None or score < best_score:
+            best, best_score = i, score
+    return " ".join(words[:best]) + "\n" + " ".join(words[best:])
+
+def _split_segment(start: float, end: float, text: str, max_chars: int,
+                   max_seconds: float) -> Iterator[Cue]:
+    """Split one segment into cues that fit max_chars, timing each by its share of characters"""
+    words = text.split()
+    if not words:
+        return
+    duration = max(end - start, 0.0)
+    pieces = max(1, -(-int(duration * 1000) // int(max_seconds * 1000)))
+    target = max(1, min(max_chars, -(-len(text) // pieces)))
+
+    chunks, current = [], []
+    for word in words:
+        if current and len(" ".join(current + [word])) > target:
+            chunks.append(" ".join(current))
+            current = []
+        current.append(word)
+    chunks.append(" ".join(current))
+
+    total_chars = sum(len(chunk) for chunk in chunks)
+    position = start
+    for i, chunk in enumerate(chunks):
+        chunk_end = end if i == len(chunks) - 1 else position + duration * len(chunk) / total_chars
+        yield Cue(position, chunk_end, chunk)
+        position = chunk_end
+
+def build_cues(segments: Iterable[Dict], max_line_chars: int = MAX_LINE_CHARS, max_lines: int = MAX_LINES,
+               max_cps: float = MAX_CHARS_PER_SECOND, min_seconds: float = MIN_CUE_SECONDS,
+               max_seconds: float = MAX_CUE_SECONDS, merge_gap: float = MERGE_GAP_SECONDS) -> Iterator[Cue]:
+    """
+    Turn timed segments into display-ready cues, lazily
+
+    Long segments are split to fit the line budget, short neighbours are merged
+    when the result still fits, and each cue is held on screen long enough to be
+    read at max_cps without overlapping the next one. Only one cue is buffered.
+
+    Args:
+        segments (Iterable[Dict]): Dicts with 'start', 'end' and 'text', in time order
+        max_line_chars (int): Characters per line
+        max_lines (int): Lines per cue
+        max_cps (float): Reading speed limit in characters per second
+        min_seconds (float): Cues shorter than this are merged with the next when possible
+        max_seconds (float): Longest time a cue stays on screen
+        merge_gap (float): Largest silence bridged by a merge
+
+    Returns:
+        Iterator[Cue]: Cues with wrapped text
+    """
+    max_chars = max_line_chars * max_lines
+    pending: Optional[Cue] = None
+
+    def finish(cue: Cue, next_start: Optional[float]) -> Cue:
+        # Extend display time up to the reading-speed minimum, never into the next cue
+        needed = cue.start + min(max_seconds, max(min_seconds, len(cue.text) / max_cps))
+        end = max(cue.end, needed)
+        if next_start is not None:
+            end = min(end, next_start)
+        return Cue(cue.start, max(end, cue.end), wrap_text(cue.text, max_line_chars, max_lines))
+
+    for segment in segments:
+        text = " ".join(segment['text'].split())
+        for cue in _split_segment(float(segment['start']), float(segment['end']), text, max_chars, max_seconds):
+            if pending is not None:
+                merged_text = f"{pending.text} {cue.text}"
+                can_merge = (
+                    pending.end - pending.start < min_seconds
+                    and cue.start - pending.end <= merge_gap
+                    and len(merged_text) <= max_chars
+                    and cue.end - pending.start <= max_seconds
+                )
+                if can_merge:
+                    pending = Cue(pending.start, cue.end, merged_text)
+                    continue
+                yield finish(pending, cue.start)
+            pending = cue
+
+    if pending is not None:
+        yield finish(pending, None)
+
+def _clock(seconds: float, separator: str) -> str:
+    millis = int(round(max(seconds, 0.0) * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+def _ass_clock(seconds: float) -> str:
+    centis = int(round(max(seconds, 0.0) * 100))
+    hours, centis = divmod(centis, 360000)
+    minutes, centis = divmod(centis, 6000)
+    secs, centis = divmod(centis, 100)
+    return f"{hours:d}:{minutes:02d}:{secs:02d}.{centis:02d}"
+
+ASS_HEADER = """[Script Info]
+ScriptType: v4.00+
+PlayResX: 1920
+PlayResY: 1080
+WrapStyle: 2
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,Arial,56,&H00FFFFFF,&H000000FF,&H00000000,&H64000000,0,0,0,0,100,100,0,0,1,3,0,2,60,60,50,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+def format_cue(cue: Cue, index: int, format: str) -> str:
+    """Render one cue; index is 1-based and only used by SRT"""
+    if format == "srt":
+        return f"{index}\n{_clock(cue.start, ',')} --> {_clock(cue.end, ',')}\n{cue.text}\n\n"
+    if format == "vtt":
+        return f"{_clock(cue.start, '.')} --> {_clock(cue.end, '.')}\n{cue.text}\n\n"
+    if format == "ass":
+        text = cue.text.replace("{", "(").replace("}", ")").replace("\n", "\\N")
+        return f"Dialogue: 0,{_ass_clock(cue.start)},{_ass_clock(cue.end)},Default,,0,0,0,,{text}\n"
+    raise ValueError(f"Unsupported subtitle format: {format}")
+
+SUBTITLE_HEADERS = {"srt": "", "vtt": "WEBVTT\n\n", "ass": ASS_HEADER}
+
+def write_subtitle_files(tracks: Dict[str, Iterable[Dict]], paths: Dict[str, str], format: str = "srt",
+                         **cue_options) -> Dict[str, int]:
+    """
+    Write every language track in a single interleaved pass
+
+    All files are open at once with large write buffers, and each track's
+    segments are consumed lazily, so memory stays constant in video length.
+
+    Args:
+        tracks (Dict[str, Iterable[Dict]]): Segments per language
+        paths (Dict[str, str]): Output path per language
+        format (str): srt, vtt or ass
+        **cue_options: Passed to build_cues
+
+    Returns:
+        Dict[str, int]: Number of cues written per language
+    """
+    if format not in SUBTITLE_HEADERS:
+        raise ValueError(f"Unsupported subtitle format: {format}")
+
+    files: Dict[str, IO[str]] = {}
+    try:
+        for lang in tracks:
+            files[lang] = open(paths[lang], "w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES)
+            files[lang].write(SUBTITLE_HEADERS[format])
+
+        streams = {lang: build_cues(segments, **cue_options) for lang, segments in tracks.items()}
+        counts = {lang: 0 for lang in tracks}
+        while streams:
+            for lang in list(streams):
+                cue = next(streams[lang], None)
+                if cue is None:
+                    del streams[lang]
+                    continue
+                counts[lang] += 1
+                files[lang].write(format_cue(cue, counts[lang], format))
+        return counts
+    finally:
+        for f in files.values():
+            f.close()
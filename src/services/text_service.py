@@ -1,45 +1,60 @@
-import openai
 from typing import Dict, List, Optional
 import json
+from concurrent.futures import ThreadPoolExecutor
+from .llm_cache import CompletionCache, get_completion_cache
+from .digest import TranscriptDigester, chunk_text
+
+def parse_json_response(text: str) -> Dict:
+    """Helper function to safely parse JSON from OpenAI response"""
+    try:
+        # Try to parse as is first
+        return json.loads(text)
+    except json.JSONDecodeError:
+        try:
+            # Find the first { and last } to extract JSON
+            start = text.find('{')
+            end = text.rfind('}') + 1
+            if start != -1 and end != 0:
+                return json.loads(text[start:end])
+            raise ValueError("No JSON object found in response")
+        except Exception as e:
+            raise ValueError(f"Failed to parse JSON response: {str(e)}")
 
 class TextProcessor:
-    def __init__(self, api_key: str):
-        """Initialize with OpenAI API key"""
+    # Token budget per chunk when formatting long transcriptions
+    FORMAT_CHUNK_TOKENS = 1500
+
+    def __init__(self, api_key: str, completion_cache: Optional[CompletionCache] = None):
+        """Initialize with OpenAI API key and a shared completion cache"""
+        import openai
+
         openai.api_key = api_key
+        self.completion_cache = completion_cache or get_completion_cache()
+        self.digester = TranscriptDigester(self.completion_cache)
 
     def _parse_json_response(self, text: str) -> Dict:
         """Helper function to safely parse JSON from OpenAI response"""
-        try:
-            # Try to parse as is first
-            return json.loads(text)
-        except json.JSONDecodeError:
-            try:
-                # Find the first { and last } to extract JSON
-                start = text.find('{')
-                end = text.rfind('}') + 1
-                if start != -1 and end != 0:
-                    return json.loads(text[start:end])
-                raise ValueError("No JSON object found in response")
-            except Exception as e:
-                raise Exception(f"Failed to parse JSON response: {str(e)}")
-
-    def generate_summary(self, text: str, max_length: int = 150) -> str:
+        return parse_json_response(text)
+
+    def generate_summary(self, text: str, max_length: int = 150, use_cache: bool = True) -> str:
         """Generate a summary of the text using GPT"""
         try:
-            response = openai.ChatCompletion.create(
+            text = self.digester.digest(text, use_cache)
+            content = self.completion_cache.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a content summarizer. Create a concise summary."},
                     {"role": "user", "content": f"Summarize this text in {max_length} words or less:\n{text}"}
                 ],
                 max_tokens=max_length * 2,  # Double the tokens to account for word-to-token ratio
-                temperature=0.7
+                temperature=0.7,
+                use_cache=use_cache
             )
-            return response.choices[0].message.content.strip()
+            return content.strip()
         except Exception as e:
             raise Exception(f"Error generating summary: {str(e)}")
 
-    def generate_social_posts(self, video_title: str, description: str, duration: str) -> Dict:
+    def generate_social_posts(self, video_title: str, description: str, duration: str, use_cache: bool = True) -> Dict:
         """Generate social media posts for different platforms"""
         try:
             prompt = f"""Create social media posts for this YouTube video. Return ONLY a JSON object with the following format:
@@ -56,20 +71,20 @@ class TextProcessor:
             Duration: {duration}
             """
 
-            response = openai.ChatCompletion.create(
+            return self.completion_cache.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a social media expert. Create platform-specific posts. Return only valid JSON."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7
+                temperature=0.7,
+                use_cache=use_cache,
+                parse=self._parse_json_response
             )
-
-            return self._parse_json_response(response.choices[0].message.content)
         except Exception as e:
             raise Exception(f"Error generating social posts: {str(e)}")
 
-    def analyze_seo(self, title: str, description: str, tags: List[str]) -> Dict:
+    def analyze_seo(self, title: str, description: str, tags: List[str], use_cache: bool = True) -> Dict:
         """Analyze and suggest SEO improvements"""
         try:
             prompt = f"""Analyze this YouTube content for SEO optimization. Return ONLY a JSON object with the following format:
@@ -86,20 +101,20 @@ class TextProcessor:
             Current Tags: {', '.join(tags) if tags else 'No tags'}
             """
 
-            response = openai.ChatCompletion.create(
+            return self.completion_cache.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are an SEO expert. Provide analysis in valid JSON format only."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7
+                temperature=0.7,
+                use_cache=use_cache,
+                parse=self._parse_json_response
             )
-
-            return self._parse_json_response(response.choices[0].message.content)
         except Exception as e:
             raise Exception(f"Error analyzing SEO: {str(e)}")
 
-    def analyze_trending_topics(self, category: str) -> Dict:
+    def analyze_trending_topics(self, category: str, use_cache: bool = True) -> Dict:
         """Analyze trending topics in a specific category"""
         try:
             prompt = f"""Analyze trending topics for YouTube content. Return ONLY a JSON object with the following format:
@@ -113,20 +128,20 @@ class TextProcessor:
             Category: {category}
             """
 
-            response = openai.ChatCompletion.create(
+            return self.completion_cache.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a content strategy expert. Analyze trends and return only valid JSON."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7
+                temperature=0.7,
+                use_cache=use_cache,
+                parse=self._parse_json_response
             )
-
-            return self._parse_json_response(response.choices[0].message.content)
         except Exception as e:
             raise Exception(f"Error analyzing trends: {str(e)}")
 
-    def suggest_hashtags(self, title: str, description: str, category: str) -> List[str]:
+    def suggest_hashtags(self, title: str, description: str, category: str, use_cache: bool = True) -> List[str]:
         """
         Generate relevant hashtags for the video
         
@@ -134,6 +149,7 @@ class TextProcessor:
             title (str): Video title
             description (str): Video description
             category (str): Video category
+            use_cache (bool): Reuse a cached completion for identical prompts
             
         Returns:
             List[str]: List of relevant hashtags
@@ -158,17 +174,18 @@ class TextProcessor:
             - Mix of popular and niche hashtags
             """
 
-            response = openai.ChatCompletion.create(
+            content = self.completion_cache.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a hashtag generator. Respond only with comma-separated hashtags."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7
+                temperature=0.7,
+                use_cache=use_cache
             )
 
             # Get the raw response text
-            hashtag_text = response.choices[0].message.content.strip()
+            hashtag_text = content.strip()
             
             # Split by comma and clean up each hashtag
             hashtags = [tag.strip() for tag in hashtag_text.split(',')]
@@ -184,49 +201,61 @@ class TextProcessor:
         except Exception as e:
             raise Exception(f"Error generating hashtags: {str(e)}")
 
-    def transcribe_video(self, text: str) -> str:
+    def _format_transcription_chunk(self, text: str, use_cache: bool) -> str:
+        """Clean and format one bounded-size piece of a transcription"""
+        prompt = f"""Clean and format this transcription text. Return proper punctuation, paragraphs, and speaker labels if detected:
+
+            {text}
+
+            Format the response as regular text with proper formatting and punctuation.
+            """
+
+        content = self.completion_cache.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "You are an expert transcriber. Format text into clean, readable transcriptions."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            use_cache=use_cache
+        )
+        return content.strip()
+
+    def transcribe_video(self, text: str, use_cache: bool = True) -> str:
         """
         Transcribe video content using OpenAI
         
         Args:
             text (str): Raw audio transcription text
+            use_cache (bool): Reuse a cached completion for identical prompts
             
         Returns:
             str: Cleaned and formatted transcription
         """
         try:
-            prompt = f"""Clean and format this transcription text. Return proper punctuation, paragraphs, and speaker labels if detected:
-
-            {text}
-
-            Format the response as regular text with proper formatting and punctuation.
-            """
-
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert transcriber. Format text into clean, readable transcriptions."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3
-            )
-
-            return response.choices[0].message.content.strip()
+            chunks = chunk_text(text, self.FORMAT_CHUNK_TOKENS) or [text]
+            with ThreadPoolExecutor(max_workers=self.digester.max_workers) as executor:
+                formatted = list(executor.map(
+                    lambda chunk: self._format_transcription_chunk(chunk, use_cache), chunks
+                ))
+            return "\n\n".join(formatted)
             
         except Exception as e:
             raise Exception(f"Error formatting transcription: {str(e)}")
 
-    def extract_key_points(self, transcription: str) -> List[str]:
+    def extract_key_points(self, transcription: str, use_cache: bool = True) -> List[str]:
         """
         Extract key points from transcription
         
         Args:
             transcription (str): Video transcription
+            use_cache (bool): Reuse a cached completion for identical prompts
             
         Returns:
             List[str]: List of key points
         """
         try:
+            transcription = self.digester.digest(transcription, use_cache)
             prompt = f"""Extract the main key points from this transcription. 
             Return a simple list of the most important points discussed:
 
@@ -235,23 +264,24 @@ class TextProcessor:
             Return 5-7 key points, focusing on the main ideas and takeaways.
             """
 
-            response = openai.ChatCompletion.create(
+            content = self.completion_cache.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a content analyzer. Extract key points from transcriptions."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                use_cache=use_cache
             )
 
-            points = response.choices[0].message.content.strip().split('\n')
+            points = content.strip().split('\n')
             # Clean up points and remove empty lines
             return [p.strip('- ').strip() for p in points if p.strip()]
             
         except Exception as e:
             raise Exception(f"Error extracting key points: {str(e)}")
 
-    def generate_video_script(self, title: str, outline: str) -> Dict:
+    def generate_video_script(self, title: str, outline: str, use_cache: bool = True) -> Dict:
         """Generate a video script from a title and outline"""
         try:
             prompt = f"""Create a video script. Return ONLY a JSON object with the following format:
@@ -272,15 +302,15 @@ class TextProcessor:
             Outline: {outline}
             """
 
-            response = openai.ChatCompletion.create(
+            return self.completion_cache.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a video script writer. Create engaging scripts in valid JSON format only."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7
+                temperature=0.7,
+                use_cache=use_cache,
+                parse=self._parse_json_response
             )
-
-            return self._parse_json_response(response.choices[0].message.content)
         except Exception as e:
             raise Exception(f"Error generating video script: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,87 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# A stage takes (video_id, language) and returns transcript entries or None
+Stage = Callable[[str, str], Optional[List[Dict]]]
+
+@dataclass
+class StageMetric:
+    """Timing and outcome of one resolution stage"""
+    stage: str
+    seconds: float
+    status: str
+    error: Optional[str] = None
+
+class TranscriptResolver:
+    """Resolve a transcript by trying each source stage in order"""
+
+    def __init__(self, stages: List[Tuple[str, Stage]], on_resolved: Optional[Callable] = None):
+        """
+        Initialize TranscriptResolver
+
+        Args:
+            stages (List[Tuple[str, Stage]]): Named stages, cheapest first
+            on_resolved (Callable): Called with (video_id, language, stage, entries)
+                after a stage succeeds, e.g. to fill the cache
+        """
+        self.stages = stages
+        self.on_resolved = on_resolved
+        self.stage_totals: Dict[str, Dict[str, float]] = {}
+
+    def _record(self, metric: StageMetric) -> None:
+        totals = self.stage_totals.setdefault(
+            metric.stage, {'calls': 0, 'hits': 0, 'total_seconds': 0.0}
+        )
+        totals['calls'] += 1
+        totals['total_seconds'] += metric.seconds
+        if metric.status == 'hit':
+            totals['hits'] += 1
+
+    def resolve(self, video_id: str, language: str,
+                skip: Iterable[str] = ()) -> Tuple[List[Dict], str, List[StageMetric]]:
+        """
+        Run stages until one returns entries
+
+        Args:
+            video_id (str): YouTube video ID
+            language (str): Preferred transcript language
+            skip (Iterable[str]): Names of stages not to run for this call
+
+        Returns:
+            Tuple[List[Dict], str, List[StageMetric]]: Entries, the stage that
+            produced them and the metrics of every stage attempted
+        """
+        metrics = []
+        skip = set(skip)
+        for name, stage in self.stages:
+            if name in skip:
+                continue
+            started = time.perf_counter()
+            try:
+                entries = stage(video_id, language)
+                metric = StageMetric(name, time.perf_counter() - started, 'hit' if entries else 'miss')
+            except Exception as e:
+                entries = None
+                metric = StageMetric(name, time.perf_counter() - started, 'error', str(e))
+
+            metrics.append(metric)
+            self._record(metric)
+            if entries:
+                if self.on_resolved is not None:
+                    self.on_resolved(video_id, language, name, entries)
+                return entries, name, metrics
+
+        errors = "; ".join(f"{m.stage}: {m.error}" for m in metrics if m.error)
+        raise ValueError(f"No transcript source succeeded ({errors or 'all sources empty'})")
+
+def segments_to_entries(segments: List[Dict]) -> List[Dict]:
+    """Convert Whisper segments to YouTube caption style entries"""
+    return [
+        {
+            'text': segment['text'],
+            'start': segment['start'],
+            'duration': segment['end'] - segment['start']
+        }
+        for segment in segments
+    ]
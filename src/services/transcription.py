@@ -0,0 +1,256 @@
+import os
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import ffmpeg
+from .model_registry import get_whisper_model
+from ..config import Config
+
+# Whisper always works on 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+# Bytes read from the ffmpeg pipe per call
+PIPE_CHUNK_BYTES = 1 << 20
+
+def load_audio_samples(media_path: str, mmap_path: Optional[str] = None) -> np.ndarray:
+    """
+    Decode any audio or video file straight to 16 kHz mono float32 samples
+
+    ffmpeg writes raw PCM to a pipe which is read into a NumPy buffer, so no
+    intermediate audio file is encoded and the audio is decoded only once.
+
+    Args:
+        media_path (str): Path to an audio or video file
+        mmap_path (str): Optional file to spool samples into and memory-map,
+            keeping very long audio out of process memory
+
+    Returns:
+        np.ndarray: Float32 samples in [-1, 1]
+    """
+    process = None
+    try:
+        process = (
+            ffmpeg
+            .input(media_path)
+            .output('pipe:', format='f32le', acodec='pcm_f32le', ac=1, ar=SAMPLE_RATE)
+            .global_args('-nostdin', '-loglevel', 'error')
+            .run_async(pipe_stdout=True, pipe_stderr=True)
+        )
+
+        # Drain stderr alongside stdout; a corrupt input can log more than a
+        # pipe buffer of errors, and ffmpeg would block writing them
+        stderr_chunks: List[bytes] = []
+        stderr_reader = threading.Thread(
+            target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True
+        )
+        stderr_reader.start()
+
+        if mmap_path:
+            with open(mmap_path, 'wb') as f:
+                while True:
+                    chunk = process.stdout.read(PIPE_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+        else:
+            buffer = bytearray()
+            while True:
+                chunk = process.stdout.read(PIPE_CHUNK_BYTES)
+                if not chunk:
+                    break
+                buffer += chunk
+
+        returncode = process.wait()
+        stderr_reader.join()
+        if returncode != 0:
+            raise RuntimeError(b"".join(stderr_chunks).decode('utf-8', errors='replace').strip())
+
+        if mmap_path:
+            if os.path.getsize(mmap_path) == 0:
+                return np.zeros(0, dtype=np.float32)
+            return np.memmap(mmap_path, dtype=np.float32, mode='r')
+        # Trim a trailing partial sample so the buffer maps cleanly
+        usable = len(buffer) - len(buffer) % 4
+        return np.frombuffer(buffer, dtype=np.float32, count=usable // 4)
+    except Exception as e:
+        raise Exception(f"Error decoding audio: {str(e)}")
+    finally:
+        # Reading can fail part way through; never leave ffmpeg running
+        if process is not None and process.poll() is None:
+            process.kill()
+            process.wait()
+
+def find_cut_points(audio: np.ndarray, window_seconds: float, search_seconds: float = 10.0,
+                    frame_ms: int = 30) -> List[int]:
+    """
+    Pick window boundaries that fall on the quietest frame near each target
+
+    Args:
+        audio (np.ndarray): 16 kHz mono samples
+        window_seconds (float): Target window length
+        search_seconds (float): How far either side of a target to look for silence
+        frame_ms (int): Energy frame length in milliseconds
+
+    Returns:
+        List[int]: Sample indices starting at 0 and ending at len(audio)
+    """
+    frame = SAMPLE_RATE * frame_ms // 1000
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return [0, len(audio)]
+
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    energy = np.sqrt(np.mean(frames.astype(np.float32) ** 2, axis=1))
+
+    window_frames = max(1, int(window_seconds * 1000 / frame_ms))
+    search_frames = int(search_seconds * 1000 / frame_ms)
+
+    cuts = [0]
+    target = window_frames
+    while target < n_frames - search_frames:
+        lo = max(cuts[-1] // frame + 1, target - search_frames)
+        hi = min(n_frames, target + search_frames + 1)
+        best = lo + int(np.argmin(energy[lo:hi]))
+        cuts.append(best * frame)
+        target = best + window_frames
+    cuts.append(len(audio))
+    return cuts
+
+def plan_windows(audio: np.ndarray, window_seconds: float = 300.0,
+                 overlap_seconds: float = 2.0) -> List[Tuple[int, int, int]]:
+    """
+    Split audio into overlapping windows on silence boundaries
+
+    Returns:
+        List[Tuple[int, int, int]]: (nominal start, nominal end, padded end) sample indices
+    """
+    cuts = find_cut_points(audio, window_seconds)
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+    return [
+        (start, end, min(len(audio), end + overlap))
+        for start, end in zip(cuts[:-1], cuts[1:])
+    ]
+
+def _init_worker(threads: int) -> None:
+    """Limit torch threads so worker processes don't oversubscribe the CPU"""
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+def default_workers() -> int:
+    """Worker processes for parallel transcription, capped by Config.WHISPER_MAX_WORKERS"""
+    return max(1, min(Config.WHISPER_MAX_WORKERS, os.cpu_count() or 1))
+
+def _transcribe_window(model_name: str, samples: np.ndarray, offset: float,
+                       language: Optional[str], device: Optional[str] = None) -> List[Dict]:
+    """Transcribe one window and shift its segment times by offset seconds"""
+    model = get_whisper_model(model_name, device)
+    result = model.transcribe(samples, language=language, fp16=False)
+    return [
+        {
+            'start': segment['start'] + offset,
+            'end': segment['end'] + offset,
+            'text': segment['text'].strip()
+        }
+        for segment in result.get('segments', [])
+    ]
+
+def stitch_segments(window_segments: List[List[Dict]], windows: List[Tuple[int, int, int]]) -> List[Dict]:
+    """
+    Merge per-window segments, dropping duplicates from the overlaps
+
+    A segment is kept by the window whose nominal range contains its midpoint,
+    so text decoded twice near a boundary appears once.
+    """
+    stitched = []
+    for segments, (start, end, _) in zip(window_segments, windows):
+        lo = start / SAMPLE_RATE
+        hi = end / SAMPLE_RATE
+        for segment in segments:
+            midpoint = (segment['start'] + segment['end']) / 2
+            if lo <= midpoint < hi and segment['text']:
+                stitched.append(segment)
+    stitched.sort(key=lambda segment: segment['start'])
+    return stitched
+
+def iter_transcription(audio: np.ndarray, model_name: str = "base", language: Optional[str] = None,
+                       window_seconds: float = 60.0, overlap_seconds: float = 2.0,
+                       workers: int = 1, device: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Yield transcript segments window by window as they are decoded
+
+    With workers > 1 windows are decoded on a process pool, but segments are
+    still yielded in time order as soon as each window in sequence is done.
+    Every worker process loads its own copy of the model, so memory grows by
+    one model per worker (about 1 GB for "base" on CPU, several GB for "large").
+
+    Args:
+        audio (np.ndarray): 16 kHz mono float32 samples
+        model_name (str): Whisper model name
+        language (str): Spoken language, None to auto-detect per window
+        window_seconds (float): Target window length
+        overlap_seconds (float): Audio shared between neighbouring windows
+        workers (int): Worker processes, 1 decodes in this process
+        device (str): Torch device the model is loaded on, in this process or each worker
+
+    Yields:
+        Dict: Segment with start, end and text
+    """
+    windows = plan_windows(audio, window_seconds, overlap_seconds)
+    if workers <= 1 or len(windows) == 1:
+        for window in windows:
+            start, _, padded_end = window
+            segments = _transcribe_window(
+                model_name, audio[start:padded_end], start / SAMPLE_RATE, language, device
+            )
+            yield from stitch_segments([segments], [window])
+        return
+
+    cpu_count = os.cpu_count() or 1
+    workers = min(workers, len(windows))
+    threads = max(1, cpu_count // workers)
+
+    # Spawn avoids forking a parent that may already hold torch threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(threads,)) as executor:
+        futures = [
+            executor.submit(_transcribe_window, model_name, audio[start:padded_end],
+                            start / SAMPLE_RATE, language, device)
+            for start, _, padded_end in windows
+        ]
+        for future, window in zip(futures, windows):
+            yield from stitch_segments([future.result()], [window])
+
+def transcribe_parallel(audio: np.ndarray, model_name: str = "base", language: Optional[str] = None,
+                        window_seconds: float = 300.0, overlap_seconds: float = 2.0,
+                        workers: Optional[int] = None, device: Optional[str] = None) -> List[Dict]:
+    """
+    Transcribe long audio on a process pool, one silence-bounded window per task
+
+    Args:
+        audio (np.ndarray): 16 kHz mono float32 samples
+        model_name (str): Whisper model name, loaded once per worker process
+        language (str): Spoken language, None to auto-detect per window
+        window_seconds (float): Target window length
+        overlap_seconds (float): Audio shared between neighbouring windows
+        workers (int): Worker processes, defaults to default_workers(); each
+            holds its own model in memory
+        device (str): Torch device the model is loaded on
+
+    Returns:
+        List[Dict]: Segments with start, end and text, in time order
+    """
+    return list(iter_transcription(
+        audio,
+        model_name=model_name,
+        language=language,
+        window_seconds=window_seconds,
+        overlap_seconds=overlap_seconds,
+        workers=workers or default_workers(),
+        device=device
+    ))
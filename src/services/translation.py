@@ -0,0 +1,143 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from .cache import CacheStats, LRUCache
+
+# googletrans rejects requests over 5000 characters
+BATCH_CHARS = 4500
+
+# Joins a batch into one request; line breaks survive translation
+LINE_SEPARATOR = "\n"
+
+class GoogleTranslateBackend:
+    """googletrans backend; the client is created on first use and is not shared across threads"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            from googletrans import Translator
+
+            client = self._local.client = Translator()
+        return client
+
+    def translate_batch(self, texts: List[str], dest: str) -> List[str]:
+        """
+        Translate a batch in one request, one line per text
+
+        googletrans sends a request per list item, so the batch is joined into a
+        single text instead. If the reply does not split back into as many lines,
+        or a text already spans several lines, each text is sent on its own.
+        """
+        client = self._client()
+        if len(texts) > 1 and not any(LINE_SEPARATOR in text for text in texts):
+            lines = client.translate(LINE_SEPARATOR.join(texts), dest=dest).text.split(LINE_SEPARATOR)
+            if len(lines) == len(texts):
+                return [line.strip() for line in lines]
+        return [result.text for result in client.translate(texts, dest=dest)]
+
+class TranslationMemory:
+    """Per-language LRU of previously translated lines"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._languages: Dict[str, LRUCache] = {}
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def _language(self, dest: str) -> LRUCache:
+        with self._lock:
+            if dest not in self._languages:
+                self._languages[dest] = LRUCache(max_entries=self.max_entries)
+            return self._languages[dest]
+
+    def get(self, text: str, dest: str) -> Optional[str]:
+        value = self._language(dest).get(text)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    def set(self, text: str, dest: str, translation: str) -> None:
+        self._language(dest).set(text, translation)
+
+class SegmentTranslator:
+    """Translate timed segments in size-bounded batches, all languages concurrently"""
+
+    def __init__(self, backend=None, memory: Optional[TranslationMemory] = None,
+                 batch_chars: int = BATCH_CHARS, max_workers: int = 4):
+        """
+        Initialize SegmentTranslator
+
+        Args:
+            backend: Object with translate_batch(texts, dest) -> List[str], defaults to googletrans
+            memory (TranslationMemory): Cache of earlier translations, shared across calls
+            batch_chars (int): Character budget per backend request
+            max_workers (int): Concurrent backend requests across all languages
+        """
+        self.backend = backend or GoogleTranslateBackend()
+        self.memory = memory or TranslationMemory()
+        self.batch_chars = batch_chars
+        self.max_workers = max_workers
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        """Group whole lines so each joined request stays under batch_chars"""
+        batches, current, size = [], [], 0
+        for text in texts:
+            if current and size + len(LINE_SEPARATOR) + len(text) > self.batch_chars:
+                batches.append(current)
+                current, size = [], 0
+            size += len(text) + (len(LINE_SEPARATOR) if current else 0)
+            current.append(text)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _translate_batch(self, batch: List[str], dest: str) -> Dict[str, str]:
+        translations = self.backend.translate_batch(batch, dest)
+        if len(translations) != len(batch):
+            raise ValueError(f"Translator returned {len(translations)} lines for {len(batch)}")
+        for text, translation in zip(batch, translations):
+            self.memory.set(text, dest, translation)
+        return dict(zip(batch, translations))
+
+    def translate_languages(self, segments: List[Dict], languages: List[str]) -> Dict[str, List[Dict]]:
+        """
+        Translate segment texts into every language, keeping segment timings
+
+        Each distinct line is translated once per language; lines already in the
+        translation memory, such as recurring intros and outros, are not sent.
+
+        Args:
+            segments (List[Dict]): Segments with 'start', 'end' and 'text'
+            languages (List[str]): Target language codes
+
+        Returns:
+            Dict[str, List[Dict]]: Translated segments per language
+        """
+        texts = list(dict.fromkeys(segment['text'] for segment in segments if segment['text']))
+        known: Dict[str, Dict[str, str]] = {dest: {} for dest in languages}
+        jobs: List[Tuple[List[str], str]] = []
+        for dest in languages:
+            missing = []
+            for text in texts:
+                translation = self.memory.get(text, dest)
+                if translation is None:
+                    missing.append(text)
+                else:
+                    known[dest][text] = translation
+            jobs.extend((batch, dest) for batch in self._batches(missing))
+
+        if jobs:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(jobs)))) as executor:
+                futures = [(dest, executor.submit(self._translate_batch, batch, dest)) for batch, dest in jobs]
+                for dest, future in futures:
+                    known[dest].update(future.result())
+
+        return {
+            dest: [{**segment, 'text': known[dest].get(segment['text'], segment['text'])} for segment in segments]
+            for dest in languages
+        }
@@ -1,25 +1,113 @@
 import os
-import streamlit as st
-from youtube_transcript_api import YouTubeTranscriptApi
+import time
 from urllib.parse import urlparse, parse_qs
-import openai
-from typing import Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait
+import ffmpeg
+from .cache import LRUCache, DiskCache, TieredCache, make_cache_key
+from .text_service import parse_json_response
+from .llm_cache import CompletionCache, get_completion_cache
+from .digest import TranscriptDigester
+from .transcript_sources import TranscriptResolver, segments_to_entries
+from .youtube_service import YouTubeService
+from .audio_service import AudioProcessor
+from .render import RenderPipeline
+from .clipping import KeyframeClipper
+from .highlights import ClipCandidate, HighlightDetector
+from ..config import Config
+from ..models.schemas import TranscriptResult
+from ..models.transcript import Transcript
 
 class VideoProcessor:
     """Class for handling video processing operations"""
     
-    def __init__(self, api_key: str = None, download_path: str = "downloads"):
+    SOCIAL_MODEL = "gpt-4o"
+    SOCIAL_SYSTEM_PROMPT = "You are a social media expert focusing on YouTube content promotion."
+
+    # Platform-specific post requirements
+    PLATFORM_SPECS = {
+        "Twitter": {
+            "max_length": 280,
+            "style": "engaging and concise, with relevant hashtags",
+        },
+        "Instagram": {
+            "max_length": 2200,
+            "style": "visual and engaging, with emojis and hashtags",
+        },
+        "LinkedIn": {
+            "max_length": 3000,
+            "style": "professional and insightful, with industry-relevant points",
+        },
+        "Facebook": {
+            "max_length": 63206,
+            "style": "conversational and engaging, encouraging discussion",
+        }
+    }
+
+    # Transcript cache settings
+    TRANSCRIPT_CACHE_ENTRIES = 64
+    TRANSCRIPT_CACHE_TTL = 7 * 24 * 3600
+    TRANSCRIPT_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+    # Keyframe probes per source file
+    KEYFRAME_CACHE_ENTRIES = 64
+
+    def __init__(self, api_key: str = None, download_path: str = "downloads",
+                 completion_cache: Optional[CompletionCache] = None,
+                 youtube_service: Optional[YouTubeService] = None,
+                 audio_processor: Optional[AudioProcessor] = None,
+                 whisper_fallback: bool = True):
         """
         Initialize VideoProcessor
         
         Args:
             api_key (str): OpenAI API key for content generation
             download_path (str): Path for downloading videos
+            completion_cache (CompletionCache): Completion cache, defaults to the shared one
+            youtube_service (YouTubeService): Used to download audio for the Whisper fallback
+            audio_processor (AudioProcessor): Used to transcribe audio for the Whisper fallback
+            whisper_fallback (bool): Make local transcription available to callers that pass allow_whisper
         """
         if api_key:
+            import openai
+
             openai.api_key = api_key
         self.download_path = download_path
+        self.completion_cache = completion_cache or get_completion_cache()
+        self.digester = TranscriptDigester(self.completion_cache)
         self._ensure_directories()
+        self.transcript_cache = TieredCache(
+            LRUCache(max_entries=self.TRANSCRIPT_CACHE_ENTRIES, ttl=self.TRANSCRIPT_CACHE_TTL),
+            DiskCache(
+                os.path.join(self.download_path, "transcripts"),
+                ttl=self.TRANSCRIPT_CACHE_TTL,
+                max_bytes=self.TRANSCRIPT_CACHE_MAX_BYTES
+            )
+        )
+        self._youtube_service = youtube_service
+        self._audio_processor = audio_processor
+        self.highlight_detector = HighlightDetector(self.completion_cache)
+        self.clipper = KeyframeClipper(TieredCache(
+            LRUCache(max_entries=self.KEYFRAME_CACHE_ENTRIES),
+            DiskCache(os.path.join(self.download_path, "keyframes"), ttl=self.TRANSCRIPT_CACHE_TTL)
+        ))
+
+        stages = [("cache", self._cached_entries), ("captions", self._caption_entries)]
+        if whisper_fallback:
+            stages.append(("whisper", self._whisper_entries))
+        self.transcript_resolver = TranscriptResolver(stages, on_resolved=self._store_entries)
+
+    @property
+    def youtube_service(self) -> YouTubeService:
+        if self._youtube_service is None:
+            self._youtube_service = YouTubeService(api_key=None, download_path=self.download_path)
+        return self._youtube_service
+
+    @property
+    def audio_processor(self) -> AudioProcessor:
+        if self._audio_processor is None:
+            self._audio_processor = AudioProcessor()
+        return self._audio_processor
 
     def _ensure_directories(self):
         """Create necessary directories"""
@@ -38,88 +126,111 @@ class VideoProcessor:
             pass
         return None
 
-    def get_video_transcript(self, video_url: str) -> str:
-        """Get transcript from YouTube video"""
+    def _transcript_cache_key(self, video_id: str, language: str) -> str:
+        return make_cache_key("transcript", video_id, language)
+
+    def _cached_entries(self, video_id: str, language: str) -> Optional[List[Dict]]:
+        return self.transcript_cache.get(self._transcript_cache_key(video_id, language))
+
+    def _caption_entries(self, video_id: str, language: str) -> Optional[List[Dict]]:
+        from youtube_transcript_api import YouTubeTranscriptApi
+
+        return YouTubeTranscriptApi.get_transcript(video_id, languages=[language])
+
+    def _whisper_entries(self, video_id: str, language: str) -> Optional[List[Dict]]:
+        """Download the smallest audio-only stream and transcribe it locally"""
+        youtube = self.youtube_service
+        audio_path = None
+        try:
+            with youtube.pinned_audio(f"https://youtu.be/{video_id}") as audio_path:
+                segments = self.audio_processor.transcribe_long_audio(audio_path, language=language)
+        finally:
+            # Another fallback for the same video may still be reading the file
+            if audio_path and not youtube.cache_policy.is_pinned(audio_path):
+                youtube.remove_download(audio_path)
+        return segments_to_entries(segments)
+
+    def _store_entries(self, video_id: str, language: str, stage: str, entries: List[Dict]) -> None:
+        if stage != "cache":
+            self.transcript_cache.set(self._transcript_cache_key(video_id, language), entries)
+
+    def _fetch_transcript_entries(self, video_id: str, language: str,
+                                  allow_whisper: bool = False) -> Tuple[List[Dict], str, List[Dict]]:
+        """Resolve raw transcript entries through cache, captions and Whisper in turn"""
+        entries, source, metrics = self.transcript_resolver.resolve(
+            video_id, language, skip=() if allow_whisper else ("whisper",)
+        )
+        return entries, source, [vars(metric).copy() for metric in metrics]
+
+    def get_transcript_metrics(self) -> Dict:
+        """Return per-stage call counts, hits and cumulative seconds across all calls"""
+        return {
+            'totals': {stage: totals.copy() for stage, totals in self.transcript_resolver.stage_totals.items()},
+        }
+
+    def fetch_transcript(self, video_url: str, language: str = "en", allow_whisper: bool = False) -> TranscriptResult:
+        """
+        Get the transcript of a YouTube video as a structured result
+
+        Args:
+            video_url (str): YouTube video URL
+            language (str): Preferred transcript language
+            allow_whisper (bool): Fall back to downloading and transcribing the audio; off by
+                default because it loads Whisper and uses several CPU cores per video
+
+        Returns:
+            TranscriptResult: Timed transcript, the stage that produced it and per-stage metrics
+        """
         try:
             video_id = self._extract_video_id(video_url)
             if not video_id:
                 raise ValueError("Could not extract video ID from URL")
             
             # Get transcript
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-            
-            # Format transcript as continuous text
-            full_transcript = " ".join(entry['text'] for entry in transcript_list)
+            transcript_list, source, metrics = self._fetch_transcript_entries(video_id, language, allow_whisper)
             
-            # Add download button for transcript
-            st.download_button(
-                "Download Transcript",
-                full_transcript,
-                file_name=f"transcript_{video_id}.txt",
-                mime="text/plain"
+            return TranscriptResult(
+                video_id=video_id,
+                language=language,
+                source=source,
+                transcript=Transcript.from_entries(transcript_list),
+                metrics=metrics
             )
-            
-            return full_transcript
 
         except Exception as e:
             raise Exception(f"Transcript error: {str(e)}")
 
-    def generate_social_posts(self, video_url: str, transcript: str, target_platforms: List[str]) -> Dict:
-        """Generate social media posts based on video content"""
-        try:
-            if not openai.api_key:
-                raise ValueError("OpenAI API key not set. Please check your .env file.")
-            
-            video_id = self._extract_video_id(video_url)
-            video_link = f"https://youtu.be/{video_id}"
+    def get_video_transcript(self, video_url: str, language: str = "en", allow_whisper: bool = False) -> str:
+        """Get transcript from YouTube video as continuous text"""
+        return self.fetch_transcript(video_url, language, allow_whisper).text
 
-            # Prepare platform-specific prompts
-            platform_specs = {
-                "Twitter": {
-                    "max_length": 280,
-                    "style": "engaging and concise, with relevant hashtags",
-                },
-                "Instagram": {
-                    "max_length": 2200,
-                    "style": "visual and engaging, with emojis and hashtags",
-                },
-                "LinkedIn": {
-                    "max_length": 3000,
-                    "style": "professional and insightful, with industry-relevant points",
-                },
-                "Facebook": {
-                    "max_length": 63206,
-                    "style": "conversational and engaging, encouraging discussion",
-                }
-            }
-            
-            # Generate hashtags
-            hashtag_prompt = f"""Based on this YouTube video content, generate 5-7 relevant and trending hashtags:
-            Content Summary: {transcript[:500]}...
+    def _chat(self, prompt: str, timeout: Optional[float] = None, use_cache: bool = True,
+              parse: Optional[Callable[[str], Any]] = None):
+        """Send a single prompt to the social media model and return the reply, parsed when parse is given"""
+        content = self.completion_cache.create(
+            model=self.SOCIAL_MODEL,
+            messages=[
+                {"role": "system", "content": self.SOCIAL_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            use_cache=use_cache,
+            parse=parse,
+            request_timeout=timeout
+        )
+        return content if parse else content.strip()
+
+    def _build_hashtag_prompt(self, content_summary: str) -> str:
+        return f"""Based on this YouTube video content, generate 5-7 relevant and trending hashtags:
+            Content Summary: {content_summary}
             
             Format: Return only the hashtags, separated by spaces, without numbers or explanations.
             """
-            
-            hashtag_response = openai.ChatCompletion.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are a social media expert focusing on YouTube content promotion."},
-                    {"role": "user", "content": hashtag_prompt}
-                ],
-                temperature=0.7
-            )
-            
-            hashtags = hashtag_response.choices[0].message.content.strip()
-            posts = {}
-            
-            # Generate posts for each platform
-            for platform in target_platforms:
-                if platform not in platform_specs:
-                    continue
-                    
-                spec = platform_specs[platform]
-                prompt = f"""Create an engaging {platform} post promoting this YouTube video:
-                Content Summary: {transcript[:500]}...
+
+    def _build_platform_prompt(self, platform: str, content_summary: str, video_link: str, hashtags: str) -> str:
+        spec = self.PLATFORM_SPECS[platform]
+        return f"""Create an engaging {platform} post promoting this YouTube video:
+                Content Summary: {content_summary}
                 Video Link: {video_link}
                 
                 Requirements:
@@ -133,22 +244,279 @@ class VideoProcessor:
                 
                 Format: Return only the post content, ready to use.
                 """
-                
-                response = openai.ChatCompletion.create(
-                    model="gpt-4o",
-                    messages=[
-                        {"role": "system", "content": "You are a social media expert focusing on YouTube content promotion."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7
+
+    def _generate_posts_sequentially(self, content_summary: str, video_link: str, platforms: List[str],
+                                     timeout: Optional[float], use_cache: bool) -> Dict:
+        """Generate hashtags, then each platform post, one call at a time"""
+        hashtags = self._chat(self._build_hashtag_prompt(content_summary), timeout, use_cache)
+        posts = {}
+        for platform in platforms:
+            prompt = self._build_platform_prompt(platform, content_summary, video_link, hashtags)
+            posts[platform] = self._chat(prompt, timeout, use_cache)
+        return {'posts': posts, 'hashtags': hashtags}
+
+    def _generate_posts_concurrently(self, content_summary: str, video_link: str, platforms: List[str],
+                                     timeout: Optional[float], max_concurrency: int,
+                                     use_cache: bool) -> Dict:
+        """
+        Generate hashtags, then fan out the platform posts on a bounded pool
+
+        Platform calls are submitted the moment the hashtag call completes. The
+        whole generation shares one deadline of timeout seconds, and calls still
+        running when it passes are abandoned rather than waited for.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        executor = ThreadPoolExecutor(max_workers=max(1, max_concurrency))
+        try:
+            hashtag_future = executor.submit(
+                self._chat, self._build_hashtag_prompt(content_summary), remaining(), use_cache
+            )
+            if not wait([hashtag_future], timeout=remaining()).done:
+                raise TimeoutError("Hashtag generation timed out")
+            hashtags = hashtag_future.result()
+
+            futures = {
+                platform: executor.submit(
+                    self._chat,
+                    self._build_platform_prompt(platform, content_summary, video_link, hashtags),
+                    remaining(),
+                    use_cache
                 )
-                
-                posts[platform] = response.choices[0].message.content.strip()
-            
-            return {
-                'posts': posts,
-                'hashtags': hashtags
+                for platform in platforms
             }
 
+            _, not_done = wait(futures.values(), timeout=remaining())
+            if not_done:
+                late = [platform for platform, future in futures.items() if future in not_done]
+                raise TimeoutError(f"{', '.join(late)} post generation timed out")
+            posts = {platform: future.result() for platform, future in futures.items()}
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return {'posts': posts, 'hashtags': hashtags}
+
+    def _build_batch_prompt(self, content_summary: str, video_link: str, platforms: List[str]) -> str:
+        requirements = "\n".join(
+            f"                - {platform}: maximum {self.PLATFORM_SPECS[platform]['max_length']} characters, "
+            f"{self.PLATFORM_SPECS[platform]['style']}"
+            for platform in platforms
+        )
+        example_posts = ", ".join(f'"{platform}": "post text"' for platform in platforms)
+        return f"""Create engaging social media posts promoting this YouTube video. Return ONLY a JSON object with the following format:
+                {{
+                    "hashtags": "5-7 relevant and trending hashtags separated by spaces",
+                    "posts": {{{example_posts}}}
+                }}
+
+                Content Summary: {content_summary}
+                Video Link: {video_link}
+
+                Platform requirements:
+{requirements}
+
+                Every post must:
+                - Include a strong hook
+                - Include the video link
+                - Include a call to action to watch the video
+                - Use the generated hashtags appropriately
+                - For Instagram/Twitter, put the link at the end
+                """
+
+    def _is_valid_post(self, platform: str, post) -> bool:
+        return isinstance(post, str) and 0 < len(post.strip()) <= self.PLATFORM_SPECS[platform]['max_length']
+
+    def _generate_posts_batched(self, content_summary: str, video_link: str, platforms: List[str],
+                                timeout: Optional[float], use_cache: bool) -> Dict:
+        """
+        Generate hashtags and every platform post in one structured request
+
+        Platforms whose post comes back missing, not text or over its max_length
+        are retried individually with the single-platform prompt, and hashtags
+        that are not text are regenerated the same way. A reply that is not
+        valid JSON at all leaves every platform to its retry.
+        """
+        try:
+            result = self._chat(
+                self._build_batch_prompt(content_summary, video_link, platforms), timeout, use_cache,
+                parse=parse_json_response
+            )
+        except ValueError:
+            # An unparsable reply is not cached; every platform falls through to its own retry
+            result = {}
+
+        hashtags = result.get('hashtags') if isinstance(result, dict) else None
+        if isinstance(hashtags, list):
+            hashtags = " ".join(tag for tag in hashtags if isinstance(tag, str))
+        # Anything other than text is treated like a missing value and regenerated
+        hashtags = hashtags.strip() if isinstance(hashtags, str) else ""
+        if not hashtags:
+            hashtags = self._chat(self._build_hashtag_prompt(content_summary), timeout, use_cache)
+
+        batch_posts = result.get('posts') if isinstance(result, dict) else None
+        if not isinstance(batch_posts, dict):
+            batch_posts = {}
+
+        posts = {}
+        for platform in platforms:
+            post = batch_posts.get(platform)
+            if self._is_valid_post(platform, post):
+                posts[platform] = post.strip()
+            else:
+                prompt = self._build_platform_prompt(platform, content_summary, video_link, hashtags)
+                posts[platform] = self._chat(prompt, timeout, use_cache)
+
+        return {'posts': posts, 'hashtags': hashtags}
+
+    def generate_social_posts(self, video_url: str, transcript: str, target_platforms: List[str],
+                              mode: str = "sequential", max_concurrency: int = 4,
+                              timeout: Optional[float] = None, use_cache: bool = True) -> Dict:
+        """
+        Generate social media posts based on video content
+
+        Args:
+            video_url (str): YouTube video URL
+            transcript (str): Video transcript
+            target_platforms (List[str]): Platforms to generate posts for
+            mode (str): "sequential", "concurrent" or "batched"
+            max_concurrency (int): Maximum parallel platform calls in concurrent mode
+            timeout (float): Per-call timeout in seconds, None for no limit; in concurrent mode,
+                the deadline for the whole generation
+            use_cache (bool): Reuse cached completions for identical prompts
+
+        Returns:
+            Dict: {'posts': {platform: post}, 'hashtags': str}
+        """
+        import openai
+
+        try:
+            if not openai.api_key:
+                raise ValueError("OpenAI API key not set. Please check your .env file.")
+            
+            video_id = self._extract_video_id(video_url)
+            video_link = f"https://youtu.be/{video_id}"
+            platforms = [p for p in target_platforms if p in self.PLATFORM_SPECS]
+            content_summary = self.digester.digest(transcript, use_cache)
+
+            if mode == "sequential":
+                return self._generate_posts_sequentially(
+                    content_summary, video_link, platforms, timeout, use_cache
+                )
+            if mode == "concurrent":
+                return self._generate_posts_concurrently(
+                    content_summary, video_link, platforms, timeout, max_concurrency, use_cache
+                )
+            if mode == "batched":
+                return self._generate_posts_batched(
+                    content_summary, video_link, platforms, timeout, use_cache
+                )
+            raise ValueError(f"Unknown generation mode: {mode}")
+
+        except Exception as e:
+            raise Exception(f"Error generating social media content: {str(e)}")
+
+    def render(self, input_path: str, start_time: Optional[float] = None, end_time: Optional[float] = None,
+               clip_path: Optional[str] = None, shorts_path: Optional[str] = None,
+               audio_path: Optional[str] = None, stream_copy: bool = False) -> Dict[str, str]:
+        """
+        Produce a clip, a Shorts version and an audio track from one decode
+
+        Args:
+            input_path (str): Source video
+            start_time (float): Start in seconds
+            end_time (float): End in seconds
+            clip_path (str): Output for the clip, skipped when None
+            shorts_path (str): Output for the vertical version, skipped when None
+            audio_path (str): Output for the audio track, skipped when None
+            stream_copy (bool): Copy the clip's streams instead of re-encoding
+
+        Returns:
+            Dict[str, str]: Output path per kind
+        """
+        try:
+            pipeline = RenderPipeline(input_path, start_time, end_time)
+            if clip_path:
+                pipeline.add_clip(clip_path, stream_copy=stream_copy)
+            if shorts_path:
+                pipeline.add_shorts(shorts_path, **Config.SHORTS_DIMENSIONS)
+            if audio_path:
+                pipeline.add_audio(audio_path)
+            return pipeline.run()
+        except ffmpeg.Error as e:
+            raise Exception(f"Error rendering video: {str(e)}")
+
+    def clip_video(self, input_path: str, start_time: float, end_time: float, output_path: str,
+                   stream_copy: bool = False) -> str:
+        """
+        Cut start_time..end_time of a video into output_path
+
+        Whole GOPs inside the range are stream copied and only the partial GOPs at
+        the cuts are re-encoded. When the source cannot be probed the clip is
+        re-encoded in full.
+
+        Args:
+            input_path (str): Source video
+            start_time (float): Start in seconds
+            end_time (float): End in seconds
+            output_path (str): Output file
+            stream_copy (bool): Copy everything, snapping the start to the previous keyframe
+
+        Returns:
+            str: output_path
+        """
+        if not stream_copy:
+            try:
+                self.clipper.clip(input_path, start_time, end_time, output_path)
+                return output_path
+            except (OSError, ffmpeg.Error):
+                # No ffprobe or an unreadable container; fall through to a full re-encode
+                pass
+        self.render(input_path, start_time, end_time, clip_path=output_path, stream_copy=stream_copy)
+        return output_path
+
+    def format_for_shorts(self, input_path: str, output_path: str) -> str:
+        """Scale and center-crop a video to the Shorts dimensions"""
+        self.render(input_path, shorts_path=output_path)
+        return output_path
+
+    def detect_highlights(self, transcript: Transcript, top_k: int = 3, use_llm: bool = False,
+                          use_cache: bool = True) -> List[ClipCandidate]:
+        """
+        Pick the top_k non-overlapping clip candidates of a transcript
+
+        Args:
+            transcript (Transcript): Timed transcript, e.g. TranscriptResult.transcript
+            top_k (int): Number of clips
+            use_llm (bool): Re-rank candidates by LLM hook rating
+            use_cache (bool): Reuse cached completions
+
+        Returns:
+            List[ClipCandidate]: Clips in time order
+        """
+        try:
+            return self.highlight_detector.detect(transcript, top_k=top_k, use_llm=use_llm, use_cache=use_cache)
         except Exception as e:
-            raise Exception(f"Error generating social media content: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error detecting highlights: {str(e)}")
+
+    def render_highlights(self, input_path: str, clips: List[ClipCandidate], output_dir: str,
+                          vertical: bool = True) -> List[str]:
+        """
+        Render each clip candidate, as a Shorts video when vertical is set
+
+        Returns:
+            List[str]: Output paths in clip order
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        name = os.path.splitext(os.path.basename(input_path))[0]
+        outputs = []
+        for i, clip in enumerate(clips, 1):
+            output_path = os.path.join(output_dir, f"{name}_highlight_{i}.mp4")
+            if vertical:
+                self.render(input_path, clip.start, clip.end, shorts_path=output_path)
+            else:
+                self.clip_video(input_path, clip.start, clip.end, output_path)
+            outputs.append(output_path)
+        return outputs
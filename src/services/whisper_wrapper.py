@@ -1,16 +1,28 @@
 import os
-import whisper
-from typing import Optional, Union
+from typing import Dict, Iterator, Optional, Union
 from pathlib import Path
+from .model_registry import get_whisper_model, evict
+from .transcription import iter_transcription, load_audio_samples
 
 class SecureWhisperWrapper:
     """Secure wrapper for Whisper model with safe loading"""
     
-    def __init__(self):
+    def __init__(self, model_name: str = "base"):
         """
-        Initialize Whisper model with secure loading
+        Initialize wrapper around the shared Whisper model
+        
+        Args:
+            model_name (str): Whisper model name, loaded on first use
         """
-        self.model = whisper.load_model("base")
+        self.model_name = model_name
+        self._released = False
+
+    @property
+    def model(self):
+        """Shared Whisper model, None after cleanup"""
+        if self._released:
+            return None
+        return get_whisper_model(self.model_name)
         
     def transcribe(self, audio_path: str, **kwargs) -> dict:
         """
@@ -46,4 +58,51 @@ class SecureWhisperWrapper:
             return self.model.transcribe(audio_path, **secure_kwargs)
             
         except Exception as e:
-            raise Exception(f"Transcription error: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Transcription error: {str(e)}")
+
+    def stream_transcribe(self, audio_path: str, language: str = 'en', window_seconds: float = 30.0) -> Iterator[Dict]:
+        """
+        Transcribe audio file incrementally
+        
+        Args:
+            audio_path (str): Path to audio file
+            language (str): Spoken language, defaults to English
+            window_seconds (float): Window length decoded per step
+            
+        Yields:
+            Dict: Segment with start, end and text
+        """
+        try:
+            if not os.path.exists(audio_path):
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+                
+            if not os.path.getsize(audio_path) > 0:
+                raise ValueError("Audio file is empty")
+            
+            audio = load_audio_samples(audio_path)
+            yield from iter_transcription(
+                audio,
+                model_name=self.model_name,
+                language=language,
+                window_seconds=window_seconds
+            )
+            
+        except Exception as e:
+            raise Exception(f"Transcription error: {str(e)}")
+
+    def cleanup(self, evict_model: bool = False):
+        """
+        Cleanup resources
+        
+        Args:
+            evict_model (bool): Also evict the shared model for every user in this process
+        """
+        try:
+            # Drop this wrapper's reference to the model
+            self._released = True
+            
+            if evict_model:
+                evict(self.model_name)
+                
+        except Exception as e:
+            print(f"Cleanup warning: {str(e)}")
\ No newline at end of file
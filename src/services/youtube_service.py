@@ -1,23 +1,95 @@
-from typing import Dict, Optional, List
-import yt_dlp
-from googleapiclient.discovery import build
+from typing import Dict, Iterator, Optional, List
+from contextlib import ExitStack, contextmanager
+from urllib.parse import urlparse, parse_qs
 from googleapiclient.errors import HttpError
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import threading
 import re
 import os
+import copy
 import time
+from ..models.schemas import VideoMetadata
+from .rate_limit import QuotaRateLimiter
+from .media_manifest import MediaManifest
+from .media_cache import MediaCachePolicy
+from .cache import DiskCache, LRUCache, TieredCache
+
+# Download locks shared across service instances, e.g. separate Streamlit sessions
+_download_locks: Dict[str, threading.Lock] = {}
+_download_locks_guard = threading.Lock()
+
+def _build_client(api_key: str):
+    """Build a Data API client; googleapiclient.discovery is imported on first use"""
+    from googleapiclient.discovery import build
+    return build('youtube', 'v3', developerKey=api_key)
 
 class YouTubeService:
     """Service for interacting with YouTube API and downloading videos"""
     
-    def __init__(self, api_key: str, download_path: str = "downloads"):
-        """Initialize the YouTube service"""
+    # Data API limits
+    MAX_IDS_PER_REQUEST = 50
+    VIDEOS_LIST_COST = 1
+    LIST_PAGE_COST = 1
+    
+    # Parallel fragment downloads per video
+    CONCURRENT_FRAGMENTS = 4
+    
+    # yt-dlp info dicts; format URLs are signed for about six hours
+    INFO_CACHE_ENTRIES = 32
+    INFO_CACHE_TTL = 4 * 3600
+    INFO_CACHE_MAX_BYTES = 100 * 1024 * 1024
+    
+    def __init__(self, api_key: Optional[str], download_path: str = "downloads",
+                 rate_limiter: Optional[QuotaRateLimiter] = None,
+                 cache_policy: Optional[MediaCachePolicy] = None):
+        """
+        Initialize the YouTube service
+
+        The Data API client is built on first use, so downloads work without an API key.
+        A shared cache_policy pins in-flight downloads and enforces the media byte budget.
+        """
         try:
-            self.youtube = build('youtube', 'v3', developerKey=api_key)
+            self.api_key = api_key
+            self._youtube = None
+            self._local = threading.local()
+            self.rate_limiter = rate_limiter or QuotaRateLimiter(units_per_second=5.0)
             self.download_path = download_path
             os.makedirs(download_path, exist_ok=True)
+            if cache_policy is None:
+                cache_policy = MediaCachePolicy(MediaManifest(download_path))
+            self.cache_policy = cache_policy
+            self.manifest = cache_policy.manifest
+            self.info_cache = TieredCache(
+                LRUCache(max_entries=self.INFO_CACHE_ENTRIES, ttl=self.INFO_CACHE_TTL),
+                DiskCache(
+                    os.path.join(download_path, "info"),
+                    ttl=self.INFO_CACHE_TTL,
+                    max_bytes=self.INFO_CACHE_MAX_BYTES
+                )
+            )
         except Exception as e:
             raise Exception(f"Failed to initialize YouTube service: {str(e)}")
 
+    @property
+    def youtube(self):
+        """YouTube Data API client"""
+        if self._youtube is None:
+            if not self.api_key:
+                raise ValueError("YouTube API key not set. Please check your .env file.")
+            self._youtube = _build_client(self.api_key)
+        return self._youtube
+
+    def _thread_client(self):
+        """Data API client for the current thread, since the HTTP transport is not thread-safe"""
+        client = getattr(self._local, 'youtube', None)
+        if client is None:
+            if not self.api_key:
+                raise ValueError("YouTube API key not set. Please check your .env file.")
+            client = _build_client(self.api_key)
+            self._local.youtube = client
+        return client
+
     def extract_video_id(self, url: str) -> Optional[str]:
         """Extract video ID from various YouTube URL formats"""
         patterns = [
@@ -29,7 +101,7 @@ class YouTubeService:
         for pattern in patterns:
             match = re.search(pattern, url)
             if match:
-                video_id = match.group(1)
+                video_id = match.group(1) if match.groups() else match.group(0)
                 if len(video_id) == 11:
                     return video_id
         return None
@@ -58,8 +130,190 @@ class YouTubeService:
         except Exception as e:
             raise Exception(f"Error getting video info: {str(e)}")
 
+    @staticmethod
+    def _to_metadata(item: Dict) -> VideoMetadata:
+        """Convert a videos.list item to VideoMetadata"""
+        snippet = item.get('snippet', {})
+        statistics = item.get('statistics', {})
+
+        def optional_int(key):
+            return int(statistics[key]) if key in statistics else None
+
+        published_at = snippet.get('publishedAt')
+        return VideoMetadata(
+            video_id=item['id'],
+            title=snippet.get('title', ''),
+            description=snippet.get('description', ''),
+            channel_id=snippet.get('channelId', ''),
+            channel_title=snippet.get('channelTitle', ''),
+            published_at=datetime.fromisoformat(published_at.replace('Z', '+00:00')) if published_at else None,
+            tags=snippet.get('tags', []),
+            duration=item.get('contentDetails', {}).get('duration', ''),
+            view_count=int(statistics.get('viewCount', 0)),
+            like_count=optional_int('likeCount'),
+            comment_count=optional_int('commentCount')
+        )
+
+    def _fetch_batch(self, video_ids: List[str]) -> List[Dict]:
+        self.rate_limiter.acquire(self.VIDEOS_LIST_COST)
+        response = self._thread_client().videos().list(
+            part="snippet,contentDetails,statistics",
+            # maxResults is not supported with id; a batch is at most 50 IDs anyway
+            id=",".join(video_ids)
+        ).execute()
+        return response.get('items', [])
+
+    def get_videos_info_bulk(self, video_urls: List[str], max_workers: int = 4) -> List[Optional[VideoMetadata]]:
+        """
+        Get metadata for many videos in 50-ID videos.list batches
+
+        Args:
+            video_urls (List[str]): Video URLs or IDs, duplicates allowed
+            max_workers (int): Batches requested concurrently
+
+        Returns:
+            List[Optional[VideoMetadata]]: One entry per input, None where the
+            URL was invalid or the video was not found
+        """
+        try:
+            ids = [self.extract_video_id(url) for url in video_urls]
+            unique_ids = list(dict.fromkeys(video_id for video_id in ids if video_id))
+            batches = [
+                unique_ids[i:i + self.MAX_IDS_PER_REQUEST]
+                for i in range(0, len(unique_ids), self.MAX_IDS_PER_REQUEST)
+            ]
+
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                results = list(executor.map(self._fetch_batch, batches))
+
+            by_id = {
+                item['id']: self._to_metadata(item)
+                for items in results
+                for item in items
+            }
+            return [by_id.get(video_id) if video_id else None for video_id in ids]
+
+        except HttpError as e:
+            error_details = str(e) if hasattr(e, 'content') else "Unknown API error"
+            raise Exception(f"YouTube API error: {error_details}")
+        except Exception as e:
+            raise Exception(f"Error getting video info: {str(e)}")
+
+    def get_playlist_video_ids(self, playlist_id: str, limit: Optional[int] = None) -> List[str]:
+        """Get video IDs in a playlist, following pagination"""
+        try:
+            video_ids = []
+            page_token = None
+            while True:
+                self.rate_limiter.acquire(self.LIST_PAGE_COST)
+                response = self.youtube.playlistItems().list(
+                    part="contentDetails",
+                    playlistId=playlist_id,
+                    maxResults=self.MAX_IDS_PER_REQUEST,
+                    pageToken=page_token
+                ).execute()
+
+                for item in response.get('items', []):
+                    video_ids.append(item['contentDetails']['videoId'])
+                    if limit and len(video_ids) >= limit:
+                        return video_ids
+
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    return video_ids
+
+        except HttpError as e:
+            error_details = str(e) if hasattr(e, 'content') else "Unknown API error"
+            raise Exception(f"YouTube API error: {error_details}")
+        except Exception as e:
+            raise Exception(f"Error getting playlist videos: {str(e)}")
+
+    def get_channel_video_ids(self, channel_url: str, limit: Optional[int] = None) -> List[str]:
+        """Get video IDs uploaded by a channel given its /channel/, /user/ or /@handle URL"""
+        try:
+            path = urlparse(channel_url).path.strip('/').split('/')
+            if path[0] == 'channel' and len(path) > 1:
+                lookup = {'id': path[1]}
+            elif path[0] == 'user' and len(path) > 1:
+                lookup = {'forUsername': path[1]}
+            elif path[0].startswith('@'):
+                lookup = {'forHandle': path[0]}
+            else:
+                raise ValueError(f"Unsupported channel URL: {channel_url}")
+
+            self.rate_limiter.acquire(self.LIST_PAGE_COST)
+            response = self.youtube.channels().list(part="contentDetails", **lookup).execute()
+            if not response.get('items'):
+                raise ValueError(f"No channel found for: {channel_url}")
+
+            uploads = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+            return self.get_playlist_video_ids(uploads, limit=limit)
+
+        except HttpError as e:
+            error_details = str(e) if hasattr(e, 'content') else "Unknown API error"
+            raise Exception(f"YouTube API error: {error_details}")
+        except Exception as e:
+            raise Exception(f"Error getting channel videos: {str(e)}")
+
+    def expand_video_ids(self, url: str, limit: Optional[int] = None) -> List[str]:
+        """Expand a playlist, channel or single video URL into video IDs"""
+        playlist_id = parse_qs(urlparse(url).query).get('list', [None])[0]
+        if playlist_id:
+            return self.get_playlist_video_ids(playlist_id, limit=limit)
+
+        path = urlparse(url).path.strip('/')
+        if path.startswith(('channel/', 'user/', '@')):
+            return self.get_channel_video_ids(url, limit=limit)
+
+        video_id = self.extract_video_id(url)
+        if not video_id:
+            raise ValueError(f"Could not extract video, playlist or channel from URL: {url}")
+        return [video_id]
+
+    def get_video_formats_info(self, video_url: str, refresh: bool = False) -> Dict:
+        """
+        Return the yt-dlp info dict for a video, extracting it at most once per TTL
+
+        Args:
+            video_url (str): YouTube video URL or ID
+            refresh (bool): Ignore any cached info and extract again
+
+        Returns:
+            Dict: Sanitized info dict, safe to mutate
+        """
+        import yt_dlp
+
+        video_id = self.extract_video_id(video_url)
+        if not video_id:
+            raise ValueError("Could not extract video ID")
+
+        info = None if refresh else self.info_cache.get(video_id)
+        if info is None:
+            ydl_opts = {
+                'quiet': True,
+                'no_warnings': True
+            }
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                info = ydl.sanitize_info(ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False))
+            self.info_cache.set(video_id, info)
+        # yt-dlp mutates info dicts while processing them
+        return copy.deepcopy(info)
+
+    def _download_lock(self, video_id: str) -> threading.Lock:
+        """Per-video lock shared by every YouTubeService in the process"""
+        with _download_locks_guard:
+            return _download_locks.setdefault(video_id, threading.Lock())
+
     def download_video(self, video_url: str, resolution: str = "720p") -> str:
-        """Download YouTube video using yt-dlp"""
+        """
+        Download YouTube video using yt-dlp
+
+        Previously downloaded files are returned without touching the network.
+        Concurrent requests for the same video wait for a single download, and
+        interrupted downloads resume from their partial file.
+        """
+        import yt_dlp
+
         try:
             # Extract video ID for filename
             video_id = self.extract_video_id(video_url)
@@ -68,79 +322,158 @@ class YouTubeService:
 
             # Convert resolution to format height
             height = int(resolution.lower().replace('p', ''))
-            
-            # Create a temporary filename based on video ID
-            temp_filename = f"video_{video_id}.mp4"
-            output_template = os.path.join(self.download_path, temp_filename)
+            resolution = f"{height}p"
 
-            # Configure yt-dlp options
-            ydl_opts = {
-                'format': f'bestvideo[height<={height}][ext=mp4]+bestaudio[ext=m4a]/best[height<={height}][ext=mp4]/best[ext=mp4]',
-                'outtmpl': output_template,
-                'merge_output_format': 'mp4',
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': True,
-                'ignoreerrors': True
-            }
+            cached_path = self.manifest.lookup(video_id, resolution)
+            self.cache_policy.record_lookup(cached_path is not None)
+            if cached_path:
+                return cached_path
 
-            # Download the video
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([video_url])
+            output_template = os.path.join(self.download_path, f"video_{video_id}_{resolution}.mp4")
+            with self._download_lock(video_id), self.cache_policy.pin(output_template):
+                # Another session may have finished the download while we waited
+                cached_path = self.manifest.lookup(video_id, resolution)
+                if cached_path:
+                    return cached_path
+
+                # Deterministic filename per video and resolution
+                if os.path.exists(output_template):
+                    self.manifest.record(video_id, resolution, output_template)
+                    return output_template
 
-            # Verify file exists and return the path
-            if os.path.exists(output_template):
-                return output_template
+                # Configure yt-dlp options
+                ydl_opts = {
+                    'format': f'bestvideo[height<={height}][ext=mp4]+bestaudio[ext=m4a]/best[height<={height}][ext=mp4]/best[ext=mp4]',
+                    'outtmpl': output_template,
+                    'merge_output_format': 'mp4',
+                    'quiet': True,
+                    'no_warnings': True,
+                    # Download DASH/HLS fragments in parallel and resume .part files
+                    'concurrent_fragment_downloads': self.CONCURRENT_FRAGMENTS,
+                    'continuedl': True,
+                    'retries': 10,
+                    'fragment_retries': 10
+                }
 
-            # If the exact filename doesn't exist, look for any file with the video ID
-            files = os.listdir(self.download_path)
-            for file in files:
-                if video_id in file and file.endswith('.mp4'):
-                    old_path = os.path.join(self.download_path, file)
-                    new_path = output_template
-                    if old_path != new_path:
-                        os.rename(old_path, new_path)
-                    return new_path
+                # Download from the probed info dict, re-extracting once if its URLs went stale
+                info = self.get_video_formats_info(video_id)
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    try:
+                        info = ydl.process_ie_result(info, download=True)
+                    except yt_dlp.utils.DownloadError:
+                        info = ydl.process_ie_result(
+                            self.get_video_formats_info(video_id, refresh=True), download=True
+                        )
 
-            raise Exception("Could not locate downloaded video file")
+                # yt-dlp reports the final path, which can differ after merging
+                downloads = (info or {}).get('requested_downloads') or []
+                filepath = downloads[0].get('filepath') if downloads else None
+                if filepath and filepath != output_template and os.path.exists(filepath):
+                    os.replace(filepath, output_template)
+
+                if os.path.exists(output_template):
+                    self.manifest.record(video_id, resolution, output_template)
+                    return output_template
+
+                raise Exception("Could not locate downloaded video file")
 
         except Exception as e:
             raise Exception(f"Error downloading video: {str(e)}")
 
+    def _fetch_audio(self, video_id: str, video_url: str) -> str:
+        """Return the cached audio file or download it; the caller holds the video's download lock"""
+        import yt_dlp
+
+        cached_path = self.manifest.lookup(video_id, "audio")
+        self.cache_policy.record_lookup(cached_path is not None)
+        if cached_path:
+            return cached_path
+
+        output_template = os.path.join(self.download_path, f"audio_{video_id}.%(ext)s")
+        ydl_opts = {
+            # Prefer audio-only streams, smallest file first
+            'format': 'bestaudio/worst',
+            'format_sort': ['+size', '+br'],
+            'outtmpl': output_template,
+            'quiet': True,
+            'no_warnings': True
+        }
+
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(video_url, download=True)
+
+        downloads = info.get('requested_downloads') or [info]
+        filepath = downloads[0].get('filepath') or downloads[0].get('_filename')
+        if filepath and os.path.exists(filepath):
+            self.manifest.record(video_id, "audio", filepath)
+            return filepath
+
+        raise Exception("Could not locate downloaded audio file")
+
+    @contextmanager
+    def pinned_audio(self, video_url: str) -> Iterator[str]:
+        """
+        Download only the smallest audio-only format of a video and pin it for the block
+
+        The per-video download lock is held until the file is pinned, so
+        concurrent callers share one download and the evictor never sees the
+        file unpinned between download and use.
+        """
+        with ExitStack() as stack:
+            try:
+                video_id = self.extract_video_id(video_url)
+                if not video_id:
+                    raise ValueError("Could not extract video ID")
+                with self._download_lock(video_id):
+                    audio_path = self._fetch_audio(video_id, video_url)
+                    stack.enter_context(self.cache_policy.pin(audio_path))
+            except Exception as e:
+                raise Exception(f"Error downloading audio: {str(e)}")
+            yield audio_path
+
+    def download_audio(self, video_url: str) -> str:
+        """Download only the smallest audio-only format of a video using yt-dlp"""
+        with self.pinned_audio(video_url) as audio_path:
+            return audio_path
+
     def get_available_resolutions(self, video_url: str) -> List[str]:
         """Get list of available resolutions for a video"""
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': True
-            }
-
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=False)
-                formats = info.get('formats', [])
-                
-                resolutions = set()
-                for f in formats:
-                    height = f.get('height')
-                    if height and f.get('ext') == 'mp4':
-                        resolutions.add(f"{height}p")
-                
-                return sorted(list(resolutions), 
-                            key=lambda x: int(x.replace('p', '')))
+            info = self.get_video_formats_info(video_url)
+            formats = info.get('formats', [])
+            
+            resolutions = set()
+            for f in formats:
+                height = f.get('height')
+                if height and f.get('ext') == 'mp4':
+                    resolutions.add(f"{height}p")
+            
+            return sorted(list(resolutions), 
+                        key=lambda x: int(x.replace('p', '')))
                             
         except Exception as e:
             raise Exception(f"Error getting available resolutions: {str(e)}")
 
+    def remove_download(self, path: str) -> None:
+        """Delete a downloaded file and its manifest entry"""
+        if os.path.exists(path):
+            os.remove(path)
+        self.manifest.remove(path)
+
     def cleanup_old_files(self, max_age_hours: int = 24):
-        """Clean up old downloaded files"""
+        """Clean up old downloaded files, skipping files in use"""
         try:
-            current_time = time.time()
-            for filename in os.listdir(self.download_path):
-                filepath = os.path.join(self.download_path, filename)
-                if os.path.isfile(filepath):
-                    file_age = current_time - os.path.getctime(filepath)
-                    if file_age > (max_age_hours * 3600):
-                        os.remove(filepath)
+            cutoff = time.time() - max_age_hours * 3600
+            for entry in self.manifest.created_before(cutoff):
+                if not self.cache_policy.is_pinned(entry.path):
+                    self.remove_download(entry.path)
         except Exception as e:
-            print(f"Error cleaning up files: {str(e)}")
\ No newline at end of file
+            print(f"Error cleaning up files: {str(e)}")
+
+    def enforce_cache_budget(self) -> int:
+        """Evict least recently used media until the cache fits its byte budget"""
+        return self.cache_policy.evict()
+
+    def repair_manifest(self) -> Dict[str, int]:
+        """Reconcile the download manifest with the files on disk"""
+        return self.manifest.repair()
\ No newline at end of file
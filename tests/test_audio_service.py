@@ -2,6 +2,7 @@ import pytest
 from src.services.audio_service import AudioProcessor
 from unittest.mock import Mock, patch
 import ffmpeg
+import numpy as np
 
 def test_extract_audio():
     with patch('ffmpeg.input') as mock_input:
@@ -23,3 +24,36 @@ def test_extract_audio_error():
             processor.extract_audio('test.mp4', 'test.mp3')
         
         assert 'Error extracting audio' in str(exc_info.value)
+
+def test_load_audio_samples_reads_pipe():
+    samples = np.array([0.0, 0.5, -0.5], dtype=np.float32)
+    process = Mock()
+    process.stdout.read.side_effect = [samples.tobytes(), b'']
+    process.stderr.read.return_value = b''
+    process.wait.return_value = 0
+
+    with patch('ffmpeg.input') as mock_input:
+        mock_input.return_value.output.return_value.global_args.return_value.run_async.return_value = process
+        processor = AudioProcessor()
+        result = processor.load_audio_samples('test.mp4')
+
+        assert result.dtype == np.float32
+        assert list(result) == [0.0, 0.5, -0.5]
+        mock_input.assert_called_once_with('test.mp4')
+
+def test_load_audio_samples_drains_large_stderr():
+    import subprocess
+    import sys
+    # Writes far more than a pipe buffer of errors before any samples, then fails
+    script = (
+        "import sys; sys.stderr.write('decode error\\n' * 50000); sys.stderr.flush(); "
+        "sys.stdout.buffer.write(b'\\x00' * 16); sys.exit(1)"
+    )
+    process = subprocess.Popen([sys.executable, '-c', script], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    with patch('ffmpeg.input') as mock_input:
+        mock_input.return_value.output.return_value.global_args.return_value.run_async.return_value = process
+        with pytest.raises(Exception, match="decode error"):
+            AudioProcessor().load_audio_samples('corrupt.mp4')
+
+    assert process.poll() == 1
@@ -0,0 +1,96 @@
+import pytest
+import time
+import threading
+import json
+from src.services.batch_service import BatchProcessor, BatchCheckpoint
+from unittest.mock import Mock
+
+VIDEO_IDS = ['aaaaaaaaaaa', 'bbbbbbbbbbb', 'ccccccccccc']
+
+def _processor(tmp_path, video_processor):
+    youtube_service = Mock()
+    youtube_service.expand_video_ids.return_value = VIDEO_IDS
+    return BatchProcessor(video_processor, youtube_service, output_dir=str(tmp_path), platforms=['Twitter'])
+
+def _video_processor():
+    video_processor = Mock()
+    video_processor.get_video_transcript.side_effect = lambda url, allow_whisper: f"transcript of {url}"
+    video_processor.generate_social_posts.return_value = {'posts': {'Twitter': 'post'}, 'hashtags': '#tag'}
+    return video_processor
+
+def test_batch_exports_every_video(tmp_path):
+    result = _processor(tmp_path, _video_processor()).run('https://www.youtube.com/playlist?list=PL123')
+
+    assert sorted(result.completed) == VIDEO_IDS
+    with open(tmp_path / 'aaaaaaaaaaa.json', encoding='utf-8') as f:
+        export = json.load(f)
+    assert export['posts'] == {'Twitter': 'post'}
+    assert export['transcript'] == 'transcript of https://youtu.be/aaaaaaaaaaa'
+
+def test_batch_resumes_from_checkpoint(tmp_path):
+    def get_video_transcript(url, allow_whisper):
+        if 'bbbbbbbbbbb' in url:
+            raise Exception('no captions')
+        return 'transcript'
+
+    video_processor = _video_processor()
+    video_processor.get_video_transcript.side_effect = get_video_transcript
+    first = _processor(tmp_path, video_processor).run('https://www.youtube.com/playlist?list=PL123')
+    assert list(first.failed) == ['bbbbbbbbbbb']
+
+    checkpoint = BatchCheckpoint(str(tmp_path / 'checkpoint.json'))
+    assert sorted(checkpoint.completed) == ['aaaaaaaaaaa', 'ccccccccccc']
+
+    retry_processor = _video_processor()
+    second = _processor(tmp_path, retry_processor).run('https://www.youtube.com/playlist?list=PL123')
+    assert sorted(second.skipped) == ['aaaaaaaaaaa', 'ccccccccccc']
+    assert second.completed == ['bbbbbbbbbbb']
+    assert retry_processor.get_video_transcript.call_count == 1
+
+def test_batch_bounds_videos_in_flight(tmp_path):
+    lock = threading.Lock()
+    in_flight = set()
+    peak = [0]
+
+    def get_video_transcript(url, allow_whisper):
+        with lock:
+            in_flight.add(url)
+            peak[0] = max(peak[0], len(in_flight))
+        return url
+
+    def generate_social_posts(url, transcript, platforms, mode):
+        time.sleep(0.01)
+        return {'posts': {'Twitter': 'post'}, 'hashtags': '#tag'}
+
+    def export(video_id, transcript, generated):
+        with lock:
+            in_flight.discard(transcript)
+        return str(tmp_path / f"{video_id}.json")
+
+    video_ids = [f"video{i:06d}" for i in range(20)]
+    video_processor = Mock()
+    video_processor.get_video_transcript.side_effect = get_video_transcript
+    video_processor.generate_social_posts.side_effect = generate_social_posts
+    youtube_service = Mock()
+    youtube_service.expand_video_ids.return_value = video_ids
+    processor = BatchProcessor(video_processor, youtube_service, output_dir=str(tmp_path),
+                               transcript_workers=4, generation_workers=1, max_in_flight=3)
+    processor._export = export
+
+    result = processor.run('https://www.youtube.com/playlist?list=PL123')
+
+    assert sorted(result.completed) == video_ids
+    assert peak[0] <= 3
+
+def test_batch_whisper_fallback_is_opt_in(tmp_path):
+    video_processor = _video_processor()
+    _processor(tmp_path, video_processor).run('https://www.youtube.com/playlist?list=PL123')
+    assert all(call.kwargs['allow_whisper'] is False for call in video_processor.get_video_transcript.call_args_list)
+
+    youtube_service = Mock()
+    youtube_service.expand_video_ids.return_value = VIDEO_IDS
+    opted_in = _video_processor()
+    BatchProcessor(opted_in, youtube_service, output_dir=str(tmp_path / 'whisper'), allow_whisper=True).run(
+        'https://www.youtube.com/playlist?list=PL123'
+    )
+    assert all(call.kwargs['allow_whisper'] is True for call in opted_in.get_video_transcript.call_args_list)
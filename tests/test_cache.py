@@ -0,0 +1,44 @@
+import pytest
+import time
+from src.services.cache import LRUCache, DiskCache, TieredCache, make_cache_key
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.stats.evictions == 1
+
+def test_lru_ttl_expiry():
+    cache = LRUCache(max_entries=2, ttl=0.01)
+    cache.set('a', 1)
+    time.sleep(0.02)
+
+    assert cache.get('a') is None
+    assert cache.stats.misses == 1
+
+def test_disk_cache_size_budget(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=150)
+    cache.set('old', 'x' * 50)
+    time.sleep(0.01)
+    cache.set('new', 'y' * 50)
+
+    assert cache.get('old') is None
+    assert cache.get('new') == 'y' * 50
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    disk = DiskCache(str(tmp_path))
+    key = make_cache_key('transcript', 'dQw4w9WgXcQ', 'en')
+    disk.set(key, [{'text': 'hello', 'start': 0.0, 'duration': 1.0}])
+
+    cache = TieredCache(LRUCache(), disk)
+    assert cache.get(key)[0]['text'] == 'hello'
+    assert len(cache.memory) == 1
+
+    stats = cache.get_stats()
+    assert stats['hits'] == 1
+    assert stats['disk']['hits'] == 1
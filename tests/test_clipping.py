@@ -0,0 +1,112 @@
+import shutil
+import pytest
+import ffmpeg
+from unittest.mock import patch
+from src.services.clipping import KeyframeClipper, plan_clip
+
+KEYFRAMES = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+
+PROBE = {
+    'keyframes': KEYFRAMES,
+    'video': {
+        'codec_name': 'h264', 'pix_fmt': 'yuv420p', 'profile': 'High', 'level': 40, 'width': 1280,
+        'height': 720, 'r_frame_rate': '30000/1001', 'time_base': '1/30000', 'sample_aspect_ratio': '1:1'
+    },
+    'audio': {'codec_name': 'aac', 'sample_rate': '44100', 'channels': 2},
+}
+
+def test_plan_copies_interior_and_encodes_edges():
+    assert plan_clip(KEYFRAMES, 1.5, 7.0) == [('encode', 1.5, 2.0), ('copy', 2.0, 6.0), ('encode', 6.0, 7.0)]
+
+def test_plan_aligned_range_is_pure_copy():
+    assert plan_clip(KEYFRAMES, 2.0, 6.01) == [('copy', 2.0, 6.01)]
+
+def test_plan_within_one_gop_encodes_everything():
+    assert plan_clip(KEYFRAMES, 4.5, 5.5) == [('encode', 4.5, 5.5)]
+    assert plan_clip([], 1.0, 3.0) == [('encode', 1.0, 3.0)]
+
+def test_clip_concatenates_pieces_and_caches_probe(tmp_path):
+    source = tmp_path / 'source.mp4'
+    source.write_bytes(b'video')
+    output = tmp_path / 'clip.mp4'
+
+    with patch('src.services.clipping.probe_keyframes', return_value=PROBE) as mock_probe:
+        with patch('ffmpeg.run') as mock_run:
+            clipper = KeyframeClipper()
+            pieces = clipper.clip(str(source), 1.5, 7.0, str(output))
+            clipper.clip(str(source), 2.0, 6.0, str(output))
+
+    assert [kind for kind, _, _ in pieces] == ['encode', 'copy', 'encode']
+    assert mock_probe.call_count == 1
+
+    commands = [ffmpeg.compile(call.args[0]) for call in mock_run.call_args_list]
+    head, interior, tail, concat, aligned = commands
+    assert head[:3] == ['ffmpeg', '-ss', '1.5'] and 'libx264' in head and 'yuv420p' in head
+    assert head[-1].endswith('.ts')
+    assert interior[:3] == ['ffmpeg', '-ss', '2.0'] and interior[interior.index('-c') + 1] == 'copy'
+    assert interior[interior.index('-bsf:v') + 1] == 'h264_mp4toannexb'
+    assert 'concat' in concat and concat[-1] == str(output)
+    assert concat[concat.index('-video_track_timescale') + 1] == '30000'
+    assert concat[concat.index('-bsf:a') + 1] == 'aac_adtstoasc'
+    assert aligned[aligned.index('-c') + 1] == 'copy'
+    assert not any(path.name.startswith('clip_') for path in tmp_path.iterdir())
+
+def test_unmatched_codec_is_reencoded_whole(tmp_path):
+    source = tmp_path / 'source.webm'
+    source.write_bytes(b'video')
+    probe = {**PROBE, 'video': {**PROBE['video'], 'codec_name': 'vp9'}}
+
+    with patch('src.services.clipping.probe_keyframes', return_value=probe):
+        with patch('ffmpeg.run') as mock_run:
+            pieces = KeyframeClipper().clip(str(source), 1.5, 7.0, str(tmp_path / 'clip.mp4'))
+
+    assert pieces == [('encode', 1.5, 7.0)]
+    assert mock_run.call_count == 1
+
+def test_edges_match_source_stream_parameters():
+    args = KeyframeClipper()._encoder_args(PROBE)
+
+    assert args['profile:v'] == 'high' and args['level:v'] == '4.0'
+    assert args['r'] == '30000/1001' and args['pix_fmt'] == 'yuv420p'
+    assert args['vf'] == 'setsar=1/1'
+    assert (args['acodec'], args['ar'], args['ac']) == ('aac', '44100', 2)
+
+@pytest.mark.parametrize('video', [
+    {'codec_name': 'hevc'},
+    {'level': -99},
+    {'profile': 'High 4:4:4 Intra'},
+    {'r_frame_rate': '0/0'},
+])
+def test_unmatchable_parameters_fall_back_to_full_reencode(tmp_path, video):
+    source = tmp_path / 'source.mp4'
+    source.write_bytes(b'video')
+    probe = {**PROBE, 'video': {**PROBE['video'], **video}}
+
+    with patch('src.services.clipping.probe_keyframes', return_value=probe):
+        with patch('ffmpeg.run') as mock_run:
+            pieces = KeyframeClipper().clip(str(source), 1.5, 7.0, str(tmp_path / 'clip.mp4'))
+
+    assert pieces == [('encode', 1.5, 7.0)]
+    assert mock_run.call_count == 1
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None or shutil.which('ffprobe') is None,
+                    reason="ffmpeg is not installed")
+def test_clip_of_real_video_decodes_cleanly(tmp_path):
+    source = str(tmp_path / 'source.mp4')
+    video = ffmpeg.input('testsrc=size=320x240:rate=30', f='lavfi', t=6)
+    audio = ffmpeg.input('sine=frequency=440', f='lavfi', t=6)
+    ffmpeg.run(ffmpeg.output(
+        video, audio, source, vcodec='libx264', g=30, pix_fmt='yuv420p',
+        acodec='aac', **{'profile:v': 'main'}
+    ), overwrite_output=True, quiet=True)
+
+    output = str(tmp_path / 'clip.mp4')
+    pieces = KeyframeClipper().clip(source, 0.5, 4.5, output)
+
+    assert [kind for kind, _, _ in pieces] == ['encode', 'copy', 'encode']
+    _, errors = ffmpeg.run(
+        ffmpeg.output(ffmpeg.input(output), '-', f='null'), capture_stderr=True, cmd=['ffmpeg', '-v', 'error']
+    )
+    assert errors == b''
+    duration = float(ffmpeg.probe(output)['format']['duration'])
+    assert duration == pytest.approx(4.0, abs=0.15)
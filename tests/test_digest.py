@@ -0,0 +1,48 @@
+import pytest
+from src.services.digest import TranscriptDigester, chunk_text, estimate_tokens
+from src.services.llm_cache import CompletionCache
+from src.services.cache import LRUCache
+from unittest.mock import Mock, patch
+
+def test_chunk_text_respects_budget():
+    text = " ".join(f"word{i}." if i % 10 == 9 else f"word{i}" for i in range(1000))
+    chunks = chunk_text(text, max_tokens=100)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+    assert all(chunk.endswith('.') for chunk in chunks[:-1])
+
+def test_short_transcript_is_not_summarized():
+    with patch('openai.ChatCompletion.create') as mock_create:
+        digester = TranscriptDigester(CompletionCache(), digest_cache=LRUCache())
+
+        assert digester.digest('short transcript') == 'short transcript'
+        mock_create.assert_not_called()
+
+def test_long_transcript_digest_is_cached():
+    with patch('openai.ChatCompletion.create') as mock_create:
+        mock_create.return_value = Mock(choices=[Mock(message=Mock(content='partial summary'))])
+        digester = TranscriptDigester(
+            CompletionCache(), chunk_tokens=100, digest_tokens=50, digest_cache=LRUCache()
+        )
+        transcript = "some spoken words " * 200
+
+        first = digester.digest(transcript)
+        calls = mock_create.call_count
+        second = digester.digest(transcript)
+
+        assert first == second
+        assert estimate_tokens(first) <= 50
+        assert mock_create.call_count == calls
+
+def test_final_pass_is_capped_at_digest_budget():
+    with patch('openai.ChatCompletion.create') as mock_create:
+        mock_create.return_value = Mock(choices=[Mock(message=Mock(content='summary'))])
+        digest_cache = LRUCache()
+        digester = TranscriptDigester(CompletionCache(), chunk_tokens=1000, digest_tokens=100, digest_cache=digest_cache)
+
+        digester.digest("some spoken words " * 100, use_cache=False)
+
+        assert mock_create.call_args.kwargs['max_tokens'] == 100
+        assert len(digest_cache) == 0
@@ -0,0 +1,76 @@
+import pytest
+import json
+import numpy as np
+from unittest.mock import Mock, patch
+from src.models.transcript import Transcript
+from src.services.highlights import HighlightDetector
+from src.services.llm_cache import CompletionCache
+
+def make_transcript():
+    # Filler for 300 s, with a dense keyword-rich burst at 120-150 s
+    entries = []
+    for i in range(60):
+        start = i * 5.0
+        if 120 <= start < 150:
+            text = "caching makes the database faster caching wins"
+        else:
+            text = "so um we will see"
+        entries.append({'text': text, 'start': start, 'duration': 5.0})
+    return Transcript.from_entries(entries)
+
+def test_keyword_dense_window_scores_highest():
+    detector = HighlightDetector(window_seconds=30, step_seconds=5)
+    clips = detector.detect(make_transcript(), top_k=1)
+
+    assert len(clips) == 1
+    assert clips[0].start == 120.0 and clips[0].end == 150.0
+    assert 'caching' in clips[0].text
+
+def test_clips_do_not_overlap():
+    detector = HighlightDetector(window_seconds=30, step_seconds=5)
+    clips = detector.detect(make_transcript(), top_k=4)
+
+    assert len(clips) == 4
+    for previous, current in zip(clips, clips[1:]):
+        assert previous.end <= current.start
+
+def test_select_non_overlapping():
+    starts = np.array([0.0, 10.0, 20.0, 5.0])
+    ends = np.array([15.0, 25.0, 35.0, 12.0])
+    scores = np.array([3.0, 2.0, 1.0, 0.5])
+
+    assert HighlightDetector.select_non_overlapping(starts, ends, scores, 3) == [0, 2]
+
+def test_llm_hook_ranking_reorders_candidates():
+    with patch('openai.ChatCompletion.create') as mock_create:
+        # Strongly prefer the last excerpt
+        def respond(**params):
+            count = params['messages'][1]['content'].count('\n\n[') + 1
+            ratings = {str(i + 1): 0 for i in range(count)}
+            ratings[str(count)] = 10
+            return Mock(choices=[Mock(message=Mock(content=json.dumps(ratings)))])
+        mock_create.side_effect = respond
+
+        detector = HighlightDetector(CompletionCache(), window_seconds=30, step_seconds=5, hook_weight=10.0)
+        heuristic = detector.detect(make_transcript(), top_k=1)
+        ranked = detector.detect(make_transcript(), top_k=1, use_llm=True)
+
+    assert mock_create.call_count == 1
+    assert ranked[0].start != heuristic[0].start
+
+@pytest.mark.parametrize('reply', ['[7, 3]', '5'])
+def test_non_object_ratings_fall_back_to_heuristic_ranking(reply):
+    with patch('openai.ChatCompletion.create') as mock_create:
+        mock_create.return_value = Mock(choices=[Mock(message=Mock(content=reply))])
+        cache = CompletionCache()
+        detector = HighlightDetector(cache, window_seconds=30, step_seconds=5)
+        heuristic = detector.detect(make_transcript(), top_k=1)
+        ranked = detector.detect(make_transcript(), top_k=1, use_llm=True)
+        detector.detect(make_transcript(), top_k=1, use_llm=True)
+
+    assert ranked == heuristic
+    # The rejected reply was not cached, so the second ranking asked again
+    assert mock_create.call_count == 2
+
+def test_empty_transcript():
+    assert HighlightDetector().detect(Transcript.from_entries([]), top_k=3) == []
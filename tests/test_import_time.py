@@ -0,0 +1,46 @@
+import pytest
+import os
+import sys
+import json
+import subprocess
+
+# Cold-start budget for `import src.services`, in seconds
+IMPORT_BUDGET = float(os.getenv('IMPORT_BUDGET_SECONDS', '0.5'))
+
+HEAVY_MODULES = ['openai', 'yt_dlp', 'whisper', 'torch', 'streamlit', 'googleapiclient.discovery', 'googletrans']
+
+def run_isolated(code):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=root
+    ).stdout
+    return json.loads(output)
+
+def test_services_import_within_budget():
+    result = run_isolated(
+        "import sys, time, json\n"
+        "start = time.perf_counter()\n"
+        "import src.services\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))"
+    )
+
+    assert result['loaded'] == []
+    assert result['elapsed'] < IMPORT_BUDGET
+
+def test_services_exports_resolve_lazily():
+    result = run_isolated(
+        "import sys, json\n"
+        "import src.services as services\n"
+        "before = 'src.services.rate_limit' in sys.modules or 'src.services.youtube_service' in sys.modules\n"
+        "cls = services.YouTubeService\n"
+        "print(json.dumps({'before': before, 'name': cls.__name__, 'all': 'VideoProcessor' in dir(services)}))"
+    )
+
+    assert result == {'before': False, 'name': 'YouTubeService', 'all': True}
+
+def test_unknown_export_raises_attribute_error():
+    import src.services
+
+    with pytest.raises(AttributeError):
+        src.services.DoesNotExist
@@ -0,0 +1,62 @@
+import json
+import pytest
+from src.services.llm_cache import CompletionCache, SQLiteCacheBackend
+from unittest.mock import Mock, patch
+
+MESSAGES = [{"role": "user", "content": "Summarize this"}]
+
+def _response(content):
+    return Mock(choices=[Mock(message=Mock(content=content))])
+
+def test_completion_cache_hits_on_identical_request():
+    with patch('openai.ChatCompletion.create') as mock_create:
+        mock_create.return_value = _response('summary')
+        cache = CompletionCache()
+
+        first = cache.create(model='gpt-3.5-turbo', messages=MESSAGES, temperature=0.7)
+        second = cache.create(model='gpt-3.5-turbo', messages=MESSAGES, temperature=0.7)
+
+        assert first == second == 'summary'
+        assert mock_create.call_count == 1
+        assert cache.get_stats()['hit_rate'] == 0.5
+
+def test_completion_cache_key_includes_temperature():
+    with patch('openai.ChatCompletion.create') as mock_create:
+        mock_create.return_value = _response('summary')
+        cache = CompletionCache()
+
+        cache.create(model='gpt-3.5-turbo', messages=MESSAGES, temperature=0.7)
+        cache.create(model='gpt-3.5-turbo', messages=MESSAGES, temperature=0.3)
+
+        assert mock_create.call_count == 2
+
+def test_completion_cache_opt_out():
+    with patch('openai.ChatCompletion.create') as mock_create:
+        mock_create.return_value = _response('summary')
+        cache = CompletionCache()
+
+        cache.create(model='gpt-3.5-turbo', messages=MESSAGES, use_cache=False)
+        cache.create(model='gpt-3.5-turbo', messages=MESSAGES, use_cache=False)
+
+        assert mock_create.call_count == 2
+        assert cache.get_stats()['misses'] == 0
+
+def test_sqlite_backend_persists(tmp_path):
+    db_path = str(tmp_path / 'completions.db')
+    SQLiteCacheBackend(db_path).set('key', 'value')
+
+    assert SQLiteCacheBackend(db_path).get('key') == 'value'
+    assert SQLiteCacheBackend(db_path, ttl=-1).get('key') is None
+
+def test_completion_cache_skips_replies_that_fail_to_parse():
+    with patch('openai.ChatCompletion.create') as mock_create:
+        mock_create.side_effect = [_response('not json'), _response('{"ok": true}'), _response('unused')]
+        cache = CompletionCache()
+
+        with pytest.raises(Exception):
+            cache.create(model='gpt-3.5-turbo', messages=MESSAGES, parse=json.loads)
+        first = cache.create(model='gpt-3.5-turbo', messages=MESSAGES, parse=json.loads)
+        second = cache.create(model='gpt-3.5-turbo', messages=MESSAGES, parse=json.loads)
+
+        assert first == second == {'ok': True}
+        assert mock_create.call_count == 2
@@ -0,0 +1,69 @@
+import pytest
+import os
+import time
+from src.services.media_manifest import MediaManifest
+from src.services.media_cache import MediaCachePolicy
+
+def record(manifest, tmp_path, video_id, size, last_access):
+    path = tmp_path / f'video_{video_id}_720p.mp4'
+    path.write_bytes(b'x' * size)
+    manifest.record(video_id, '720p', str(path))
+    manifest._conn.execute("UPDATE media SET last_access = ? WHERE path = ?", (last_access, str(path)))
+    manifest._conn.commit()
+    return str(path)
+
+def test_evict_removes_least_recently_used_until_under_budget(tmp_path):
+    manifest = MediaManifest(str(tmp_path))
+    now = time.time()
+    oldest = record(manifest, tmp_path, 'aaaaaaaaaaa', 40, now - 300)
+    middle = record(manifest, tmp_path, 'bbbbbbbbbbb', 40, now - 200)
+    newest = record(manifest, tmp_path, 'ccccccccccc', 40, now - 100)
+    policy = MediaCachePolicy(manifest, max_bytes=100, max_age_hours=None)
+
+    assert policy.evict() == 40
+    assert not os.path.exists(oldest)
+    assert os.path.exists(middle) and os.path.exists(newest)
+    assert manifest.total_bytes() == 80
+    assert policy.get_stats()['files_evicted'] == 1
+
+def test_evict_skips_pinned_files_and_expires_old_ones(tmp_path):
+    manifest = MediaManifest(str(tmp_path))
+    now = time.time()
+    stale = record(manifest, tmp_path, 'aaaaaaaaaaa', 10, now - 3 * 3600)
+    in_use = record(manifest, tmp_path, 'bbbbbbbbbbb', 10, now - 4 * 3600)
+    policy = MediaCachePolicy(manifest, max_bytes=1000, max_age_hours=1)
+
+    with policy.pin(in_use):
+        policy.evict()
+
+    assert not os.path.exists(stale)
+    assert os.path.exists(in_use)
+    assert policy.bytes_reclaimed == 10
+
+def test_evict_counts_temp_files_against_budget(tmp_path):
+    downloads = tmp_path / 'downloads'
+    temp = tmp_path / 'temp'
+    temp.mkdir()
+    manifest = MediaManifest(str(downloads))
+    kept = record(manifest, downloads, 'aaaaaaaaaaa', 50, time.time())
+    old_temp = temp / 'upload.mp3'
+    old_temp.write_bytes(b'x' * 60)
+    os.utime(old_temp, (time.time() - 600, time.time() - 600))
+    policy = MediaCachePolicy(manifest, temp_path=str(temp), max_bytes=100, max_age_hours=None)
+
+    assert policy.evict() == 60
+    assert not old_temp.exists()
+    assert os.path.exists(kept)
+
+def test_hit_rate_and_background_thread(tmp_path):
+    policy = MediaCachePolicy(MediaManifest(str(tmp_path)), interval_seconds=0.01)
+    policy.record_lookup(True)
+    policy.record_lookup(False)
+    policy.start()
+    policy.start()
+    time.sleep(0.1)
+    policy.stop()
+
+    stats = policy.get_stats()
+    assert stats['hit_rate'] == 0.5
+    assert stats['runs'] >= 1
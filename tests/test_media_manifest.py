@@ -0,0 +1,39 @@
+import pytest
+import os
+from src.services.media_manifest import MediaManifest
+
+def test_lookup_returns_recorded_file(tmp_path):
+    manifest = MediaManifest(str(tmp_path))
+    path = tmp_path / 'video_dQw4w9WgXcQ_720p.mp4'
+    path.write_bytes(b'x' * 10)
+    manifest.record('dQw4w9WgXcQ', '720p', str(path))
+
+    assert manifest.lookup('dQw4w9WgXcQ', '720p') == str(path)
+    assert manifest.lookup('dQw4w9WgXcQ', '1080p') is None
+    assert manifest.total_bytes() == 10
+
+def test_lookup_drops_missing_files(tmp_path):
+    manifest = MediaManifest(str(tmp_path))
+    path = tmp_path / 'video_dQw4w9WgXcQ_720p.mp4'
+    path.write_bytes(b'x')
+    manifest.record('dQw4w9WgXcQ', '720p', str(path))
+    os.remove(path)
+
+    assert manifest.lookup('dQw4w9WgXcQ', '720p') is None
+    assert manifest.entries() == []
+
+def test_repair_reconciles_with_disk(tmp_path):
+    manifest = MediaManifest(str(tmp_path))
+    tracked = tmp_path / 'video_aaaaaaaaaaa_720p.mp4'
+    tracked.write_bytes(b'x')
+    manifest.record('aaaaaaaaaaa', '720p', str(tracked))
+    os.remove(tracked)
+    (tmp_path / 'video_bbbbbbbbbbb_360p.mp4').write_bytes(b'xx')
+    (tmp_path / 'audio_ccccccccccc.webm').write_bytes(b'xxx')
+    (tmp_path / 'notes.txt').write_text('not media')
+
+    counts = manifest.repair()
+
+    assert counts == {'added': 2, 'removed': 1, 'updated': 0}
+    assert manifest.lookup('bbbbbbbbbbb', '360p') == str(tmp_path / 'video_bbbbbbbbbbb_360p.mp4')
+    assert manifest.lookup('ccccccccccc', 'audio') == str(tmp_path / 'audio_ccccccccccc.webm')
@@ -0,0 +1,27 @@
+import pytest
+from src.services import model_registry
+from src.services.audio_service import AudioProcessor
+from src.services.whisper_wrapper import SecureWhisperWrapper
+from unittest.mock import Mock, patch
+
+def test_model_loaded_once_per_key():
+    with patch('whisper.load_model') as mock_load:
+        mock_load.return_value = Mock()
+        model_registry.evict()
+
+        audio = AudioProcessor()
+        wrapper = SecureWhisperWrapper()
+
+        assert audio.model is wrapper.model
+        mock_load.assert_called_once_with('base', device=None)
+        model_registry.evict()
+
+def test_evict_releases_model():
+    with patch('whisper.load_model') as mock_load:
+        mock_load.return_value = Mock()
+        model_registry.evict()
+        model_registry.get_whisper_model('tiny')
+
+        assert model_registry.loaded_models() == [('tiny', None, None)]
+        assert model_registry.evict('tiny') == 1
+        assert model_registry.loaded_models() == []
@@ -0,0 +1,24 @@
+import pytest
+import ffmpeg
+from src.services.render import RenderPipeline
+
+def test_multiple_outputs_share_one_decode():
+    pipeline = RenderPipeline('in.mp4', 5, 15).add_clip('clip.mp4').add_shorts('shorts.mp4').add_audio('audio.mp3')
+    args = ffmpeg.compile(pipeline.build())
+
+    assert args.count('-i') == 1
+    assert args[args.index('-i') - 1] == '5'
+    graph = args[args.index('-filter_complex') + 1]
+    assert 'split=2' in graph
+    assert 'scale=1080:1920' in graph and 'crop=1080:1920' in graph
+    assert [arg for arg in args if arg.endswith(('.mp4', '.mp3'))] == ['in.mp4', 'clip.mp4', 'shorts.mp4', 'audio.mp3']
+    assert args.count('-t') == 3
+
+def test_stream_copy_skips_filters():
+    args = ffmpeg.compile(RenderPipeline('in.mp4', 0, 10).add_clip('clip.mp4', stream_copy=True).build())
+
+    assert args == ['ffmpeg', '-i', 'in.mp4', '-c', 'copy', '-t', '10', 'clip.mp4']
+
+def test_pipeline_without_outputs_raises():
+    with pytest.raises(ValueError):
+        RenderPipeline('in.mp4').build()
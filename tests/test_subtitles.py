@@ -0,0 +1,74 @@
+import pytest
+from unittest.mock import Mock, patch
+from src.services.subtitles import Cue, build_cues, format_cue, wrap_text
+from src.services.subtitle_service import SubtitleGenerator
+from src.services.translation import SegmentTranslator
+
+def test_long_segment_is_split_by_line_budget():
+    text = "this sentence is deliberately long so that it cannot fit on two subtitle lines of forty two characters each"
+    cues = list(build_cues([{'start': 0.0, 'end': 10.0, 'text': text}]))
+
+    assert len(cues) == 2
+    assert cues[0].start == 0.0 and cues[-1].end == 10.0
+    assert cues[0].end == cues[1].start
+    assert all(len(line) <= 42 for cue in cues for line in cue.text.split("\n"))
+    assert " ".join(cue.text.replace("\n", " ") for cue in cues) == text
+
+def test_short_segments_are_merged():
+    segments = [
+        {'start': 0.0, 'end': 0.4, 'text': 'Hi'},
+        {'start': 0.5, 'end': 1.2, 'text': 'there.'},
+        {'start': 5.0, 'end': 7.0, 'text': 'Later on'},
+    ]
+    cues = list(build_cues(segments))
+
+    assert [cue.text for cue in cues] == ['Hi there.', 'Later on']
+    assert cues[0].start == 0.0
+
+def test_reading_speed_extends_cue_without_overlap():
+    segments = [
+        {'start': 0.0, 'end': 1.0, 'text': 'a fairly long caption that is hard to read fast'},
+        {'start': 2.0, 'end': 4.0, 'text': 'next'},
+    ]
+    cues = list(build_cues(segments))
+
+    assert cues[0].end == 2.0
+    assert cues[1].end == 4.0
+
+def test_formats():
+    cue = Cue(3661.5, 3662.25, "line one\nline two")
+
+    assert format_cue(cue, 1, "srt") == "1\n01:01:01,500 --> 01:01:02,250\nline one\nline two\n\n"
+    assert format_cue(cue, 1, "vtt") == "01:01:01.500 --> 01:01:02.250\nline one\nline two\n\n"
+    assert format_cue(cue, 1, "ass") == "Dialogue: 0,1:01:01.50,1:01:02.25,Default,,0,0,0,,line one\\Nline two\n"
+    with pytest.raises(ValueError):
+        format_cue(cue, 1, "txt")
+
+def test_wrap_text_balances_lines():
+    assert wrap_text("short") == "short"
+    assert wrap_text("one two three four five six seven eight nine ten eleven") == \
+        "one two three four five six\nseven eight nine ten eleven"
+
+def test_generate_and_save_all_languages(tmp_path):
+    model = Mock()
+    model.transcribe.return_value = {'text': 'Hello world. Bye.', 'segments': [
+        {'start': 0.0, 'end': 2.0, 'text': ' Hello world.'},
+        {'start': 3.0, 'end': 5.0, 'text': ' Bye.'},
+    ]}
+    backend = Mock()
+    backend.translate_batch.return_value = ['Hola mundo.', 'Adiós.']
+    with patch('src.services.subtitle_service.get_whisper_model', return_value=model):
+        generator = SubtitleGenerator(translator=SegmentTranslator(backend))
+
+        subtitles = generator.generate_subtitles('audio.mp3', ['es'])
+        files = generator.save_subtitles(subtitles, str(tmp_path), format="vtt")
+
+    assert subtitles['es'][1] == {'start': 3.0, 'end': 5.0, 'text': 'Adiós.'}
+    assert backend.translate_batch.call_count == 1
+    with open(files['es'], encoding='utf-8') as f:
+        assert f.read() == (
+            "WEBVTT\n\n"
+            "00:00:00.000 --> 00:00:02.000\nHola mundo.\n\n"
+            "00:00:03.000 --> 00:00:05.000\nAdiós.\n\n"
+        )
+    assert files['en'].endswith('subtitles_en.vtt')
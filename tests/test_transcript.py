@@ -0,0 +1,49 @@
+import pytest
+import pickle
+from src.models.transcript import Transcript
+
+ENTRIES = [
+    {'text': 'welcome back', 'start': 0.0, 'duration': 2.0},
+    {'text': 'today we cover', 'start': 2.0, 'duration': 3.0},
+    {'text': 'caching', 'start': 6.0, 'duration': 4.0},
+    {'text': 'thanks for watching', 'start': 10.0, 'duration': 2.0},
+]
+
+def test_roundtrip_and_text():
+    transcript = Transcript.from_entries(ENTRIES)
+
+    assert len(transcript) == 4
+    assert transcript.entries() == ENTRIES
+    assert transcript.text == 'welcome back today we cover caching thanks for watching'
+
+def test_duration_and_words_per_minute():
+    transcript = Transcript.from_entries(ENTRIES)
+
+    assert transcript.duration == 12.0
+    assert transcript.word_count == 9
+    assert transcript.words_per_minute == pytest.approx(45.0)
+
+def test_text_at_uses_timings():
+    transcript = Transcript.from_entries(ENTRIES)
+
+    assert transcript.text_at(0.0) == 'welcome back'
+    assert transcript.text_at(4.9) == 'today we cover'
+    assert transcript.text_at(5.5) is None
+    assert transcript.text_at(11.0) == 'thanks for watching'
+    assert transcript.text_at(20.0) is None
+
+def test_slice_shares_storage():
+    transcript = Transcript.from_entries(ENTRIES)
+    middle = transcript.slice(3.0, 10.0)
+
+    assert [entry['text'] for entry in middle] == ['today we cover', 'caching']
+    assert middle.text == 'today we cover caching'
+    assert middle.duration == 8.0
+    assert middle._starts is transcript._starts
+    assert middle.slice(6.5, 100).text == 'caching'
+    assert len(transcript.slice(12.5, 20.0)) == 0
+
+def test_pickles():
+    transcript = Transcript.from_entries(ENTRIES).slice(2.0, 7.0)
+
+    assert pickle.loads(pickle.dumps(transcript)).entries() == ENTRIES[1:3]
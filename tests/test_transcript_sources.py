@@ -0,0 +1,34 @@
+import pytest
+from src.services.transcript_sources import TranscriptResolver, segments_to_entries
+from unittest.mock import Mock
+
+ENTRIES = [{'text': 'hello', 'start': 0.0, 'duration': 1.5}]
+
+def test_resolver_falls_through_to_later_stage():
+    captions = Mock(side_effect=Exception('Subtitles are disabled'))
+    whisper = Mock(return_value=ENTRIES)
+    on_resolved = Mock()
+    resolver = TranscriptResolver(
+        [('cache', lambda video_id, language: None), ('captions', captions), ('whisper', whisper)],
+        on_resolved=on_resolved
+    )
+
+    entries, source, metrics = resolver.resolve('dQw4w9WgXcQ', 'en')
+
+    assert entries == ENTRIES
+    assert source == 'whisper'
+    assert [m.status for m in metrics] == ['miss', 'error', 'hit']
+    on_resolved.assert_called_once_with('dQw4w9WgXcQ', 'en', 'whisper', ENTRIES)
+    assert resolver.stage_totals['whisper']['hits'] == 1
+
+def test_resolver_raises_when_no_stage_succeeds():
+    resolver = TranscriptResolver([('captions', Mock(side_effect=Exception('No transcript')))])
+
+    with pytest.raises(ValueError) as exc_info:
+        resolver.resolve('dQw4w9WgXcQ', 'en')
+
+    assert 'No transcript' in str(exc_info.value)
+
+def test_segments_to_entries():
+    entries = segments_to_entries([{'start': 1.0, 'end': 2.5, 'text': 'hello'}])
+    assert entries == [{'text': 'hello', 'start': 1.0, 'duration': 1.5}]
@@ -0,0 +1,80 @@
+import pytest
+import numpy as np
+from src.services.transcription import (
+    SAMPLE_RATE,
+    find_cut_points,
+    plan_windows,
+    stitch_segments,
+    iter_transcription,
+    default_workers
+)
+from src.config import Config
+from unittest.mock import Mock, patch
+
+def _tone_with_gaps(seconds, gaps):
+    audio = np.full(seconds * SAMPLE_RATE, 0.5, dtype=np.float32)
+    for gap in gaps:
+        audio[int(gap * SAMPLE_RATE):int((gap + 0.5) * SAMPLE_RATE)] = 0.0
+    return audio
+
+def test_cut_points_land_on_silence():
+    audio = _tone_with_gaps(60, gaps=[22, 41])
+    cuts = find_cut_points(audio, window_seconds=20, search_seconds=5)
+
+    assert cuts[0] == 0 and cuts[-1] == len(audio)
+    for cut in cuts[1:-1]:
+        assert audio[cut] == 0.0
+
+def test_plan_windows_overlap():
+    audio = _tone_with_gaps(60, gaps=[22, 41])
+    windows = plan_windows(audio, window_seconds=20, overlap_seconds=1)
+
+    assert windows[0][0] == 0
+    for (_, end, padded_end), (next_start, _, _) in zip(windows, windows[1:]):
+        assert next_start == end
+        assert padded_end == end + SAMPLE_RATE
+
+def test_stitch_segments_drops_overlap_duplicates():
+    windows = [(0, 10 * SAMPLE_RATE, 12 * SAMPLE_RATE), (10 * SAMPLE_RATE, 20 * SAMPLE_RATE, 20 * SAMPLE_RATE)]
+    window_segments = [
+        [{'start': 0.0, 'end': 5.0, 'text': 'first'}, {'start': 9.5, 'end': 11.5, 'text': 'boundary'}],
+        [{'start': 9.8, 'end': 11.4, 'text': 'boundary'}, {'start': 12.0, 'end': 15.0, 'text': 'second'}]
+    ]
+
+    texts = [segment['text'] for segment in stitch_segments(window_segments, windows)]
+    assert texts == ['first', 'boundary', 'second']
+
+def test_iter_transcription_yields_per_window():
+    audio = _tone_with_gaps(60, gaps=[22, 41])
+    model = Mock()
+    model.transcribe.side_effect = lambda samples, **kwargs: {
+        'segments': [{'start': 0.0, 'end': 1.0, 'text': f' {len(samples)}'}]
+    }
+
+    with patch('src.services.transcription.get_whisper_model', return_value=model):
+        stream = iter_transcription(audio, window_seconds=20)
+        first = next(stream)
+        assert model.transcribe.call_count == 1
+        rest = list(stream)
+
+    starts = [segment['start'] for segment in [first] + rest]
+    assert starts == sorted(starts)
+    assert len(rest) == model.transcribe.call_count - 1
+
+def test_windows_load_the_model_on_the_requested_device():
+    audio = _tone_with_gaps(30, gaps=[12])
+    model = Mock()
+    model.transcribe.return_value = {'segments': []}
+
+    with patch('src.services.transcription.get_whisper_model', return_value=model) as mock_get:
+        list(iter_transcription(audio, model_name='tiny', window_seconds=10, device='cuda'))
+
+    assert mock_get.call_args_list and all(call.args == ('tiny', 'cuda') for call in mock_get.call_args_list)
+
+def test_default_workers_is_capped(monkeypatch):
+    monkeypatch.setattr('os.cpu_count', lambda: 32)
+    monkeypatch.setattr(Config, 'WHISPER_MAX_WORKERS', 4)
+    assert default_workers() == 4
+
+    monkeypatch.setattr('os.cpu_count', lambda: 2)
+    assert default_workers() == 2
@@ -0,0 +1,82 @@
+import pytest
+import threading
+from src.services.translation import GoogleTranslateBackend, SegmentTranslator, TranslationMemory
+from unittest.mock import Mock, patch
+
+class StubBackend:
+    """Local translator that tags each line with its target language"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def translate_batch(self, texts, dest):
+        with self.lock:
+            self.calls.append((dest, list(texts)))
+        return [f"[{dest}] {text}" for text in texts]
+
+SEGMENTS = [
+    {'start': 0.0, 'end': 2.0, 'text': 'Welcome back to the channel'},
+    {'start': 2.0, 'end': 4.0, 'text': 'Today we talk about caches'},
+    {'start': 4.0, 'end': 6.0, 'text': 'Welcome back to the channel'},
+]
+
+def test_translates_each_language_keeping_timings():
+    backend = StubBackend()
+    result = SegmentTranslator(backend).translate_languages(SEGMENTS, ['es', 'fr'])
+
+    assert result['fr'][1] == {'start': 2.0, 'end': 4.0, 'text': '[fr] Today we talk about caches'}
+    assert result['es'][2]['text'] == '[es] Welcome back to the channel'
+    # Repeated lines are sent once per language
+    assert sorted(len(texts) for _, texts in backend.calls) == [2, 2]
+
+def test_batches_respect_character_budget():
+    backend = StubBackend()
+    segments = [{'start': i, 'end': i + 1, 'text': f"line number {i:03d}"} for i in range(10)]
+    SegmentTranslator(backend, batch_chars=50).translate_languages(segments, ['de'])
+
+    assert len(backend.calls) == 4
+    assert all(sum(len(text) for text in texts) <= 50 for _, texts in backend.calls)
+    assert [text for _, texts in backend.calls for text in texts] == [s['text'] for s in segments]
+
+def test_translation_memory_serves_repeated_lines():
+    backend = StubBackend()
+    memory = TranslationMemory()
+    translator = SegmentTranslator(backend, memory=memory)
+    translator.translate_languages(SEGMENTS[:1], ['es'])
+    result = translator.translate_languages(SEGMENTS, ['es'])
+
+    assert backend.calls[-1] == ('es', ['Today we talk about caches'])
+    assert result['es'][0]['text'] == '[es] Welcome back to the channel'
+    assert memory.stats.hits == 1
+
+def test_backend_length_mismatch_raises():
+    class BrokenBackend:
+        def translate_batch(self, texts, dest):
+            return texts[:-1]
+
+    with pytest.raises(ValueError):
+        SegmentTranslator(BrokenBackend()).translate_languages(SEGMENTS, ['es'])
+
+def test_google_backend_sends_batch_as_one_request():
+    client = Mock()
+    client.translate.return_value = Mock(text="Hola\nAdiós")
+
+    with patch('googletrans.Translator', return_value=client):
+        lines = GoogleTranslateBackend().translate_batch(['Hello', 'Goodbye'], 'es')
+
+    assert lines == ['Hola', 'Adiós']
+    client.translate.assert_called_once_with("Hello\nGoodbye", dest='es')
+
+def test_google_backend_falls_back_per_line_on_count_mismatch():
+    client = Mock()
+    client.translate.side_effect = [
+        Mock(text="Hola Adiós"),
+        [Mock(text='Hola'), Mock(text='Adiós')],
+    ]
+
+    with patch('googletrans.Translator', return_value=client):
+        lines = GoogleTranslateBackend().translate_batch(['Hello', 'Goodbye'], 'es')
+
+    assert lines == ['Hola', 'Adiós']
+    assert client.translate.call_args.args[0] == ['Hello', 'Goodbye']
@@ -1,5 +1,9 @@
 import pytest
+import os
+import json
+import time
 from src.services.video_service import VideoProcessor
+from src.services.llm_cache import CompletionCache
 from unittest.mock import Mock, patch
 import ffmpeg
 
@@ -22,4 +26,167 @@ def test_format_for_shorts():
                     result = processor.format_for_shorts('input.mp4', 'output.mp4')
                     
                     assert result == 'output.mp4'
-         
\ No newline at end of file
+         
+
+def test_generate_social_posts_concurrent(tmp_path):
+    with patch('openai.ChatCompletion.create') as mock_create:
+        mock_create.return_value.choices = [Mock(message=Mock(content='#tag content'))]
+        processor = VideoProcessor(
+            api_key='test_key',
+            download_path=str(tmp_path),
+            completion_cache=CompletionCache()
+        )
+        result = processor.generate_social_posts(
+            'https://youtu.be/dQw4w9WgXcQ',
+            'transcript text',
+            ['Twitter', 'LinkedIn'],
+            mode='concurrent'
+        )
+
+        assert list(result['posts']) == ['Twitter', 'LinkedIn']
+        assert result['hashtags'] == '#tag content'
+        assert mock_create.call_count == 3
+
+def test_generate_social_posts_has_no_timeout_by_default(tmp_path):
+    with patch('openai.ChatCompletion.create') as mock_create:
+        mock_create.return_value.choices = [Mock(message=Mock(content='#tag content'))]
+        processor = VideoProcessor(
+            api_key='test_key',
+            download_path=str(tmp_path),
+            completion_cache=CompletionCache()
+        )
+        processor.generate_social_posts('https://youtu.be/dQw4w9WgXcQ', 'transcript text', ['Twitter'])
+
+        assert all(call.kwargs.get('request_timeout') is None for call in mock_create.call_args_list)
+
+def test_generate_social_posts_concurrent_shares_one_deadline(tmp_path):
+    def create(**params):
+        if 'LinkedIn' in params['messages'][1]['content']:
+            time.sleep(1.0)
+        return Mock(choices=[Mock(message=Mock(content='#tag content'))])
+
+    with patch('openai.ChatCompletion.create', side_effect=create):
+        processor = VideoProcessor(
+            api_key='test_key',
+            download_path=str(tmp_path),
+            completion_cache=CompletionCache()
+        )
+        started = time.monotonic()
+        with pytest.raises(Exception, match="LinkedIn post generation timed out"):
+            processor.generate_social_posts(
+                'https://youtu.be/dQw4w9WgXcQ',
+                'transcript text',
+                ['Twitter', 'LinkedIn'],
+                mode='concurrent',
+                timeout=0.2
+            )
+
+        assert time.monotonic() - started < 0.8
+
+def test_generate_social_posts_batched_retries_invalid_platform(tmp_path):
+    batch_reply = '{"hashtags": "#a #b", "posts": {"Twitter": "' + 'x' * 300 + '", "LinkedIn": "good post"}}'
+    with patch('openai.ChatCompletion.create') as mock_create:
+        mock_create.side_effect = [
+            Mock(choices=[Mock(message=Mock(content=batch_reply))]),
+            Mock(choices=[Mock(message=Mock(content='short tweet'))])
+        ]
+        processor = VideoProcessor(
+            api_key='test_key',
+            download_path=str(tmp_path),
+            completion_cache=CompletionCache()
+        )
+        result = processor.generate_social_posts(
+            'https://youtu.be/dQw4w9WgXcQ',
+            'transcript text',
+            ['Twitter', 'LinkedIn'],
+            mode='batched'
+        )
+
+        assert result['hashtags'] == '#a #b'
+        assert result['posts'] == {'Twitter': 'short tweet', 'LinkedIn': 'good post'}
+        assert mock_create.call_count == 2
+
+@pytest.mark.parametrize('hashtags', [None, 42, {'tags': '#a'}])
+def test_generate_social_posts_batched_regenerates_invalid_hashtags(tmp_path, hashtags):
+    batch_reply = json.dumps({'hashtags': hashtags, 'posts': {'Twitter': 'short tweet'}})
+    with patch('openai.ChatCompletion.create') as mock_create:
+        mock_create.side_effect = [
+            Mock(choices=[Mock(message=Mock(content=batch_reply))]),
+            Mock(choices=[Mock(message=Mock(content='#fresh #tags'))])
+        ]
+        processor = VideoProcessor(
+            api_key='test_key',
+            download_path=str(tmp_path),
+            completion_cache=CompletionCache()
+        )
+        result = processor.generate_social_posts(
+            'https://youtu.be/dQw4w9WgXcQ',
+            'transcript text',
+            ['Twitter'],
+            mode='batched'
+        )
+
+        assert result == {'posts': {'Twitter': 'short tweet'}, 'hashtags': '#fresh #tags'}
+
+def test_generate_social_posts_batched_recovers_from_unparsable_reply(tmp_path):
+    with patch('openai.ChatCompletion.create') as mock_create:
+        mock_create.side_effect = [
+            Mock(choices=[Mock(message=Mock(content='Sorry, here are your posts!'))]),
+            Mock(choices=[Mock(message=Mock(content='#fresh #tags'))]),
+            Mock(choices=[Mock(message=Mock(content='short tweet'))])
+        ]
+        processor = VideoProcessor(
+            api_key='test_key',
+            download_path=str(tmp_path),
+            completion_cache=CompletionCache()
+        )
+        result = processor.generate_social_posts(
+            'https://youtu.be/dQw4w9WgXcQ',
+            'transcript text',
+            ['Twitter'],
+            mode='batched'
+        )
+
+        assert result == {'posts': {'Twitter': 'short tweet'}, 'hashtags': '#fresh #tags'}
+
+def test_fetch_transcript_returns_structured_result(tmp_path):
+    entries = [{'text': 'hello', 'start': 0.0, 'duration': 1.5}, {'text': 'world', 'start': 1.5, 'duration': 1.0}]
+    with patch('youtube_transcript_api.YouTubeTranscriptApi.get_transcript', return_value=entries):
+        processor = VideoProcessor(download_path=str(tmp_path), whisper_fallback=False)
+        result = processor.fetch_transcript('https://youtu.be/dQw4w9WgXcQ')
+
+    assert result.video_id == 'dQw4w9WgXcQ'
+    assert result.source == 'captions'
+    assert result.text == 'hello world'
+    assert result.entries == entries
+    assert result.transcript.duration == 2.5
+    assert result.file_name == 'transcript_dQw4w9WgXcQ.txt'
+    assert [(metric['stage'], metric['status']) for metric in result.metrics] == [('cache', 'miss'), ('captions', 'hit')]
+
+def test_fetch_transcript_without_whisper_skips_audio_download(tmp_path):
+    youtube_service = Mock()
+    with patch('youtube_transcript_api.YouTubeTranscriptApi.get_transcript', side_effect=Exception('No captions')):
+        processor = VideoProcessor(download_path=str(tmp_path), youtube_service=youtube_service)
+        with pytest.raises(Exception, match="No transcript source succeeded"):
+            processor.fetch_transcript('https://youtu.be/dQw4w9WgXcQ', allow_whisper=False)
+
+    youtube_service.pinned_audio.assert_not_called()
+
+def test_video_service_imports_without_streamlit():
+    import subprocess
+    import sys
+    code = "import sys; import src.services.video_service; print('streamlit' in sys.modules)"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == 'False'
+
+def test_render_highlights_renders_shorts_per_clip(tmp_path):
+    from src.services.highlights import ClipCandidate
+    clips = [ClipCandidate(10.0, 40.0, 1.0, 'a'), ClipCandidate(60.0, 90.0, 0.5, 'b')]
+
+    with patch('ffmpeg.run') as mock_run:
+        processor = VideoProcessor(download_path=str(tmp_path))
+        outputs = processor.render_highlights('source.mp4', clips, str(tmp_path / 'shorts'))
+
+    assert [os.path.basename(path) for path in outputs] == ['source_highlight_1.mp4', 'source_highlight_2.mp4']
+    args = ffmpeg.compile(mock_run.call_args_list[1].args[0])
+    assert args[:3] == ['ffmpeg', '-ss', '60.0'] and 'crop=1080:1920' in ' '.join(args)
@@ -1,6 +1,8 @@
 import pytest
 from src.services.youtube_service import YouTubeService
 from unittest.mock import Mock, patch
+from concurrent.futures import ThreadPoolExecutor
+import time
 
 def test_get_video_info():
     with patch('googleapiclient.discovery.build') as mock_build:
@@ -20,3 +22,124 @@ def test_get_video_info():
         result = service.get_video_info('https://youtube.com/watch?v=test_id')
         
         assert result['snippet']['title'] == 'Test Video'
+
+def _video_item(video_id):
+    return {
+        'id': video_id,
+        'snippet': {
+            'title': f'Video {video_id}',
+            'description': '',
+            'channelId': 'channel',
+            'channelTitle': 'Channel',
+            'publishedAt': '2024-01-01T00:00:00Z'
+        },
+        'contentDetails': {'duration': 'PT1M'},
+        'statistics': {'viewCount': '10', 'likeCount': '2'}
+    }
+
+def test_get_videos_info_bulk_batches_and_preserves_order(tmp_path):
+    ids = [f'video{i:06d}' for i in range(120)]
+
+    # No maxResults: the Data API does not support it together with id
+    def list_videos(part, id):
+        request = Mock()
+        request.execute.return_value = {'items': [_video_item(video_id) for video_id in id.split(',')]}
+        return request
+
+    with patch('googleapiclient.discovery.build') as mock_build:
+        mock_build.return_value.videos.return_value.list.side_effect = list_videos
+
+        service = YouTubeService('dummy_api_key', download_path=str(tmp_path))
+        urls = [f'https://youtu.be/{video_id}' for video_id in ids] + [ids[0], 'not a url']
+        results = service.get_videos_info_bulk(urls)
+
+        list_calls = mock_build.return_value.videos.return_value.list.call_args_list
+        assert len(list_calls) == 3
+        assert all(len(call.kwargs['id'].split(',')) <= 50 for call in list_calls)
+        assert [r.video_id for r in results[:120]] == ids
+        assert results[120].video_id == ids[0]
+        assert results[121] is None
+        assert results[0].like_count == 2
+        assert results[0].comment_count is None
+
+def test_download_video_deduplicates_concurrent_requests(tmp_path):
+    def fake_download(info, download):
+        time.sleep(0.05)
+        path = tmp_path / 'video_dQw4w9WgXcQ_720p.mp4'
+        path.write_bytes(b'video')
+        return {'requested_downloads': [{'filepath': str(path)}]}
+
+    with patch('yt_dlp.YoutubeDL') as mock_ydl:
+        ydl = mock_ydl.return_value.__enter__.return_value
+        ydl.extract_info.return_value = {'id': 'dQw4w9WgXcQ', 'formats': []}
+        ydl.sanitize_info.side_effect = lambda info: info
+        ydl.process_ie_result.side_effect = fake_download
+        service = YouTubeService('dummy_api_key', download_path=str(tmp_path))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            paths = list(executor.map(
+                lambda _: service.download_video('https://youtu.be/dQw4w9WgXcQ'), range(4)
+            ))
+
+        assert len(set(paths)) == 1
+        assert ydl.process_ie_result.call_count == 1
+        assert mock_ydl.call_args.args[0]['concurrent_fragment_downloads'] > 1
+
+def test_pinned_audio_shares_one_download_and_stays_pinned(tmp_path):
+    def fake_extract(url, download):
+        time.sleep(0.05)
+        path = tmp_path / 'audio_dQw4w9WgXcQ.webm'
+        path.write_bytes(b'audio')
+        return {'requested_downloads': [{'filepath': str(path)}]}
+
+    with patch('yt_dlp.YoutubeDL') as mock_ydl:
+        ydl = mock_ydl.return_value.__enter__.return_value
+        ydl.extract_info.side_effect = fake_extract
+        service = YouTubeService('dummy_api_key', download_path=str(tmp_path))
+
+        def use_audio(_):
+            with service.pinned_audio('https://youtu.be/dQw4w9WgXcQ') as path:
+                pinned = service.cache_policy.is_pinned(path)
+                # The evictor must not remove the file while it is in use
+                service.cache_policy.max_bytes = 0
+                service.enforce_cache_budget()
+                return path, pinned
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(use_audio, range(4)))
+
+        assert ydl.extract_info.call_count == 1
+        assert all(pinned for _, pinned in results)
+        path = results[0][0]
+        assert (tmp_path / 'audio_dQw4w9WgXcQ.webm').exists()
+        assert not service.cache_policy.is_pinned(path)
+
+def test_resolution_probe_is_reused_by_download(tmp_path):
+    info = {'id': 'dQw4w9WgXcQ', 'formats': [
+        {'height': 720, 'ext': 'mp4'}, {'height': 360, 'ext': 'mp4'}, {'height': 1080, 'ext': 'webm'}
+    ]}
+
+    def fake_download(info, download):
+        path = tmp_path / 'video_dQw4w9WgXcQ_720p.mp4'
+        path.write_bytes(b'video')
+        return {'requested_downloads': [{'filepath': str(path)}]}
+
+    with patch('yt_dlp.YoutubeDL') as mock_ydl:
+        ydl = mock_ydl.return_value.__enter__.return_value
+        ydl.extract_info.return_value = info
+        ydl.sanitize_info.side_effect = lambda info: info
+        ydl.process_ie_result.side_effect = fake_download
+        service = YouTubeService('dummy_api_key', download_path=str(tmp_path))
+
+        assert service.get_available_resolutions('https://youtu.be/dQw4w9WgXcQ') == ['360p', '720p']
+        assert service.get_available_resolutions('dQw4w9WgXcQ') == ['360p', '720p']
+        service.download_video('https://youtu.be/dQw4w9WgXcQ')
+
+        assert ydl.extract_info.call_count == 1
+        assert ydl.process_ie_result.call_args.args[0]['formats'] == info['formats']
+
+        # A fresh service reads the persisted probe from disk
+        assert YouTubeService('dummy_api_key', download_path=str(tmp_path)).get_available_resolutions(
+            'dQw4w9WgXcQ'
+        ) == ['360p', '720p']
+        assert ydl.extract_info.call_count == 1